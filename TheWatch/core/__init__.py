@@ -1,4 +1,11 @@
-from .models import SearchFilters, Sale
-from .scraper import GrailedScraper
+from .models import SearchFilters, Sale, WatchQuery
 
-__all__ = ['SearchFilters', 'Sale', 'GrailedScraper']
\ No newline at end of file
+__all__ = ['SearchFilters', 'Sale', 'WatchQuery', 'GrailedScraper']
+
+
+def __getattr__(name: str):
+    # The scraper pulls in aiohttp; only import it when actually requested
+    if name == 'GrailedScraper':
+        from .scraper import GrailedScraper
+        return GrailedScraper
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
\ No newline at end of file
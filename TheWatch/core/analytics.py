@@ -0,0 +1,157 @@
+# TheWatch/core/analytics.py
+import bisect
+import heapq
+import itertools
+from collections import Counter
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from .config import PRICE_RANGES
+from .models import Sale, SalesAnalytics
+from ..utils.normalize import condition_label, size_label
+
+_RANGE_BOUNDS = [bound for bound, _ in PRICE_RANGES]
+_RANGE_LABELS = [label for _, label in PRICE_RANGES]
+
+# Sort keys for TopK; larger keys rank higher
+ORDERS: Dict[str, Callable[[Sale], float]] = {
+    'newest': lambda sale: sale.sold_date.timestamp(),
+    'cheapest': lambda sale: -sale.price,
+    'discount': lambda sale: sale.discount_percentage or 0.0,
+}
+
+
+def price_range(price: float) -> str:
+    """Label of the PRICE_RANGES bucket holding `price`"""
+    return _RANGE_LABELS[max(bisect.bisect_right(_RANGE_BOUNDS, price) - 1, 0)]
+
+
+class RunningMedian:
+    """Median of a growing stream: O(log n) insert, O(1) query"""
+
+    def __init__(self):
+        self._low: List[float] = []   # max-heap (negated) of the smaller half
+        self._high: List[float] = []  # min-heap of the larger half
+
+    def __len__(self) -> int:
+        return len(self._low) + len(self._high)
+
+    def add(self, value: float) -> None:
+        if self._low and value > -self._low[0]:
+            heapq.heappush(self._high, value)
+        else:
+            heapq.heappush(self._low, -value)
+        if len(self._low) > len(self._high) + 1:
+            heapq.heappush(self._high, -heapq.heappop(self._low))
+        elif len(self._high) > len(self._low):
+            heapq.heappush(self._low, -heapq.heappop(self._high))
+
+    @property
+    def median(self) -> float:
+        if not self._low:
+            return 0.0
+        if len(self._low) > len(self._high):
+            return -self._low[0]
+        return (-self._low[0] + self._high[0]) / 2
+
+
+class TopK:
+    """The k best sales under one of ORDERS, kept in a bounded min-heap.
+
+    Each add is O(log k) and reading the result is O(k log k), independent
+    of how many sales have streamed past.
+    """
+
+    def __init__(self, k: int = 5, order: str = 'newest'):
+        if order not in ORDERS:
+            raise ValueError(
+                f"Unknown order {order!r}; expected one of {', '.join(ORDERS)}"
+            )
+        self.k = k
+        self.order = order
+        self._key = ORDERS[order]
+        self._heap: List[Tuple[float, int, Sale]] = []
+        self._tiebreak = itertools.count()
+
+    def add(self, sale: Sale) -> None:
+        entry = (self._key(sale), -next(self._tiebreak), sale)
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, entry)
+        elif entry[:2] > self._heap[0][:2]:
+            heapq.heapreplace(self._heap, entry)
+
+    def extend(self, sales: Iterable[Sale]) -> None:
+        for sale in sales:
+            self.add(sale)
+
+    def items(self) -> List[Sale]:
+        """Best first"""
+        ranked = sorted(self._heap, key=lambda e: e[:2], reverse=True)
+        return [sale for *_, sale in ranked]
+
+
+class SalesAccumulator:
+    """Incrementally maintained SalesAnalytics.
+
+    Sales are folded in as they arrive (O(log n) each, for the running
+    median); `snapshot` costs O(buckets + conditions) however many sales have
+    been added. Listings already counted are skipped by ID.
+    """
+
+    def __init__(self):
+        self.total_value = 0.0
+        self.min_price = float('inf')
+        self.max_price = float('-inf')
+        self._median = RunningMedian()
+        self._ranges: Counter = Counter()
+        # Keyed by canonical codes; labels are only looked up for snapshots
+        self._conditions: Counter = Counter()
+        self._sizes: Counter = Counter()
+        self._seen: Set[object] = set()
+
+    def __len__(self) -> int:
+        return len(self._median)
+
+    def add(self, sale: Sale) -> bool:
+        """Fold one sale in; returns False for a listing already counted"""
+        key = sale.id if sale.id is not None else sale.url
+        if key in self._seen:
+            return False
+        self._seen.add(key)
+        self.total_value += sale.price
+        self.min_price = min(self.min_price, sale.price)
+        self.max_price = max(self.max_price, sale.price)
+        self._median.add(sale.price)
+        self._ranges[price_range(sale.price)] += 1
+        self._conditions[sale.condition_code] += 1
+        self._sizes[sale.size_code] += 1
+        return True
+
+    def extend(self, sales: Iterable[Sale]) -> int:
+        return sum(self.add(sale) for sale in sales)
+
+    def snapshot(self) -> Optional[SalesAnalytics]:
+        total = len(self)
+        if not total:
+            return None
+        return SalesAnalytics(
+            total_sales=total,
+            total_value=self.total_value,
+            average_price=self.total_value / total,
+            median_price=self._median.median,
+            min_price=self.min_price,
+            max_price=self.max_price,
+            price_ranges={
+                label: self._ranges[label]
+                for label in _RANGE_LABELS if self._ranges[label]
+            },
+            condition_distribution={
+                condition_label(code) or 'Unknown': count
+                for code, count in self._conditions.most_common()
+            },
+            size_distribution={
+                size_label(code): count for code, count in self._sizes.most_common()
+            }
+        )
+
+
+__all__ = ['ORDERS', 'price_range', 'RunningMedian', 'TopK', 'SalesAccumulator']
\ No newline at end of file
@@ -5,18 +5,24 @@ import aiohttp
 import asyncio
 from typing import List, Dict, Optional, Any
 import logging
-from bs4 import BeautifulSoup
+import time
 import json
+import urllib.parse
 from datetime import datetime
+from TheWatch.core.config import BASE_URL
 from TheWatch.core.models import Sale, SearchFilters
+from TheWatch.core.session import SESSION_REJECTED, SessionState, UpstreamSession
+from TheWatch.utils.metrics import endpoint_label, metrics
+from TheWatch.utils.normalize import canonical_condition
 
 logger = logging.getLogger(__name__)
 
 
 class GrailedAPI:
-    def __init__(self):
-        self.base_url = "https://www.grailed.com"
-        self.session = None
+    def __init__(
+            self, base_url: str = BASE_URL, session_state: Optional[SessionState] = None
+    ):
+        self.base_url = base_url
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
             'Accept': '*/*',
@@ -24,38 +30,53 @@ class GrailedAPI:
             'Referer': 'https://www.grailed.com/',
             'X-Requested-With': 'XMLHttpRequest'
         }
+        self.upstream = UpstreamSession(base_url, self.headers, session_state)
 
-    async def _init_session(self):
-        if not self.session:
-            self.session = aiohttp.ClientSession(headers=self.headers)
-            try:
-                headers = {**self.headers, 'Accept': 'text/html,application/xhtml+xml'}
-                async with self.session.get(self.base_url, headers=headers) as response:
-                    await response.text()
-            except Exception as e:
-                logger.error(f"Error initializing session: {e}")
+    @property
+    def session(self):
+        return self.upstream.session
 
     async def _make_request(self, url: str, method: str = "GET", **kwargs) -> Optional[Any]:
-        if not self.session:
-            await self._init_session()
+        session = await self.upstream.open()
 
+        endpoint = endpoint_label(url) if metrics.enabled else ''
+        started = time.perf_counter()
+        cookies = self.upstream.restored_cookies
         try:
-            async with getattr(self.session, method.lower())(url, **kwargs) as response:
+            async with getattr(session, method.lower())(url, **kwargs) as response:
+                metrics.inc('thewatch_http_responses_total',
+                            endpoint=endpoint, status=response.status)
+                if response.status in SESSION_REJECTED and cookies is not None:
+                    # Sent with saved cookies the upstream no longer accepts; retry
+                    # once with fresh ones
+                    response.release()
+                    await self.upstream.replace_rejected(cookies)
+                    return await self._make_request(url, method, **kwargs)
                 if response.status == 429:
+                    metrics.inc('thewatch_rate_limited_total', endpoint=endpoint)
                     retry_after = int(response.headers.get('Retry-After', 60))
-                    logger.warning(f"Rate limited. Waiting {retry_after} seconds")
+                    logger.warning("Rate limited. Waiting %s seconds", retry_after)
                     await asyncio.sleep(retry_after)
                     return None
 
                 response.raise_for_status()
 
+                if metrics.enabled:
+                    metrics.inc('thewatch_http_response_bytes_total',
+                                len(await response.read()), endpoint=endpoint)
+
                 content_type = response.headers.get('Content-Type', '')
                 if 'application/json' in content_type:
-                    return await response.json()
-                return await response.text()
+                    data = await response.json()
+                else:
+                    data = await response.text()
+                metrics.observe('thewatch_http_request_seconds',
+                                time.perf_counter() - started, endpoint=endpoint)
+                return data
 
         except Exception as e:
-            logger.error(f"Request error: {str(e)}")
+            metrics.inc('thewatch_http_errors_total', endpoint=endpoint)
+            logger.error("Request error: %s", e)
             return None
 
     async def get_search_url(self, query: str) -> Optional[str]:
@@ -65,8 +86,10 @@ class GrailedAPI:
         if not html:
             return None
 
-        soup = BeautifulSoup(html, 'html.parser')
-        scripts = soup.find_all('script', type='application/json')
+        from bs4 import BeautifulSoup
+        with metrics.timer('thewatch_parse_seconds', stage='search_html'):
+            soup = BeautifulSoup(html, 'html.parser')
+            scripts = soup.find_all('script', type='application/json')
 
         for script in scripts:
             try:
@@ -80,25 +103,27 @@ class GrailedAPI:
 
         return search_url
 
-    async def get_listings(self, url: str, page: int = 1) -> List[Dict]:
-        try:
-            path = url.split('www.grailed.com/')[-1]
-            api_url = f"{self.base_url}/api/{path}/goods"
-
-            params = {
-                "page": page,
-                "per_page": 40,
-                "sort": "default"
-            }
+    async def _fetch_listings(self, url: str, page: int = 1) -> Optional[List[Dict]]:
+        """Raw listings of one goods page; None when the request failed"""
+        path = urllib.parse.urlparse(url).path.strip('/')
+        api_url = f"{self.base_url}/api/{path}/goods"
 
-            data = await self._make_request(api_url, params=params)
-            if not data:
-                return []
+        params = {
+            "page": page,
+            "per_page": 40,
+            "sort": "default"
+        }
 
-            return data.get('listings', [])
+        data = await self._make_request(api_url, params=params)
+        if not isinstance(data, dict):
+            return None
+        return data.get('listings', [])
 
+    async def get_listings(self, url: str, page: int = 1) -> List[Dict]:
+        try:
+            return await self._fetch_listings(url, page) or []
         except Exception as e:
-            logger.error(f"Error getting listings: {str(e)}")
+            logger.error("Error getting listings: %s", e)
             return []
 
     def process_listing(self, listing: Dict) -> Optional[Sale]:
@@ -107,46 +132,71 @@ class GrailedAPI:
             original_price = float(listing.get('original_price', 0) or price)
 
             return Sale(
+                id=listing.get('id'),
                 title=listing.get('title', '').strip(),
                 price=price,
                 original_price=original_price,
                 sold_date=datetime.fromisoformat(listing.get('sold_date', datetime.now().isoformat())),
                 designer=listing.get('designer_names', ['Unknown'])[0],
                 size=listing.get('size', 'Unknown'),
-                condition=listing.get('condition', 'Unknown'),
+                condition=canonical_condition(listing.get('condition') or 'Unknown'),
                 url=f"https://www.grailed.com/listings/{listing.get('id')}",
                 location=listing.get('location'),
                 seller=listing.get('seller', {}).get('username'),
+                photos=[
+                    p.get('url') for p in listing.get('photos', []) if p.get('url')
+                ],
                 category=listing.get('category', 'Unknown'),
                 description=listing.get('description', '').strip(),
                 tags=listing.get('tags', []),
                 raw_data=listing
             )
         except Exception as e:
-            logger.error(f"Error processing listing: {str(e)}")
+            logger.error("Error processing listing: %s", e)
             return None
 
-    async def search_sales(self, query: str, filters: Optional[SearchFilters] = None) -> List[Sale]:
+    async def search_sales(
+            self,
+            query: str,
+            filters: Optional[SearchFilters] = None,
+            strict: bool = False
+    ) -> List[Sale]:
+        """Sales for `query`; a failed upstream request reads as no results unless
+        `strict`, which raises
+        """
         try:
             custom_url = await self.get_search_url(query)
             if not custom_url:
-                return []
+                raise aiohttp.ClientError(
+                    f"Search page for {query!r} could not be fetched"
+                )
 
-            raw_listings = await self.get_listings(custom_url)
+            raw_listings = await self._fetch_listings(custom_url)
+            if raw_listings is None:
+                raise aiohttp.ClientError(
+                    f"Listings for {query!r} could not be fetched"
+                )
 
             sales = []
-            for raw_listing in raw_listings:
-                sale = self.process_listing(raw_listing)
-                if sale:
-                    sales.append(sale)
+            with metrics.timer('thewatch_normalize_seconds', source='api'):
+                for raw_listing in raw_listings:
+                    sale = self.process_listing(raw_listing)
+                    if sale:
+                        sales.append(sale)
+            metrics.inc('thewatch_listings_processed_total', len(sales), source='api')
+            metrics.inc('thewatch_listings_failed_total',
+                        len(raw_listings) - len(sales), source='api')
+
+            if filters:
+                sales = [sale for sale in sales if filters.matches(sale)]
 
             return sales
 
         except Exception as e:
-            logger.error(f"Search error: {str(e)}")
+            logger.error("Search error: %s", e)
+            if strict:
+                raise
             return []
 
     async def close(self):
-        if self.session:
-            await self.session.close()
-            self.session = None
\ No newline at end of file
+        await self.upstream.close()
\ No newline at end of file
@@ -0,0 +1,112 @@
+# TheWatch/core/batch.py
+import asyncio
+import logging
+import re
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Optional, Sequence, Union
+
+from .models import Sale, SearchFilters, WatchQuery
+
+logger = logging.getLogger(__name__)
+
+_LIST_FILTERS = ('designers', 'conditions', 'locations', 'categories', 'sizes')
+_PRICE_FILTERS = ('min_price', 'max_price')
+# key=value where the value runs until the next key= (values may contain spaces)
+_PAIR_RE = re.compile(r'(\w+)=(.*?)(?=\s+\w+=|\s*$)')
+
+
+@dataclass
+class BatchResult:
+    """Outcome of one query in a batch search"""
+    query: WatchQuery
+    sales: List[Sale] = field(default_factory=list)
+    error: Optional[str] = None
+    elapsed: float = 0.0
+
+
+def parse_filters(spec: str, base: Optional[SearchFilters] = None) -> SearchFilters:
+    """Parse `key=value` pairs (lists comma-separated) on top of `base` filters.
+
+    Example: ``max_price=400 designers=Rick Owens,DRKSHDW sizes=48``
+    """
+    values: Dict[str, object] = dict(vars(base)) if base else {}
+    pairs = _PAIR_RE.findall(spec)
+    if _PAIR_RE.sub('', spec).strip():
+        raise ValueError(f"Expected key=value pairs, got {spec.strip()!r}")
+
+    for key, value in pairs:
+        if key in _PRICE_FILTERS:
+            values[key] = float(value)
+        elif key in _LIST_FILTERS:
+            values[key] = [v.strip() for v in value.split(',') if v.strip()]
+        else:
+            raise ValueError(f"Unknown filter {key!r}")
+    return SearchFilters(**values)
+
+
+def parse_query_line(
+        line: str, base: Optional[SearchFilters] = None
+) -> Optional[WatchQuery]:
+    """Parse a query-file line, ``query | key=value ...``; None for blank or # lines"""
+    line = line.strip()
+    if not line or line.startswith('#'):
+        return None
+    query, _, spec = line.partition('|')
+    query = query.strip()
+    if not query:
+        raise ValueError(f"Missing query in line {line!r}")
+    filters = parse_filters(spec, base) if spec.strip() else base
+    return WatchQuery(query, filters)
+
+
+def load_queries(
+        path: Union[str, Path], base: Optional[SearchFilters] = None
+) -> List[WatchQuery]:
+    """Read watch queries from a file, one per line"""
+    queries = []
+    with open(path, encoding='utf-8') as f:
+        for number, line in enumerate(f, 1):
+            try:
+                parsed = parse_query_line(line, base)
+            except ValueError as e:
+                raise ValueError(f"{path}:{number}: {e}") from e
+            if parsed:
+                queries.append(parsed)
+    return queries
+
+
+async def run_batch(
+        queries: Sequence[WatchQuery],
+        search: Callable[[str, Optional[SearchFilters]], Awaitable[List[Sale]]],
+        concurrency: int = 8,
+        on_result: Optional[Callable[[BatchResult], None]] = None
+) -> List[BatchResult]:
+    """Run `search` for every query with at most `concurrency` in flight.
+
+    `on_result` is called as each query finishes, so results can be streamed
+    to a store or progress display instead of waiting for the whole batch.
+    """
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def run_one(watch_query: WatchQuery) -> BatchResult:
+        async with semaphore:
+            started = time.perf_counter()
+            result = BatchResult(watch_query)
+            try:
+                result.sales = await search(watch_query.query, watch_query.filters)
+            except Exception as e:
+                logger.error("Batch search failed for %s: %s", watch_query.query, e)
+                result.error = str(e)
+            result.elapsed = time.perf_counter() - started
+        if on_result:
+            on_result(result)
+        return result
+
+    return await asyncio.gather(*(run_one(q) for q in queries))
+
+
+__all__ = [
+    'BatchResult', 'parse_filters', 'parse_query_line', 'load_queries', 'run_batch'
+]
\ No newline at end of file
@@ -1,5 +1,7 @@
 # TheWatch/core/config.py
-from pydantic_settings import BaseSettings
+from typing import Any
+
+from ..utils.normalize import CONDITIONS
 
 # Algolia credentials from the Grailed website
 ALGOLIA_APP_ID = "MNRWEFSS2Q"
@@ -21,10 +23,24 @@ ENDPOINTS = {
 RATE_LIMIT_REQUESTS = 50  # requests per minute
 RATE_LIMIT_WINDOW = 60  # seconds
 
+# Adaptive polling: per-query interval bounds (seconds) and the half-life
+# of the new-listing rate average
+POLL_MIN_INTERVAL = 60
+POLL_MAX_INTERVAL = 1800
+POLL_RATE_HALFLIFE = 1800
+
+# Alert rules: sales per notification, how long a match may wait and how often
+# waiting matches are checked (seconds)
+ALERT_MAX_BATCH = 20
+ALERT_MAX_DELAY = 300
+ALERT_FLUSH_INTERVAL = 10
+
 # Request settings
 REQUEST_TIMEOUT = 30
 MAX_RETRIES = 3
 RETRY_DELAY = 2  # seconds, will be multiplied by attempt number for backoff
+# How long a saved session (cookies from the homepage warm-up) is reused, in seconds
+SESSION_TTL = 6 * 3600
 
 # Default headers
 DEFAULT_HEADERS = {
@@ -40,47 +56,103 @@ DEFAULT_PAGE_SIZE = 40
 DEFAULT_MAX_PAGES = 3
 DEFAULT_SORT = "sold_date_desc"
 
-# Condition mappings
-CONDITION_MAP = {
-    "is_new": "New",
-    "is_gently_used": "Gently Used",
-    "is_used": "Used",
-    "is_very_worn": "Very Worn"
+# Deep crawls: deepest goods page served per query, and the dimensions
+# used to partition queries that have more listings than that
+PAGINATION_CAP = 25
+CRAWL_CATEGORIES = [
+    "tops", "bottoms", "outerwear", "footwear", "tailoring", "accessories"
+]
+CRAWL_SIZES = {
+    "tops": ["XXS", "XS", "S", "M", "L", "XL", "XXL"],
+    "outerwear": ["XXS", "XS", "S", "M", "L", "XL", "XXL"],
+    "bottoms": [str(waist) for waist in range(26, 41)],
+    "footwear": [f"US {size / 2:g}" for size in range(12, 30)],
 }
 
+# Condition mappings, from the canonical table in utils.normalize
+CONDITION_MAP = dict(CONDITIONS)
+
+# Price distribution buckets: (lower bound, label); each runs up to the next bound
+PRICE_RANGES = [
+    (0, "Under $100"),
+    (100, "$100-$250"),
+    (250, "$250-$500"),
+    (500, "$500-$1,000"),
+    (1000, "$1,000+"),
+]
+
+
+def _define_settings():
+    # pydantic-settings is slow to import, so the class is only built on first use
+    from pydantic_settings import BaseSettings
+
+    class Settings(BaseSettings):
+        """Application settings"""
+        # Algolia settings
+        algolia_app_id: str = ALGOLIA_APP_ID
+        algolia_api_key: str = ALGOLIA_API_KEY
+        algolia_index: str = ALGOLIA_INDEX
+        algolia_base_url: str = ALGOLIA_BASE_URL  # Added this line
+
+        # Base URLs
+        base_url: str = BASE_URL
+        api_base_url: str = API_BASE_URL
+
+        # Rate limiting
+        rate_limit_requests: int = RATE_LIMIT_REQUESTS
+        rate_limit_window: int = RATE_LIMIT_WINDOW
+
+        # Request settings
+        request_timeout: int = REQUEST_TIMEOUT
+        max_retries: int = MAX_RETRIES
+        retry_delay: int = RETRY_DELAY
+
+        # Search settings
+        default_page_size: int = DEFAULT_PAGE_SIZE
+        default_max_pages: int = DEFAULT_MAX_PAGES
+        default_sort: str = DEFAULT_SORT
+
+        # Instrumentation
+        metrics_enabled: bool = False
+
+        # Web result cache, shared by every API worker on the host
+        result_cache_path: str = "data/cache/results.db"
+        result_cache_ttl: int = 300
+        result_cache_max_entries: int = 1000
+
+        # Local listing store browsed by /api/sales
+        store_path: str = "data/sales.db"
+
+        # Saved session cookies, reused across runs and workers; a TTL of 0 always
+        # warms up
+        session_state_path: str = "data/cache/session.json"
+        session_ttl: int = SESSION_TTL
 
-class Settings(BaseSettings):
-    """Application settings"""
-    # Algolia settings
-    algolia_app_id: str = ALGOLIA_APP_ID
-    algolia_api_key: str = ALGOLIA_API_KEY
-    algolia_index: str = ALGOLIA_INDEX
-    algolia_base_url: str = ALGOLIA_BASE_URL  # Added this line
+        # Logging
+        log_level: str = "INFO"
+        log_json: bool = False
+        log_max_bytes: int = 0
 
-    # Base URLs
-    base_url: str = BASE_URL
-    api_base_url: str = API_BASE_URL
+        class Config:
+            env_prefix = "GRAILED_"
 
-    # Rate limiting
-    rate_limit_requests: int = RATE_LIMIT_REQUESTS
-    rate_limit_window: int = RATE_LIMIT_WINDOW
+    return Settings
 
-    # Request settings
-    request_timeout: int = REQUEST_TIMEOUT
-    max_retries: int = MAX_RETRIES
-    retry_delay: int = RETRY_DELAY
 
-    # Search settings
-    default_page_size: int = DEFAULT_PAGE_SIZE
-    default_max_pages: int = DEFAULT_MAX_PAGES
-    default_sort: str = DEFAULT_SORT
+# Bound by __getattr__ on first access; declared here for static checkers
+settings: Any
 
-    class Config:
-        env_prefix = "GRAILED_"
 
+def __getattr__(name: str):
+    """Build `Settings` and the `settings` instance lazily on first access"""
+    if name == 'Settings':
+        globals()['Settings'] = _define_settings()
+        return globals()['Settings']
+    if name == 'settings':
+        globals()['settings'] = __getattr__('Settings')()
+        return globals()['settings']
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-# Create settings instance
-settings = Settings()
 
 # Export settings
 __all__ = [
@@ -93,5 +165,6 @@ __all__ = [
     'ENDPOINTS',
     'DEFAULT_HEADERS',
     'CONDITION_MAP',
+    'PRICE_RANGES',
     'settings'
 ]
\ No newline at end of file
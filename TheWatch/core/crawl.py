@@ -0,0 +1,216 @@
+# TheWatch/core/crawl.py
+import hashlib
+import json
+import logging
+import os
+import time
+from dataclasses import asdict, dataclass, field, fields
+from pathlib import Path
+from typing import AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+from .models import Sale, SearchFilters, WatchQuery
+from .pipeline import FetchError, Pipeline
+
+logger = logging.getLogger(__name__)
+
+
+def checkpoint_key(query: str, filters: Optional[SearchFilters] = None) -> str:
+    """Stable file-name-safe key for a query and its filters"""
+    spec = json.dumps([query, asdict(filters) if filters else None], sort_keys=True)
+    return hashlib.sha1(spec.encode('utf-8')).hexdigest()[:16]
+
+
+@dataclass
+class CrawlCheckpoint:
+    """Progress of one query's crawl, saved after every completed page"""
+    query: str
+    url: Optional[str] = None
+    last_page: int = 0
+    listings: int = 0
+    completed: bool = False
+    started_at: float = field(default_factory=time.time)
+    updated_at: float = field(default_factory=time.time)
+
+
+class CheckpointStore:
+    """One JSON file per query under `directory`, replaced atomically on every save"""
+
+    def __init__(self, directory: str = "data/checkpoints"):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def load(self, key: str) -> Optional[CrawlCheckpoint]:
+        try:
+            with open(self._path(key), encoding='utf-8') as f:
+                saved = json.load(f)
+            # Fields dropped since the checkpoint was written are ignored
+            known = {f.name for f in fields(CrawlCheckpoint)}
+            return CrawlCheckpoint(**{k: v for k, v in saved.items() if k in known})
+        except FileNotFoundError:
+            return None
+        except (ValueError, TypeError) as e:
+            logger.warning("Ignoring unreadable checkpoint %s: %s", key, e)
+            return None
+
+    def save(self, key: str, checkpoint: CrawlCheckpoint) -> None:
+        checkpoint.updated_at = time.time()
+        path = self._path(key)
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(asdict(checkpoint), f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+
+    def delete(self, key: str) -> None:
+        self._path(key).unlink(missing_ok=True)
+
+
+@dataclass
+class CrawlResult:
+    """Outcome of a (possibly resumed) crawl"""
+    checkpoint: CrawlCheckpoint
+    sales: List[Sale] = field(default_factory=list)
+    pages_fetched: int = 0
+    resumed_from: int = 0
+    # Reached the empty page past the last one, rather than stopping at `max_pages`
+    exhausted: bool = False
+
+
+@dataclass
+class _Crawl:
+    key: str
+    result: CrawlResult
+    # Page past the checkpoint -> listings on it
+    delivered: Dict[int, int] = field(default_factory=dict)
+    end_page: Optional[int] = None  # The empty page past the last one, once fetched
+
+
+class CrawlSource:
+    """Resumable Pipeline page source: each query's goods pages after its checkpoint.
+
+    Pages are fetched in order but can be stored out of order, so a query's
+    checkpoint only advances over the unbroken run of pages passed to
+    `delivered`; a crawl that dies mid-way resumes at the first page whose
+    results were not yet delivered, reusing the already-resolved search URL.
+    The crawl completes once every page before the empty one, or the first
+    `max_pages`, has been delivered, and a completed checkpoint makes the
+    next crawl of the query start afresh.
+    """
+
+    def __init__(
+            self,
+            scraper,
+            checkpoints: Optional[CheckpointStore] = None,
+            max_pages: Optional[int] = None,
+    ):
+        self.scraper = scraper
+        self.checkpoints = checkpoints
+        self.max_pages = max_pages
+        self._crawls: Dict[str, _Crawl] = {}
+
+    def result(self, query: str) -> CrawlResult:
+        return self._crawls[query].result
+
+    def _save(self, crawl: _Crawl) -> None:
+        if self.checkpoints:
+            self.checkpoints.save(crawl.key, crawl.result.checkpoint)
+
+    def _advance(self, crawl: _Crawl) -> None:
+        state = crawl.result.checkpoint
+        moved = False
+        while state.last_page + 1 in crawl.delivered:
+            state.last_page += 1
+            state.listings += crawl.delivered.pop(state.last_page)
+            moved = True
+        if not state.completed:
+            crawl.result.exhausted = state.last_page + 1 == crawl.end_page
+            state.completed = crawl.result.exhausted or (
+                self.max_pages is not None and state.last_page >= self.max_pages
+            )
+            moved = moved or state.completed
+        if moved:
+            self._save(crawl)
+
+    async def pages(self, query: WatchQuery) -> AsyncIterator[Tuple[int, List[Dict]]]:
+        key = checkpoint_key(query.query, query.filters)
+        state = self.checkpoints.load(key) if self.checkpoints else None
+        if state is None or state.completed:
+            state = CrawlCheckpoint(query.query)
+        crawl = self._crawls[query.query] = _Crawl(
+            key, CrawlResult(state, resumed_from=state.last_page)
+        )
+        if state.last_page:
+            logger.info("Resuming crawl of %s after page %d",
+                        query.query, state.last_page)
+
+        if not state.url:
+            state.url = await self.scraper.get_search_url(query.query)
+            if not state.url:
+                raise FetchError(f"no search URL for {query.query}")
+            self._save(crawl)
+
+        page = state.last_page
+        while self.max_pages is None or page < self.max_pages:
+            page += 1
+            raw_listings = await self.scraper.get_listings_page(state.url, page)
+            if raw_listings is None:
+                logger.warning("Crawl of %s stopped at page %d; will resume there",
+                               query.query, page)
+                raise FetchError(f"page {page} of {query.query} failed")
+            crawl.result.pages_fetched += 1
+            if not raw_listings:
+                crawl.end_page = page
+                break
+            yield page, raw_listings
+        self._advance(crawl)
+
+    def delivered(self, query: WatchQuery, page: int, sales: List[Sale]) -> None:
+        """Record that `page` of `query` was handed on; advances its checkpoint"""
+        crawl = self._crawls[query.query]
+        crawl.delivered[page] = len(sales)
+        self._advance(crawl)
+
+
+async def crawl(
+        scraper,
+        query: str,
+        filters: Optional[SearchFilters] = None,
+        max_pages: Optional[int] = None,
+        checkpoints: Optional[CheckpointStore] = None,
+        on_page: Optional[Callable[[int, List[Sale]], None]] = None,
+        keep_sales: bool = True
+) -> CrawlResult:
+    """Walk a query's goods pages until an empty page or `max_pages`.
+
+    Runs a one-query Pipeline over a `CrawlSource`. With `checkpoints`,
+    progress is saved once a page has been handed to `on_page`; a page
+    whose `on_page` raised is not checkpointed, so the next call starts
+    there. A failed page request stops the crawl without marking it
+    complete; the next call retries from that page.
+    """
+    source = CrawlSource(scraper, checkpoints, max_pages)
+    pages: Dict[int, List[Sale]] = {}
+
+    def deliver(watch: WatchQuery, page: int, sales: List[Sale]) -> None:
+        if on_page:
+            on_page(page, sales)
+        if keep_sales:
+            pages[page] = sales
+        source.delivered(watch, page, sales)
+
+    pipeline = Pipeline(scraper, fetch_concurrency=1, pages=source.pages,
+                        on_page=deliver, keep_sales=False)
+    await pipeline.run([WatchQuery(query, filters)])
+    result = source.result(query)
+    result.sales = [sale for page in sorted(pages) for sale in pages[page]]
+    return result
+
+
+__all__ = [
+    'crawl', 'checkpoint_key', 'CheckpointStore',
+    'CrawlCheckpoint', 'CrawlResult', 'CrawlSource'
+]
\ No newline at end of file
@@ -1,6 +1,25 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import List, Optional, Dict, Any
+from functools import lru_cache
+from typing import FrozenSet, List, Optional, Dict, Any, Tuple
+
+from ..utils.normalize import (
+    UNKNOWN, canonical_designer, condition_code, condition_label, size_code
+)
+
+
+@lru_cache(maxsize=256)
+def condition_codes(conditions: Tuple[str, ...]) -> FrozenSet[int]:
+    """Condition codes of a filter's condition names, without unrecognised ones"""
+    return frozenset(condition_code(c) for c in conditions) - {UNKNOWN}
+
+def _substrings_cover(broad: Optional[List[str]], narrow: Optional[List[str]]) -> bool:
+    # Substring filters: every narrow value must contain some broad value
+    if not broad:
+        return True
+    return bool(narrow) and all(
+        any(b.lower() in n.lower() for b in broad) for n in narrow
+    )
 
 @dataclass
 class SearchFilters:
@@ -13,22 +32,148 @@ class SearchFilters:
     categories: Optional[List[str]] = None
     sizes: Optional[List[str]] = None
 
+    def matches(self, sale: 'Sale') -> bool:
+        """Check a sale against these filters; unset filters match everything"""
+        if self.min_price is not None and sale.price < self.min_price:
+            return False
+        if self.max_price is not None and sale.price > self.max_price:
+            return False
+        if self.designers:
+            designer = (sale.designer or '').lower()
+            if not any(d.lower() in designer for d in self.designers):
+                return False
+        if self.conditions:
+            if sale.condition_code not in condition_codes(tuple(self.conditions)):
+                return False
+        if self.sizes:
+            # Filter sizes are read in the sale's category, so "US 8.5" matches
+            # "EU 42" shoes
+            code = sale.size_code
+            if code == UNKNOWN or not any(
+                size_code(s, sale.category) == code for s in self.sizes
+            ):
+                return False
+        if self.locations:
+            location = (sale.location or '').lower()
+            if not any(loc.lower() in location for loc in self.locations):
+                return False
+        if self.categories:
+            category = (sale.category or '').lower()
+            if not any(c.lower() in category for c in self.categories):
+                return False
+        return True
+
+    def covers(self, other: 'SearchFilters') -> bool:
+        """Whether every sale `other` matches is also matched by these filters"""
+        if self.min_price is not None and (
+                other.min_price is None or other.min_price < self.min_price):
+            return False
+        if self.max_price is not None and (
+                other.max_price is None or other.max_price > self.max_price):
+            return False
+        if self.conditions:
+            if not other.conditions or not (
+                condition_codes(tuple(other.conditions))
+                <= condition_codes(tuple(self.conditions))
+            ):
+                return False
+        if self.sizes:
+            # Size codes depend on the sale's category, so only identical spellings
+            # are known to agree
+            sizes = {' '.join(s.upper().split()) for s in self.sizes}
+            if not other.sizes or any(
+                ' '.join(s.upper().split()) not in sizes for s in other.sizes
+            ):
+                return False
+        return (_substrings_cover(self.designers, other.designers)
+                and _substrings_cover(self.locations, other.locations)
+                and _substrings_cover(self.categories, other.categories))
+
+@dataclass
+class WatchQuery:
+    """A search the monitor polls repeatedly"""
+    query: str
+    filters: Optional[SearchFilters] = None
+    # Bounds on the adaptive polling interval, in seconds; None uses the scheduler's
+    # defaults
+    min_interval: Optional[float] = None
+    max_interval: Optional[float] = None
+
 @dataclass
 class Sale:
     """Represents a single sale from Grailed"""
-    id: int
     title: str
     price: float
     original_price: float
     designer: str
     size: str
     condition: str
-    location: str
-    seller: str
     url: str
-    photos: List[str]
-    created_at: datetime
-    category: str
-    description: str
+    id: Optional[int] = None
+    location: Optional[str] = None
+    seller: Optional[str] = None
+    photos: List[str] = field(default_factory=list)
+    created_at: Optional[datetime] = None
+    sold_date: Optional[datetime] = None
+    category: str = 'Unknown'
+    description: str = ''
+    tags: List[str] = field(default_factory=list)
+    raw_data: Optional[Dict[str, Any]] = None
     discount: Optional[float] = None
-    discount_percentage: Optional[float] = None
\ No newline at end of file
+    discount_percentage: Optional[float] = None
+    platform: str = 'Grailed'
+    measurements: Dict[str, Any] = field(default_factory=dict)
+    seller_stats: Dict[str, Any] = field(default_factory=dict)
+    enriched_at: Optional[datetime] = None
+
+    def __post_init__(self):
+        # Sold listings only carry one timestamp; keep both fields usable
+        if self.sold_date is None:
+            self.sold_date = self.created_at or datetime.now()
+        if self.created_at is None:
+            self.created_at = self.sold_date
+
+        if self.discount is None and self.original_price > self.price:
+            self.discount = self.original_price - self.price
+            self.discount_percentage = self.discount / self.original_price * 100
+
+    @property
+    def discount_amount(self) -> float:
+        return max(self.original_price - self.price, 0.0)
+
+    @property
+    def designer_display(self) -> str:
+        return canonical_designer(self.designer) or 'Unknown'
+
+    @property
+    def condition_code(self) -> int:
+        return condition_code(self.condition or '')
+
+    @property
+    def size_code(self) -> int:
+        return size_code(str(self.size), self.category)
+
+    @property
+    def condition_display(self) -> str:
+        return condition_label(self.condition_code) or self.condition
+
+@dataclass
+class SalesAnalytics:
+    """Summary statistics over a set of sales"""
+    total_sales: int
+    total_value: float
+    average_price: float
+    median_price: float
+    min_price: float
+    max_price: float
+    price_ranges: Dict[str, int] = field(default_factory=dict)
+    condition_distribution: Dict[str, int] = field(default_factory=dict)
+    size_distribution: Dict[str, int] = field(default_factory=dict)
+
+    @classmethod
+    def from_sales(cls, sales: List[Sale]) -> Optional['SalesAnalytics']:
+        """Compute analytics for `sales`; None when there are none"""
+        from .analytics import SalesAccumulator
+        accumulator = SalesAccumulator()
+        accumulator.extend(sales)
+        return accumulator.snapshot()
\ No newline at end of file
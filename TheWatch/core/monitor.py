@@ -0,0 +1,228 @@
+# TheWatch/core/monitor.py
+import asyncio
+import logging
+import multiprocessing
+import os
+import queue
+import time
+from dataclasses import dataclass, field, replace
+from typing import Callable, Dict, List, Optional, Sequence, Union
+
+from .config import RATE_LIMIT_REQUESTS, RATE_LIMIT_WINDOW
+from .models import Sale, WatchQuery
+from .overlap import FetchGroup, QueryPlan, plan_queries
+from .ratelimit import RateLimiter, SharedRateLimiter
+from .scraper import GrailedScraper
+
+logger = logging.getLogger(__name__)
+
+ScraperFactory = Callable[[Optional[RateLimiter]], GrailedScraper]
+
+
+@dataclass
+class ShardHealth:
+    """Progress and error state reported by one monitor worker process"""
+    shard: int
+    pid: Optional[int] = None
+    queries: int = 0
+    cycles: int = 0
+    completed: int = 0
+    failed: int = 0
+    listings: int = 0
+    fetches: int = 0  # Upstream searches issued; overlapping queries share one
+    last_error: Optional[str] = None
+    alive: bool = True  # False once the worker process has crashed
+
+
+@dataclass
+class MonitorResult:
+    """Aggregated output of a sharded monitor run"""
+    results: Dict[str, List[Sale]] = field(default_factory=dict)
+    health: List[ShardHealth] = field(default_factory=list)
+    elapsed: float = 0.0
+
+    @property
+    def total_listings(self) -> int:
+        return sum(len(sales) for sales in self.results.values())
+
+    @property
+    def healthy(self) -> bool:
+        return all(h.alive and not h.failed for h in self.health)
+
+    @property
+    def fetches_per_cycle(self) -> float:
+        """Distinct upstream searches per polling cycle, across all shards"""
+        cycles = max((h.cycles for h in self.health), default=0)
+        return sum(h.fetches for h in self.health) / cycles if cycles else 0.0
+
+
+def split_queries(queries: Sequence, shards: int) -> List[List]:
+    """Distribute queries (or fetch groups) round-robin over `shards` buckets, dropping
+    empty ones
+    """
+    buckets = [list(queries[i::shards]) for i in range(shards)]
+    return [bucket for bucket in buckets if bucket]
+
+
+async def _run_shard_async(
+        shard: int,
+        groups: List[FetchGroup],
+        rate_limiter: Optional[RateLimiter],
+        results: multiprocessing.Queue,
+        cycles: int,
+        interval: float,
+        scraper_factory: ScraperFactory
+) -> None:
+    plan = QueryPlan(groups)
+    health = ShardHealth(shard=shard, pid=os.getpid(), queries=plan.queries)
+    scraper = scraper_factory(rate_limiter)
+    try:
+        for cycle in range(cycles):
+            if cycle:
+                await asyncio.sleep(interval)
+
+            searches = plan.searches
+            outcomes = await plan.execute(scraper)
+            health.fetches += plan.searches - searches
+            for query, outcome in outcomes.items():
+                if isinstance(outcome, BaseException):
+                    health.failed += 1
+                    health.last_error = f"{query}: {outcome}"
+                    continue
+                health.completed += 1
+                health.listings += len(outcome)
+                results.put(('result', shard, (query, outcome)))
+
+            health.cycles += 1
+            results.put(('health', shard, replace(health)))
+    finally:
+        await scraper.close()
+
+
+def _run_shard(
+        shard: int,
+        groups: List[FetchGroup],
+        rate_limiter: Optional[RateLimiter],
+        results: multiprocessing.Queue,
+        cycles: int,
+        interval: float,
+        scraper_factory: ScraperFactory
+) -> None:
+    """Worker process entry point: one event loop and one session per shard"""
+    try:
+        asyncio.run(_run_shard_async(
+            shard, groups, rate_limiter, results, cycles, interval, scraper_factory
+        ))
+    except Exception as e:
+        results.put(('health', shard, ShardHealth(
+            shard=shard, pid=os.getpid(), queries=sum(len(g.members) for g in groups),
+            last_error=str(e), alive=False
+        )))
+    finally:
+        results.put(('done', shard, None))
+
+
+class ShardedMonitor:
+    """Runs a set of watch queries across worker processes sharing one request budget.
+
+    Each worker owns its event loop and HTTP session, so JSON decoding and HTML
+    parsing scale with cores while the shared token bucket keeps the combined
+    request rate under `max_requests` per `window` seconds.
+
+    Queries subsumed by a broader watched query are derived from its results
+    instead of being searched separately (see core.overlap); a fetch group
+    always runs on a single shard.
+    """
+
+    def __init__(
+            self,
+            queries: Sequence[Union[str, WatchQuery]],
+            workers: Optional[int] = None,
+            max_requests: int = RATE_LIMIT_REQUESTS,
+            window: float = RATE_LIMIT_WINDOW,
+            scraper_factory: ScraperFactory = GrailedScraper,
+            start_method: Optional[str] = None
+    ):
+        self.queries = [
+            q if isinstance(q, WatchQuery) else WatchQuery(q) for q in queries
+        ]
+        self.plan = plan_queries(self.queries)
+        self.workers = max(
+            1, min(workers or os.cpu_count() or 1, self.plan.fetches or 1)
+        )
+        self.scraper_factory = scraper_factory
+        self.ctx = multiprocessing.get_context(start_method)
+        self.rate_limiter = SharedRateLimiter(max_requests, window, ctx=self.ctx)
+
+    def run(self, cycles: int = 1, interval: float = 0.0) -> MonitorResult:
+        """Poll every query `cycles` times, `interval` seconds apart; merge results"""
+        started = time.monotonic()
+        results = self.ctx.Queue()
+        shards = split_queries(self.plan.groups, self.workers)
+
+        health = {
+            i: ShardHealth(shard=i, queries=QueryPlan(s).queries)
+            for i, s in enumerate(shards)
+        }
+        processes = {}
+        for i, shard_groups in enumerate(shards):
+            process = self.ctx.Process(
+                target=_run_shard,
+                args=(i, shard_groups, self.rate_limiter, results, cycles, interval,
+                      self.scraper_factory),
+                name=f"thewatch-shard-{i}",
+                daemon=True
+            )
+            process.start()
+            processes[i] = process
+            health[i].pid = process.pid
+
+        seen: Dict[str, Dict[Union[int, str], Sale]] = {
+            q.query: {} for q in self.queries
+        }
+        pending = set(processes)
+        exited = set()
+        while pending:
+            try:
+                kind, shard, payload = results.get(timeout=0.5)
+            except queue.Empty:
+                # A worker that dies without reporting is only declared lost on the
+                # second empty poll, so a final message still in the pipe is not missed
+                for shard in list(pending):
+                    if processes[shard].is_alive():
+                        continue
+                    if shard in exited:
+                        pending.discard(shard)
+                        health[shard].alive = False
+                        exitcode = processes[shard].exitcode
+                        health[shard].last_error = f"exited with code {exitcode}"
+                        logger.error("Monitor shard %s died: %s",
+                                     shard, health[shard].last_error)
+                    exited.add(shard)
+                continue
+
+            if kind == 'result':
+                query, sales = payload
+                for sale in sales:
+                    seen[query][sale.id if sale.id is not None else sale.url] = sale
+            elif kind == 'health':
+                health[shard] = payload
+            elif kind == 'done':
+                pending.discard(shard)
+
+        for shard, process in processes.items():
+            process.join()
+            if process.exitcode != 0:
+                health[shard].alive = False
+
+        result = MonitorResult(
+            results={query: list(sales.values()) for query, sales in seen.items()},
+            health=[health[i] for i in sorted(health)],
+            elapsed=time.monotonic() - started
+        )
+        logger.info("Monitor served %d queries with %.1f upstream searches per cycle",
+                    len(self.queries), result.fetches_per_cycle)
+        return result
+
+
+__all__ = ['ShardedMonitor', 'MonitorResult', 'ShardHealth', 'split_queries']
\ No newline at end of file
@@ -0,0 +1,162 @@
+# TheWatch/core/overlap.py
+import logging
+import re
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet, List, Sequence, Union
+
+from .config import DEFAULT_PAGE_SIZE
+from .models import Sale, SearchFilters, WatchQuery
+from .pipeline import Pipeline
+
+logger = logging.getLogger(__name__)
+
+_TERM_RE = re.compile(r'[^\W_]+')
+
+
+def query_terms(query: str) -> FrozenSet[str]:
+    """Lower-cased search terms of a query"""
+    return frozenset(_TERM_RE.findall(query.lower()))
+
+
+def subsumes(broad: WatchQuery, narrow: WatchQuery) -> bool:
+    """Whether every listing `narrow` matches is also matched by `broad`.
+
+    Grailed search requires every term, so a query whose terms include all of
+    the broader query's terms only narrows its results; the filters must be
+    at least as tight as the broader query's.
+    """
+    if not query_terms(broad.query) <= query_terms(narrow.query):
+        return False
+    if broad.filters is None:
+        return True
+    return broad.filters.covers(narrow.filters or SearchFilters())
+
+
+def matches_terms(sale: Sale, terms: FrozenSet[str]) -> bool:
+    """Local stand-in for upstream term matching, over the listing's text fields"""
+    if not terms:
+        return True
+    text = f"{sale.title} {sale.designer} {sale.description} {sale.category}".lower()
+    return terms <= frozenset(_TERM_RE.findall(text))
+
+
+@dataclass
+class FetchGroup:
+    """One upstream search serving every member query it subsumes"""
+    query: str
+    members: List[WatchQuery] = field(default_factory=list)
+
+    def derive(self, sales: List[Sale], complete: bool = True) -> Dict[str, List[Sale]]:
+        """Each member's results from the group's unfiltered listings.
+
+        Unless `complete` (the group's search returned everything it matches),
+        members with extra terms are left out: their own first page can hold
+        listings past the group's first page.
+        """
+        terms = query_terms(self.query)
+        derived = {}
+        for member in self.members:
+            extra = query_terms(member.query) - terms
+            if extra and not complete:
+                continue
+            derived[member.query] = [
+                sale for sale in sales
+                if matches_terms(sale, extra)
+                and (member.filters is None or member.filters.matches(sale))
+            ]
+        return derived
+
+
+@dataclass
+class QueryPlan:
+    """Fetch groups covering a watchlist; one upstream search per group per cycle,
+    plus one per narrower member whenever its group's page came back full"""
+    groups: List[FetchGroup] = field(default_factory=list)
+    page_size: int = DEFAULT_PAGE_SIZE
+    searches: int = 0  # Upstream searches issued by `execute` so far
+
+    @property
+    def queries(self) -> int:
+        return sum(len(group.members) for group in self.groups)
+
+    @property
+    def fetches(self) -> int:
+        return len(self.groups)
+
+    async def _search(
+            self, scraper, queries: List[WatchQuery]
+    ) -> Dict[str, Union[List[Sale], BaseException]]:
+        # First pages only, every query in flight at once; the scraper's rate limiter
+        # paces them
+        pipeline = Pipeline(scraper, fetch_concurrency=len(queries))
+        result = await pipeline.run(queries)
+        self.searches += len(queries)
+        return {
+            query.query: result.failed.get(query.query, result.results[query.query])
+            for query in queries
+        }
+
+    async def execute(self, scraper) -> Dict[str, Union[List[Sale], BaseException]]:
+        """Run one cycle: each group's search once, then every member derived locally
+        or, when the group's page was full, searched on its own"""
+        searches = {group.query: WatchQuery(group.query) for group in self.groups}
+        outcomes = await self._search(scraper, list(searches.values()))
+        results: Dict[str, Union[List[Sale], BaseException]] = {}
+        direct: Dict[str, WatchQuery] = {}
+        for group in self.groups:
+            outcome = outcomes[group.query]
+            if isinstance(outcome, BaseException):
+                results.update((member.query, outcome) for member in group.members)
+                continue
+            derived = group.derive(outcome, complete=len(outcome) < self.page_size)
+            results.update(derived)
+            direct.update(
+                (member.query, member) for member in group.members
+                if member.query not in derived
+            )
+
+        if direct:
+            results.update(await self._search(scraper, list(direct.values())))
+        return results
+
+
+def plan_queries(
+        queries: Sequence[Union[str, WatchQuery]], page_size: int = DEFAULT_PAGE_SIZE
+) -> QueryPlan:
+    """Group queries under the broadest query that subsumes them.
+
+    Queries are visited broadest first (fewest terms, then unfiltered before
+    filtered), so each one joins the first existing group whose search
+    query subsumes it or starts a group of its own. A narrower query is only
+    derived when the broader search returned fewer than `page_size`
+    listings, i.e. everything it matches; after a full page it is searched
+    directly, since its own first page can reach past the broader one.
+    """
+    watch = [q if isinstance(q, WatchQuery) else WatchQuery(q) for q in queries]
+    order = sorted(range(len(watch)), key=lambda i: (
+        len(query_terms(watch[i].query)), watch[i].filters is not None, i
+    ))
+
+    roots: List[WatchQuery] = []
+    groups: List[FetchGroup] = []
+    for i in order:
+        query = watch[i]
+        for root, group in zip(roots, groups):
+            if subsumes(root, query):
+                group.members.append(query)
+                break
+        else:
+            roots.append(query)
+            groups.append(FetchGroup(query.query, [query]))
+
+    plan = QueryPlan(groups, page_size)
+    if plan.fetches < plan.queries:
+        logger.info("%d watched queries share %d upstream searches",
+                    plan.queries, plan.fetches)
+    return plan
+
+
+__all__ = [
+    'FetchGroup', 'QueryPlan', 'plan_queries',
+    'subsumes', 'query_terms', 'matches_terms'
+]
\ No newline at end of file
@@ -0,0 +1,322 @@
+# TheWatch/core/pipeline.py
+import asyncio
+import logging
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import (
+    Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple,
+    Union
+)
+
+from .models import Sale, SearchFilters, WatchQuery
+
+logger = logging.getLogger(__name__)
+
+_DONE = object()
+
+# Yields (page number, raw listings) for a query, in page order
+PageSource = Callable[[WatchQuery], AsyncIterator[Tuple[int, List[Dict]]]]
+
+
+class FetchError(Exception):
+    """A query's search URL or one of its pages could not be fetched"""
+
+
+def normalize_page(
+        raw_listings: List[Dict], filters: Optional[SearchFilters] = None
+) -> List[Sale]:
+    """Normalize and filter one page of raw listings; runs in a pool worker"""
+    from .scraper import normalize_listings
+    return normalize_listings(raw_listings, filters)
+
+
+@dataclass
+class StageStats:
+    """Throughput and input backlog of one pipeline stage"""
+    name: str
+    workers: int
+    items: int = 0
+    listings: int = 0
+    errors: int = 0
+    busy: float = 0.0  # Summed over workers
+    # Share of the workers' wall time spent busy, set when the run ends
+    utilization: float = 0.0
+    max_depth: int = 0
+    _depth_total: int = field(default=0, repr=False)
+    _depth_samples: int = field(default=0, repr=False)
+
+    def sample(self, depth: int) -> None:
+        self.max_depth = max(self.max_depth, depth)
+        self._depth_total += depth
+        self._depth_samples += 1
+
+    @property
+    def mean_depth(self) -> float:
+        return self._depth_total / self._depth_samples if self._depth_samples else 0.0
+
+
+@dataclass
+class PipelineResult:
+    sales: List[Sale] = field(default_factory=list)
+    # Per query, when sales are kept
+    results: Dict[str, List[Sale]] = field(default_factory=dict)
+    # Queries whose fetch stopped on an error
+    failed: Dict[str, BaseException] = field(default_factory=dict)
+    stages: Dict[str, StageStats] = field(default_factory=dict)
+    elapsed: float = 0.0
+    exported: Optional[str] = None
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Per-stage items/s, listings/s, utilization and queue depth"""
+        elapsed = self.elapsed
+        return {
+            name: {
+                'workers': s.workers,
+                'items': s.items,
+                'items_per_sec': round(s.items / elapsed, 1) if elapsed else 0.0,
+                'listings_per_sec': round(s.listings / elapsed, 1) if elapsed else 0.0,
+                'utilization': round(s.utilization, 3),
+                'mean_queue_depth': round(s.mean_depth, 2),
+                'max_queue_depth': s.max_depth,
+                'errors': s.errors,
+            }
+            for name, s in self.stages.items()
+        }
+
+    @property
+    def bottleneck(self) -> Optional[str]:
+        """The stage whose workers were busiest"""
+        return max(self.stages, key=lambda name: self.stages[name].utilization,
+                   default=None)
+
+
+class Pipeline:
+    """Fetch -> parse -> store -> export, as stages joined by bounded queues.
+
+    Fetch workers page through queries on the event loop. Parse workers hand
+    each page to `executor` (threads by default, or processes with
+    `processes=True`) so normalization never blocks in-flight requests. A
+    single store worker writes batches to SQLite off the loop, and the export
+    stage writes everything collected once the store has drained. Every queue
+    holds at most `queue_size` items, so a slow stage throttles the ones
+    before it instead of letting pages pile up in memory.
+
+    Pages come from `pages` (by default the query's search pages, up to
+    `max_pages` or, with None, until an empty page). `on_page` sees each
+    page's sales once they are stored, and `on_query` each query once its
+    fetching has ended, with the error that stopped it if any.
+    """
+
+    def __init__(
+            self,
+            scraper,
+            store=None,
+            exporter=None,
+            fetch_concurrency: int = 4,
+            parse_workers: int = 2,
+            queue_size: int = 8,
+            max_pages: Optional[int] = 1,
+            processes: bool = False,
+            executor: Optional[Executor] = None,
+            pages: Optional[PageSource] = None,
+            on_page: Optional[Callable[[WatchQuery, int, List[Sale]], None]] = None,
+            on_query: Optional[
+                Callable[[WatchQuery, Optional[BaseException]], None]
+            ] = None,
+            keep_sales: bool = True
+    ):
+        self.scraper = scraper
+        self.store = store
+        self.exporter = exporter
+        self.fetch_concurrency = max(1, fetch_concurrency)
+        self.parse_workers = max(1, parse_workers)
+        self.queue_size = max(1, queue_size)
+        self.max_pages = max_pages
+        self.processes = processes
+        self.executor = executor
+        self.pages = pages or self.search_pages
+        self.on_page = on_page
+        self.on_query = on_query
+        self.keep_sales = keep_sales
+
+    async def search_pages(
+            self, query: WatchQuery
+    ) -> AsyncIterator[Tuple[int, List[Dict]]]:
+        """The query's goods pages, stopping at an empty page or `max_pages`"""
+        url = await self.scraper.get_search_url(query.query)
+        if not url:
+            raise FetchError(f"no search URL for {query.query}")
+        page = 0
+        while self.max_pages is None or page < self.max_pages:
+            page += 1
+            raw_listings = await self.scraper.get_listings_page(url, page)
+            if raw_listings is None:
+                raise FetchError(f"page {page} of {query.query} failed")
+            if not raw_listings:
+                return
+            yield page, raw_listings
+
+    async def _fetch(
+            self, query: WatchQuery, out: asyncio.Queue, stats: StageStats
+    ) -> None:
+        pages = self.pages(query).__aiter__()
+        while True:
+            started = time.perf_counter()
+            try:
+                page, raw_listings = await pages.__anext__()
+            except StopAsyncIteration:
+                return
+            finally:
+                stats.busy += time.perf_counter() - started
+            stats.items += 1
+            stats.listings += len(raw_listings)
+            await out.put((query, page, raw_listings))
+
+    async def run(
+            self,
+            queries: Sequence[Union[str, WatchQuery]],
+            export_name: str = "pipeline",
+    ) -> PipelineResult:
+        watch = [q if isinstance(q, WatchQuery) else WatchQuery(q) for q in queries]
+        loop = asyncio.get_running_loop()
+        owns_executor = self.executor is None
+        executor = self.executor or (
+            ProcessPoolExecutor(self.parse_workers) if self.processes
+            else ThreadPoolExecutor(self.parse_workers)
+        )
+        io_executor = ThreadPoolExecutor(1, thread_name_prefix='pipeline-store')
+
+        stats = {
+            'fetch': StageStats('fetch', self.fetch_concurrency),
+            'parse': StageStats('parse', self.parse_workers),
+            'store': StageStats('store', 1),
+            'export': StageStats('export', 1),
+        }
+        work: asyncio.Queue = asyncio.Queue()
+        for query in watch:
+            work.put_nowait(query)
+        to_parse: asyncio.Queue = asyncio.Queue(self.queue_size)
+        to_store: asyncio.Queue = asyncio.Queue(self.queue_size)
+        to_export: asyncio.Queue = asyncio.Queue(self.queue_size)
+        result = PipelineResult(stages=stats)
+
+        async def stage(
+                name: str,
+                inbox: asyncio.Queue,
+                handle: Callable[[Any], Awaitable[Any]],
+                outbox: Optional[asyncio.Queue] = None
+        ) -> None:
+            while True:
+                stats[name].sample(inbox.qsize())
+                item = await inbox.get()
+                if item is _DONE:
+                    return
+                # Busy time excludes waiting on a full outbox, so a stalled stage
+                # isn't mistaken for a slow one
+                started = time.perf_counter()
+                try:
+                    output = await handle(item)
+                except Exception as e:
+                    stats[name].errors += 1
+                    logger.error("Pipeline %s stage failed: %s", name, e)
+                    continue
+                finally:
+                    stats[name].busy += time.perf_counter() - started
+                if outbox is not None:
+                    await outbox.put(output)
+
+        async def fetch_worker() -> None:
+            while not work.empty():
+                stats['fetch'].sample(work.qsize())
+                query = work.get_nowait()
+                if self.keep_sales:
+                    result.results.setdefault(query.query, [])
+                error = None
+                try:
+                    await self._fetch(query, to_parse, stats['fetch'])
+                except Exception as e:
+                    error = result.failed[query.query] = e
+                    stats['fetch'].errors += 1
+                    logger.error("Pipeline fetch failed for %s: %s", query.query, e)
+                if self.on_query is not None:
+                    self.on_query(query, error)
+
+        async def parse(item) -> None:
+            query, page, raw_listings = item
+            sales = await loop.run_in_executor(
+                executor, normalize_page, raw_listings, query.filters
+            )
+            stats['parse'].items += 1
+            stats['parse'].listings += len(sales)
+            return query, page, sales
+
+        async def persist(item) -> None:
+            query, page, sales = item
+            if self.store is not None:
+                await loop.run_in_executor(
+                    io_executor, self.store.upsert, sales, query.query
+                )
+            stats['store'].items += 1
+            stats['store'].listings += len(sales)
+            if self.on_page is not None:
+                self.on_page(query, page, sales)
+            return query, sales
+
+        async def collect(item) -> None:
+            query, sales = item
+            if self.keep_sales:
+                result.sales.extend(sales)
+                result.results.setdefault(query.query, []).extend(sales)
+            stats['export'].items += 1
+            stats['export'].listings += len(sales)
+
+        async def drain(
+                workers: List[asyncio.Task], inbox: asyncio.Queue, consumers: int
+        ) -> None:
+            await asyncio.gather(*workers)
+            for _ in range(consumers):
+                await inbox.put(_DONE)
+
+        started = time.perf_counter()
+        try:
+            fetchers = [
+                asyncio.create_task(fetch_worker())
+                for _ in range(self.fetch_concurrency)
+            ]
+            parsers = [
+                asyncio.create_task(stage('parse', to_parse, parse, to_store))
+                for _ in range(self.parse_workers)
+            ]
+            storer = [asyncio.create_task(stage('store', to_store, persist, to_export))]
+            exporter = [asyncio.create_task(stage('export', to_export, collect))]
+            await drain(fetchers, to_parse, self.parse_workers)
+            await drain(parsers, to_store, 1)
+            await drain(storer, to_export, 1)
+            await asyncio.gather(*exporter)
+
+            if self.exporter is not None and result.sales:
+                export_started = time.perf_counter()
+                result.exported = await loop.run_in_executor(
+                    io_executor, self.exporter.export_csv, result.sales, export_name
+                )
+                stats['export'].busy += time.perf_counter() - export_started
+        finally:
+            io_executor.shutdown()
+            if owns_executor:
+                executor.shutdown()
+
+        result.elapsed = time.perf_counter() - started
+        for s in stats.values():
+            s.utilization = (
+                s.busy / (s.workers * result.elapsed) if result.elapsed else 0.0
+            )
+        logger.info("Pipeline: %d listings in %.2fs; busiest stage %s",
+                    len(result.sales), result.elapsed, result.bottleneck)
+        return result
+
+
+__all__ = [
+    'FetchError', 'PageSource', 'Pipeline', 'PipelineResult', 'StageStats',
+    'normalize_page'
+]
\ No newline at end of file
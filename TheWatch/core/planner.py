@@ -0,0 +1,249 @@
+# TheWatch/core/planner.py
+import asyncio
+import logging
+import math
+from dataclasses import dataclass, field, replace
+from typing import Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+from .config import CRAWL_CATEGORIES, CRAWL_SIZES, PAGINATION_CAP
+from .models import Sale, SearchFilters
+from .scraper import normalize_listings
+
+logger = logging.getLogger(__name__)
+
+# Price intervals narrower than this are split by size instead
+MIN_PRICE_WIDTH = 1.0
+MAX_PRICE_SPLIT = 8
+
+
+@dataclass(frozen=True)
+class Partition:
+    """A slice of a query's catalog; prices cover [min_price, max_price)"""
+    category: Optional[str] = None
+    size: Optional[str] = None
+    min_price: Optional[float] = None
+    max_price: Optional[float] = None
+
+    def params(self) -> Dict[str, object]:
+        """Extra goods-API parameters selecting this partition"""
+        params: Dict[str, object] = {}
+        if self.category:
+            params['category'] = self.category
+        if self.size:
+            params['size'] = self.size
+        if self.min_price is not None:
+            params['price_min'] = self.min_price
+        if self.max_price is not None:
+            params['price_max'] = self.max_price
+        return params
+
+    def __str__(self) -> str:
+        return ' '.join(f"{k}={v}" for k, v in self.params().items()) or 'all'
+
+
+@dataclass
+class DeepCrawlResult:
+    """Listings and request accounting for one partitioned crawl"""
+    query: str
+    sales: List[Sale] = field(default_factory=list)
+    requests: int = 0
+    partitions: int = 0
+    splits: int = 0
+    duplicates: int = 0
+    failed: List[Partition] = field(default_factory=list)
+    truncated: List[Partition] = field(default_factory=list)
+    # Listings a category or size split could not account for (reported totals)
+    uncovered: int = 0
+
+
+def _price_boundaries(
+        part: Partition, prices: Sequence[float], pieces: int
+) -> List[float]:
+    """Cut points strictly inside the partition's price interval, at quantiles of its
+    page-1 prices
+    """
+    lo = part.min_price or 0.0
+    hi = part.max_price
+    cuts: List[float] = []
+    ordered = sorted(p for p in prices if p >= lo and (hi is None or p < hi))
+    if len(ordered) >= pieces:
+        for j in range(1, pieces):
+            cuts.append(ordered[j * len(ordered) // pieces])
+    elif hi is not None:
+        cuts = [lo + (hi - lo) * j / pieces for j in range(1, pieces)]
+
+    valid = []
+    for cut in sorted(set(round(c, 2) for c in cuts)):
+        wide_below = cut - (valid[-1] if valid else lo) >= MIN_PRICE_WIDTH
+        if wide_below and (hi is None or hi - cut >= MIN_PRICE_WIDTH):
+            valid.append(cut)
+    return valid
+
+
+class CrawlPlanner:
+    """Covers a whole catalog by splitting queries that exceed the pagination cap.
+
+    Page 1 of each partition reports the partition's total. Partitions that fit
+    under `page_cap` pages are paged out; larger ones are split by category,
+    then by price at quantiles of the partition's page-1 prices, then by size, and
+    the children go back on the work queue. Results are deduplicated by
+    listing ID across partitions, and the page 1 already fetched for a split
+    partition still counts towards coverage.
+
+    Category and size splits only reach listings whose category or size
+    appears in `categories`/`sizes`; the shortfall against the reported
+    totals is counted in `DeepCrawlResult.uncovered`.
+    """
+
+    def __init__(
+            self,
+            scraper,
+            page_cap: int = PAGINATION_CAP,
+            concurrency: int = 4,
+            categories: Sequence[str] = tuple(CRAWL_CATEGORIES),
+            sizes: Optional[Dict[str, Sequence[str]]] = None
+    ):
+        self.scraper = scraper
+        self.page_cap = page_cap
+        self.concurrency = max(1, concurrency)
+        self.categories = list(categories)
+        self.sizes = CRAWL_SIZES if sizes is None else sizes
+
+    def split(
+            self, part: Partition, prices: Sequence[float], total: int, capacity: int
+    ) -> Tuple[str, List[Partition]]:
+        """Children covering `part`, and the dimension that was split"""
+        if part.category is None and part.size is None and self.categories:
+            return 'category', [replace(part, category=c) for c in self.categories]
+
+        if part.size is None:
+            pieces = min(max(2, math.ceil(total / capacity)), MAX_PRICE_SPLIT)
+            cuts = _price_boundaries(part, prices, pieces)
+            if cuts:
+                bounds = [part.min_price, *cuts, part.max_price]
+                return 'price', [
+                    replace(part, min_price=lo, max_price=hi)
+                    for lo, hi in zip(bounds, bounds[1:])
+                ]
+
+            sizes = self.sizes.get(part.category or '', ())
+            if sizes:
+                return 'size', [replace(part, size=s) for s in sizes]
+        return '', []
+
+    async def run(
+            self,
+            query: str,
+            filters: Optional[SearchFilters] = None,
+            on_page: Optional[Callable[[Partition, int, List[Sale]], None]] = None
+    ) -> DeepCrawlResult:
+        """Crawl every partition of `query`; `on_page` gets each page's new listings"""
+        result = DeepCrawlResult(query)
+        url = await self.scraper.get_search_url(query)
+        if not url:
+            logger.error("Failed to get custom search URL for %s", query)
+            return result
+
+        root = Partition(
+            min_price=filters.min_price if filters else None,
+            max_price=(
+                filters.max_price + 0.01
+                if filters and filters.max_price is not None else None
+            )
+        )
+        seen: Set[int] = set()
+        work: asyncio.Queue = asyncio.Queue()
+        work.put_nowait((root, 1))
+        # Reported totals of partitions split by category or size, and of their children
+        split_totals: Dict[Partition, Tuple[int, List[Partition]]] = {}
+        totals: Dict[Partition, int] = {}
+
+        def deliver(part: Partition, page: int, raw_listings: List[Dict]) -> None:
+            fresh = []
+            for raw in raw_listings:
+                listing_id = raw.get('id')
+                if listing_id in seen:
+                    result.duplicates += 1
+                    continue
+                if listing_id is not None:
+                    seen.add(listing_id)
+                fresh.append(raw)
+            sales = normalize_listings(fresh, filters)
+            result.sales.extend(sales)
+            if on_page:
+                on_page(part, page, sales)
+
+        async def handle(part: Partition, page: int) -> None:
+            data = await self.scraper.get_goods(url, page, part.params())
+            result.requests += 1
+            if data is None:
+                logger.warning("Deep crawl of %s failed on %s page %d",
+                               query, part, page)
+                result.failed.append(part)
+                return
+            listings = data.get('listings', [])
+            deliver(part, page, listings)
+            if page > 1 or not listings:
+                return
+
+            result.partitions += 1
+            per_page = len(listings)
+            total = (data.get('metadata') or {}).get('total')
+            if total is None:
+                # No count reported: page out to the cap and hope it fits
+                total = per_page * self.page_cap if per_page else 0
+            totals[part] = total
+            capacity = per_page * self.page_cap
+
+            if total > capacity:
+                prices = [float(raw.get('price') or 0) for raw in listings]
+                dimension, children = self.split(part, prices, total, capacity)
+                if children:
+                    result.splits += 1
+                    logger.debug("Splitting %s (%d listings) by %s into %d",
+                                 part, total, dimension, len(children))
+                    if dimension in ('category', 'size'):
+                        split_totals[part] = (total, children)
+                    for child in children:
+                        work.put_nowait((child, 1))
+                    return
+                logger.warning(
+                    "Partition %s of %s has %d listings but cannot be split further",
+                    part, query, total
+                )
+                result.truncated.append(part)
+
+            last_page = min(math.ceil(total / per_page), self.page_cap)
+            for next_page in range(2, last_page + 1):
+                work.put_nowait((part, next_page))
+
+        async def worker() -> None:
+            while True:
+                part, page = await work.get()
+                try:
+                    await handle(part, page)
+                except Exception as e:
+                    logger.error("Deep crawl error on %s page %d: %s", part, page, e)
+                    result.failed.append(part)
+                finally:
+                    work.task_done()
+
+        workers = [asyncio.create_task(worker()) for _ in range(self.concurrency)]
+        try:
+            await work.join()
+        finally:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+        for total, children in split_totals.values():
+            covered = sum(totals.get(child, 0) for child in children)
+            result.uncovered += max(total - covered, 0)
+        logger.info(
+            "Deep crawl of %s: %d listings, %d requests, %d partitions (%d splits)",
+            query, len(result.sales), result.requests, result.partitions, result.splits
+        )
+        return result
+
+
+__all__ = ['CrawlPlanner', 'DeepCrawlResult', 'Partition']
\ No newline at end of file
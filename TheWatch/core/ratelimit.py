@@ -0,0 +1,76 @@
+# TheWatch/core/ratelimit.py
+import asyncio
+import multiprocessing
+import time
+from typing import Optional
+
+from .config import RATE_LIMIT_REQUESTS, RATE_LIMIT_WINDOW
+
+
+class RateLimiter:
+    """Token bucket allowing `max_requests` requests per `window` seconds"""
+
+    def __init__(
+            self,
+            max_requests: int = RATE_LIMIT_REQUESTS,
+            window: float = RATE_LIMIT_WINDOW
+    ):
+        self.max_requests = max_requests
+        self.window = window
+        self.rate = max_requests / window
+        self._tokens = float(max_requests)
+        self._updated = time.monotonic()
+
+    def _refill(self, tokens: float, updated: float, now: float) -> float:
+        return min(float(self.max_requests), tokens + (now - updated) * self.rate)
+
+    def _take(self) -> float:
+        """Take one token. Returns 0 on success, else seconds until one is available"""
+        now = time.monotonic()
+        self._tokens = self._refill(self._tokens, self._updated, now)
+        self._updated = now
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return 0.0
+        return (1 - self._tokens) / self.rate
+
+    async def acquire(self) -> None:
+        """Wait until the budget allows one more request"""
+        while True:
+            wait = self._take()
+            if wait <= 0:
+                return
+            await asyncio.sleep(wait)
+
+
+class SharedRateLimiter(RateLimiter):
+    """Token bucket in shared memory, so several worker processes draw on one budget.
+
+    Must be created in the parent and handed to workers as a `Process` argument.
+    """
+
+    def __init__(
+            self,
+            max_requests: int = RATE_LIMIT_REQUESTS,
+            window: float = RATE_LIMIT_WINDOW,
+            ctx: Optional[multiprocessing.context.BaseContext] = None
+    ):
+        super().__init__(max_requests, window)
+        ctx = ctx or multiprocessing.get_context()
+        # [tokens, last refill time]; CLOCK_MONOTONIC is system-wide, so it is
+        # comparable across processes
+        self._state = ctx.Array('d', [float(max_requests), time.monotonic()])
+
+    def _take(self) -> float:
+        with self._state.get_lock():
+            now = time.monotonic()
+            tokens = self._refill(self._state[0], self._state[1], now)
+            self._state[1] = now
+            if tokens >= 1:
+                self._state[0] = tokens - 1
+                return 0.0
+            self._state[0] = tokens
+            return (1 - tokens) / self.rate
+
+
+__all__ = ['RateLimiter', 'SharedRateLimiter']
\ No newline at end of file
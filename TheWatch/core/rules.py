@@ -0,0 +1,334 @@
+# TheWatch/core/rules.py
+import asyncio
+import logging
+import time
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Callable, Dict, Hashable, Iterable, List, Optional, Set, Tuple
+
+from ..utils.normalize import GROUP_CATEGORIES, UNKNOWN, category_group, size_code
+from .batch import load_queries
+from .config import ALERT_FLUSH_INTERVAL, ALERT_MAX_BATCH, ALERT_MAX_DELAY
+from .models import Sale, SearchFilters, condition_codes
+
+logger = logging.getLogger(__name__)
+
+INF = float('inf')
+
+
+@dataclass
+class AlertRule:
+    """A user's standing search, e.g. Rick Owens, size 48, under $400, gently used+"""
+    id: str
+    filters: SearchFilters
+    owner: Optional[str] = None
+
+
+class PriceIntervals:
+    """Closed price intervals, answering which ones contain a price in O(log n + k).
+
+    Kept as a centered interval tree that is rebuilt on the first lookup
+    after the set changes; small sets are scanned directly.
+    """
+
+    LINEAR_LIMIT = 32
+
+    def __init__(self):
+        self._intervals: Dict[Hashable, Tuple[float, float]] = {}
+        self._root = None
+        self._stale = False
+
+    def add(self, key: Hashable, low: float, high: float) -> None:
+        self._intervals[key] = (low, high)
+        self._stale = True
+
+    def discard(self, key: Hashable) -> None:
+        if self._intervals.pop(key, None) is not None:
+            self._stale = True
+
+    def __len__(self) -> int:
+        return len(self._intervals)
+
+    @staticmethod
+    def _build(items: List[Tuple[float, float, Hashable]]):
+        if not items:
+            return None
+        endpoints = sorted(e for low, high, _ in items for e in (low, high))
+        center = endpoints[len(endpoints) // 2]
+        left = [item for item in items if item[1] < center]
+        right = [item for item in items if item[0] > center]
+        here = [item for item in items if item[0] <= center <= item[1]]
+        by_low = sorted(here, key=lambda item: item[0])
+        by_high = sorted(here, key=lambda item: item[1])
+        return (
+            center,
+            [item[0] for item in by_low], [item[2] for item in by_low],
+            [item[1] for item in by_high], [item[2] for item in by_high],
+            PriceIntervals._build(left), PriceIntervals._build(right),
+        )
+
+    def stab(self, price: float) -> List[Hashable]:
+        """Keys of the intervals containing `price`"""
+        if len(self._intervals) <= self.LINEAR_LIMIT:
+            return [
+                key for key, (low, high) in self._intervals.items()
+                if low <= price <= high
+            ]
+        if self._stale:
+            self._root = self._build([
+                (low, high, key) for key, (low, high) in self._intervals.items()
+            ])
+            self._stale = False
+        found: List[Hashable] = []
+        node = self._root
+        while node is not None:
+            center, lows, by_low, highs, by_high, left, right = node
+            # Every interval stored at a node contains its center
+            if price < center:
+                found.extend(by_low[:bisect_right(lows, price)])
+                node = left
+            elif price > center:
+                found.extend(by_high[bisect_left(highs, price):])
+                node = right
+            else:
+                found.extend(by_low)
+                break
+        return found
+
+
+# (designer substring or None, (size system, size code) or None, condition code or None)
+BucketKey = Tuple[Optional[str], Optional[Tuple[Optional[str], int]], Optional[int]]
+
+
+@dataclass
+class _CompiledRule:
+    rule: AlertRule
+    buckets: List[BucketKey]
+    residual: bool  # Location or category filters still need checking after the index
+
+
+def _compile(rule: AlertRule) -> _CompiledRule:
+    filters = rule.filters
+    designers: List[Optional[str]] = [None]
+    if filters.designers:
+        patterns = {d.lower() for d in filters.designers}
+        # An empty pattern is a substring of every designer
+        designers = [None] if '' in patterns else sorted(patterns)
+
+    sizes: List[Optional[Tuple[Optional[str], int]]] = [None]
+    if filters.sizes:
+        sizes = list({
+            (group, code)
+            for group, category in GROUP_CATEGORIES.items()
+            for code in (size_code(s, category) for s in filters.sizes)
+            if code != UNKNOWN
+        })
+
+    conditions: List[Optional[int]] = [None]
+    if filters.conditions:
+        conditions = sorted(condition_codes(tuple(filters.conditions)))
+
+    low = filters.min_price if filters.min_price is not None else -INF
+    high = filters.max_price if filters.max_price is not None else INF
+    # A rule left with no sizes, conditions or prices it could match is kept but never
+    # indexed
+    buckets = [] if low > high else [
+        (d, s, c) for d in designers for s in sizes for c in conditions
+    ]
+    return _CompiledRule(rule, buckets, bool(filters.locations or filters.categories))
+
+
+class RuleIndex:
+    """Matches sales against many alert rules without visiting every rule.
+
+    Each rule is filed under hash partitions keyed on its designer patterns,
+    its sizes (per size system) and its condition codes, with unset fields
+    filed under a wildcard, and every partition keeps its rules' price
+    ranges in a `PriceIntervals`. A sale probes only the partitions it could
+    fall in: the substrings of its designer with the length of some indexed
+    pattern, its size code and its condition code, each alongside the
+    wildcard, so a match costs a few dozen dictionary lookups plus a stab
+    per partition rather than one check per rule. Rules with location or
+    category filters are confirmed with `SearchFilters.matches`.
+    """
+
+    def __init__(self, rules: Iterable[AlertRule] = ()):
+        self._rules: Dict[str, _CompiledRule] = {}
+        self._buckets: Dict[BucketKey, PriceIntervals] = {}
+        # Indexed pattern -> buckets using it
+        self._designers: Dict[str, int] = defaultdict(int)
+        self._pattern_lengths: Dict[int, int] = defaultdict(int)
+        for rule in rules:
+            self.add(rule)
+
+    def __len__(self) -> int:
+        return len(self._rules)
+
+    def __contains__(self, rule_id: str) -> bool:
+        return rule_id in self._rules
+
+    def get(self, rule_id: str) -> Optional[AlertRule]:
+        compiled = self._rules.get(rule_id)
+        return compiled.rule if compiled else None
+
+    def add(self, rule: AlertRule) -> None:
+        """Index `rule`, replacing any rule with the same id"""
+        self.remove(rule.id)
+        compiled = self._rules[rule.id] = _compile(rule)
+        low = rule.filters.min_price if rule.filters.min_price is not None else -INF
+        high = rule.filters.max_price if rule.filters.max_price is not None else INF
+        for key in compiled.buckets:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = PriceIntervals()
+            bucket.add(rule.id, low, high)
+            designer = key[0]
+            if designer is not None:
+                if self._designers[designer] == 0:
+                    self._pattern_lengths[len(designer)] += 1
+                self._designers[designer] += 1
+
+    def remove(self, rule_id: str) -> bool:
+        compiled = self._rules.pop(rule_id, None)
+        if compiled is None:
+            return False
+        for key in compiled.buckets:
+            bucket = self._buckets[key]
+            bucket.discard(rule_id)
+            if not len(bucket):
+                del self._buckets[key]
+            designer = key[0]
+            if designer is not None:
+                self._designers[designer] -= 1
+                if self._designers[designer] == 0:
+                    del self._designers[designer]
+                    self._pattern_lengths[len(designer)] -= 1
+                    if self._pattern_lengths[len(designer)] == 0:
+                        del self._pattern_lengths[len(designer)]
+        return True
+
+    def _probe_keys(self, sale: Sale) -> List[BucketKey]:
+        name = (sale.designer or '').lower()
+        designers: Set[Optional[str]] = {None}
+        for length in self._pattern_lengths:
+            for start in range(len(name) - length + 1):
+                piece = name[start:start + length]
+                if piece in self._designers:
+                    designers.add(piece)
+        sizes: List[Optional[Tuple[Optional[str], int]]] = [None]
+        code = sale.size_code
+        if code != UNKNOWN:
+            sizes.append((category_group(sale.category), code))
+        conditions: List[Optional[int]] = [None]
+        if sale.condition_code != UNKNOWN:
+            conditions.append(sale.condition_code)
+        return [(d, s, c) for d in designers for s in sizes for c in conditions]
+
+    def match(self, sale: Sale) -> List[AlertRule]:
+        """Every rule whose filters match `sale`"""
+        seen: Set[str] = set()
+        matched = []
+        for key in self._probe_keys(sale):
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                continue
+            for rule_id in bucket.stab(sale.price):
+                # A rule with several designer patterns can turn up in more than one
+                # partition
+                if rule_id in seen:
+                    continue
+                seen.add(rule_id)
+                compiled = self._rules[rule_id]
+                if not compiled.residual or compiled.rule.filters.matches(sale):
+                    matched.append(compiled.rule)
+        return matched
+
+    def match_all(self, sales: Iterable[Sale]) -> Dict[str, List[Sale]]:
+        """Matching sales per rule id, in the order the sales came"""
+        matches: Dict[str, List[Sale]] = defaultdict(list)
+        for sale in sales:
+            for rule in self.match(sale):
+                matches[rule.id].append(sale)
+        return dict(matches)
+
+
+class AlertBatcher:
+    """Collects each rule's matches and delivers them as one notification per rule.
+
+    A rule's pending sales go out together once there are `max_batch` of
+    them or the oldest has waited `max_delay` seconds; a listing matched
+    twice is only sent once per batch.
+    """
+
+    def __init__(
+            self,
+            index: RuleIndex,
+            notify: Callable[[AlertRule, List[Sale]], None],
+            max_batch: int = ALERT_MAX_BATCH,
+            max_delay: float = ALERT_MAX_DELAY,
+            clock: Callable[[], float] = time.monotonic
+    ):
+        self.index = index
+        self.notify = notify
+        self.max_batch = max(1, max_batch)
+        self.max_delay = max_delay
+        self.clock = clock
+        self._pending: Dict[str, Dict[object, Sale]] = {}
+        self._since: Dict[str, float] = {}
+
+    @property
+    def pending(self) -> int:
+        return sum(len(sales) for sales in self._pending.values())
+
+    def add(self, sales: Iterable[Sale]) -> int:
+        """Match `sales` and send the batches now due; returns notifications sent"""
+        now = self.clock()
+        for rule_id, matched in self.index.match_all(sales).items():
+            pending = self._pending.setdefault(rule_id, {})
+            self._since.setdefault(rule_id, now)
+            for sale in matched:
+                pending.setdefault(sale.id if sale.id is not None else sale.url, sale)
+        return self.flush()
+
+    def flush(self, force: bool = False) -> int:
+        """Send due batches, or all of them with `force`; returns notifications sent"""
+        now = self.clock()
+        sent = 0
+        for rule_id in list(self._pending):
+            pending = self._pending[rule_id]
+            due = (force or len(pending) >= self.max_batch
+                   or now - self._since[rule_id] >= self.max_delay)
+            if not due:
+                continue
+            del self._pending[rule_id]
+            del self._since[rule_id]
+            rule = self.index.get(rule_id)
+            if rule is None:
+                continue  # Rule was removed while its matches waited
+            sales = list(pending.values())
+            for start in range(0, len(sales), self.max_batch):
+                try:
+                    self.notify(rule, sales[start:start + self.max_batch])
+                    sent += 1
+                except Exception as e:
+                    logger.error("Alert for rule %s failed: %s", rule_id, e)
+        return sent
+
+    async def flush_every(self, interval: float = ALERT_FLUSH_INTERVAL) -> None:
+        """Send batches as they come due, checking every `interval` seconds until
+        cancelled
+        """
+        while True:
+            await asyncio.sleep(interval)
+            self.flush()
+
+
+def load_rules(path: str) -> List[AlertRule]:
+    """Read alert rules from a query file, one ``rule id | key=value ...`` per line"""
+    return [
+        AlertRule(q.query, q.filters or SearchFilters()) for q in load_queries(path)
+    ]
+
+
+__all__ = ['AlertBatcher', 'AlertRule', 'PriceIntervals', 'RuleIndex', 'load_rules']
\ No newline at end of file
@@ -0,0 +1,258 @@
+# TheWatch/core/scheduler.py
+import asyncio
+import heapq
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, List, Optional, Sequence, Union
+
+from .config import (
+    POLL_MAX_INTERVAL, POLL_MIN_INTERVAL, POLL_RATE_HALFLIFE,
+    RATE_LIMIT_REQUESTS, RATE_LIMIT_WINDOW
+)
+from .models import Sale, WatchQuery
+from .overlap import FetchGroup, QueryPlan, plan_queries
+
+logger = logging.getLogger(__name__)
+
+# Every search costs two requests (search page, then goods)
+REQUESTS_PER_SEARCH = 2
+DEFAULT_BUDGET = RATE_LIMIT_REQUESTS // REQUESTS_PER_SEARCH
+
+
+def allocate(
+        rates: Sequence[float],
+        low: Sequence[float],
+        high: Sequence[float],
+        budget: float,
+) -> List[float]:
+    """Poll frequencies proportional to `rates`, clamped to [low, high], summing to at
+    most `budget`.
+
+    Each query's share of the budget follows its share of the total rate;
+    budget freed by clamping to `high` is left unspent rather than handed to
+    quieter queries. When the lower bounds push the total over the budget,
+    the proportionality constant is bisected down until it fits, and when
+    even the lower bounds exceed it they are scaled down.
+    """
+    floor = sum(low)
+    if floor >= budget:
+        return [f * budget / floor for f in low] if floor else list(low)
+    total = sum(rates)
+    if total <= 0:
+        return list(low)
+
+    def spend(scale: float) -> List[float]:
+        return [min(max(scale * r, lo), hi) for r, lo, hi in zip(rates, low, high)]
+
+    lo_scale, hi_scale = 0.0, budget / total
+    if sum(spend(hi_scale)) <= budget:
+        return spend(hi_scale)
+    for _ in range(60):
+        mid = (lo_scale + hi_scale) / 2
+        if sum(spend(mid)) > budget:
+            hi_scale = mid
+        else:
+            lo_scale = mid
+    return spend(lo_scale)
+
+
+@dataclass
+class QueryStats:
+    """Polling history of one watched query"""
+    query: str
+    rate: float  # EWMA of new listings per minute
+    polls: int = 0
+    new_listings: int = 0
+    last_polled: Optional[float] = None
+    _seen: Dict[object, None] = field(default_factory=dict, repr=False)
+
+
+@dataclass
+class _GroupState:
+    group: FetchGroup
+    min_interval: float
+    max_interval: float
+    interval: float = 0.0
+    last_polled: Optional[float] = None
+
+
+@dataclass
+class PollReport:
+    """Request accounting of an adaptive polling run"""
+    searches: int = 0
+    requests: int = 0  # HTTP requests, REQUESTS_PER_SEARCH per search
+    new_listings: int = 0
+
+    @property
+    def new_per_request(self) -> float:
+        return self.new_listings / self.requests if self.requests else 0.0
+
+
+class AdaptiveScheduler:
+    """Polls watched queries as often as their observed new-listing rates warrant.
+
+    Each query keeps an exponentially weighted average of new listings per
+    minute, weighted by elapsed time with half-life `halflife`. Poll
+    frequencies are allocated in proportion to expected yield within each
+    query's [min_interval, max_interval] bounds, so that together they spend
+    at most `budget` upstream searches per `window` seconds; a priority
+    queue ordered by due time picks the next poll, and polls are never
+    spaced closer than the budget allows.
+
+    Overlapping queries are polled as one fetch group (see core.overlap);
+    a group's rate is its broadest member's. The first poll of a query only
+    records what is already listed.
+    """
+
+    def __init__(
+            self,
+            queries: Sequence[Union[str, WatchQuery]],
+            budget: float = DEFAULT_BUDGET,
+            window: float = RATE_LIMIT_WINDOW,
+            min_interval: float = POLL_MIN_INTERVAL,
+            max_interval: float = POLL_MAX_INTERVAL,
+            halflife: float = POLL_RATE_HALFLIFE,
+            initial_rate: float = 1.0,
+            seen_limit: int = 5000,
+            clock: Callable[[], float] = time.monotonic,
+            sleep: Callable[[float], Awaitable[None]] = asyncio.sleep
+    ):
+        self.plan = plan_queries(queries)
+        self.budget = budget / window  # searches per second
+        self.halflife = halflife
+        self.seen_limit = seen_limit
+        self.clock = clock
+        self.sleep = sleep
+        self.report = PollReport()
+        self.stats: Dict[str, QueryStats] = {}
+        self._groups: List[_GroupState] = []
+        for group in self.plan.groups:
+            low = min(
+                m.min_interval if m.min_interval is not None else min_interval
+                for m in group.members
+            )
+            high = min(
+                m.max_interval if m.max_interval is not None else max_interval
+                for m in group.members
+            )
+            self._groups.append(_GroupState(group, low, max(low, high)))
+            for member in group.members:
+                self.stats.setdefault(
+                    member.query, QueryStats(member.query, initial_rate)
+                )
+        self._next_slot = 0.0
+        self._queue: List = []
+        self._reschedule()
+
+    def expected_rate(self, state: _GroupState) -> float:
+        """New listings per minute expected from polling a group"""
+        return max(self.stats[m.query].rate for m in state.group.members)
+
+    def intervals(self) -> Dict[str, float]:
+        """Current poll interval of each fetch group, by its search query"""
+        return {state.group.query: state.interval for state in self._groups}
+
+    def _reschedule(self) -> None:
+        frequencies = allocate(
+            [self.expected_rate(state) for state in self._groups],
+            [1 / state.max_interval for state in self._groups],
+            [1 / state.min_interval for state in self._groups],
+            self.budget
+        )
+        self._queue = []
+        now = self.clock()
+        for i, (state, frequency) in enumerate(zip(self._groups, frequencies)):
+            state.interval = 1 / frequency if frequency > 0 else float('inf')
+            due = (
+                now if state.last_polled is None
+                else state.last_polled + state.interval
+            )
+            # Equal due times go to the higher expected yield first
+            self._queue.append((due, -self.expected_rate(state), i))
+        heapq.heapify(self._queue)
+
+    def _record(self, stats: QueryStats, sales: List[Sale], now: float) -> List[Sale]:
+        fresh = []
+        for sale in sales:
+            key = sale.id if sale.id is not None else sale.url
+            if key not in stats._seen:
+                stats._seen[key] = None
+                fresh.append(sale)
+        while len(stats._seen) > self.seen_limit:
+            del stats._seen[next(iter(stats._seen))]
+
+        if stats.last_polled is None:
+            fresh = []  # Baseline: everything is already listed
+        else:
+            elapsed = max(now - stats.last_polled, 1e-9)
+            weight = 1 - 0.5 ** (elapsed / self.halflife)
+            stats.rate += weight * (len(fresh) / (elapsed / 60) - stats.rate)
+        stats.polls += 1
+        stats.new_listings += len(fresh)
+        stats.last_polled = now
+        return fresh
+
+    async def poll_next(self, scraper) -> Dict[str, List[Sale]]:
+        """Wait for the next due fetch group, poll it, and return each member's new
+        listings
+        """
+        due, _, index = self._queue[0]
+        wait = max(due, self._next_slot) - self.clock()
+        if wait > 0:
+            await self.sleep(wait)
+        state = self._groups[index]
+        now = self.clock()
+
+        plan = QueryPlan([state.group], self.plan.page_size)
+        outcomes = await plan.execute(scraper)
+        # A full group page also searched its narrower members, which spends more of
+        # the budget
+        self._next_slot = now + plan.searches / self.budget
+        self.report.searches += plan.searches
+        self.report.requests += plan.searches * REQUESTS_PER_SEARCH
+        state.last_polled = now
+        new: Dict[str, List[Sale]] = {}
+        found = set()
+        for query, outcome in outcomes.items():
+            if isinstance(outcome, BaseException):
+                logger.warning("Poll of %s failed: %s", query, outcome)
+                continue
+            new[query] = self._record(self.stats[query], outcome, now)
+            found.update(
+                sale.id if sale.id is not None else sale.url for sale in new[query]
+            )
+        self.report.new_listings += len(found)
+        self._reschedule()
+        return new
+
+    async def run(
+            self,
+            scraper,
+            polls: Optional[int] = None,
+            duration: Optional[float] = None,
+            on_new: Optional[Callable[[str, List[Sale]], None]] = None
+    ) -> PollReport:
+        """Poll until `polls` searches were made or `duration` seconds have passed"""
+        deadline = None if duration is None else self.clock() + duration
+        made = 0
+        while self._queue and (polls is None or made < polls):
+            next_due = max(self._queue[0][0], self._next_slot)
+            if deadline is not None and next_due > deadline:
+                break
+            for query, sales in (await self.poll_next(scraper)).items():
+                if sales and on_new:
+                    on_new(query, sales)
+            made += 1
+        logger.info(
+            "Adaptive polling: %d new listings from %d searches, %d requests "
+            "(%.2f per request)",
+            self.report.new_listings, self.report.searches, self.report.requests,
+            self.report.new_per_request
+        )
+        return self.report
+
+
+__all__ = [
+    'AdaptiveScheduler', 'PollReport', 'QueryStats', 'REQUESTS_PER_SEARCH', 'allocate'
+]
\ No newline at end of file
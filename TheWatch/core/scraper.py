@@ -1,4 +1,3 @@
-import aiohttp
 import asyncio
 from typing import List, Dict, Optional, Any, Tuple
 import logging
@@ -6,18 +5,85 @@ import json
 import time
 from datetime import datetime
 from collections import deque
-from bs4 import BeautifulSoup
 import re
 import urllib.parse
+from .config import BASE_URL, ENDPOINTS
 from .models import Sale, SearchFilters
+from .ratelimit import RateLimiter
+from .session import SESSION_REJECTED, SessionState, UpstreamSession
+from ..utils.metrics import endpoint_label, metrics
+from ..utils.normalize import canonical_condition
 
 logger = logging.getLogger(__name__)
 
 
+def normalize_listing(data: Dict) -> Optional[Sale]:
+    """Turn one raw goods listing into a Sale; None when it cannot be read"""
+    try:
+        original_price = float(data.get('original_price', 0) or data.get('price', 0))
+        price = float(data.get('price', 0))
+
+        discount = original_price - price if original_price > price else None
+        discount_percentage = (discount / original_price * 100) if discount else None
+
+        return Sale(
+            id=data.get('id'),
+            title=data.get('title', '').strip(),
+            price=price,
+            original_price=original_price,
+            designer=' × '.join(data.get('designer_names', ['Unknown'])),
+            size=data.get('size', 'Unknown'),
+            condition=canonical_condition(data.get('condition') or 'Unknown'),
+            location=data.get('location', 'Unknown'),
+            seller=data.get('seller', {}).get('username', 'Unknown'),
+            url=f"https://www.grailed.com/listings/{data.get('id')}",
+            photos=[p.get('url') for p in data.get('photos', []) if p.get('url')],
+            created_at=datetime.fromisoformat(
+                data.get('created_at', datetime.now().isoformat())
+            ),
+            category=data.get('category', 'Unknown'),
+            description=data.get('description', '').strip(),
+            discount=discount,
+            discount_percentage=discount_percentage
+        )
+    except Exception as e:
+        logger.error("Error processing listing: %s", e)
+        return None
+
+
+def normalize_listings(
+        raw_listings: List[Dict], filters: Optional[SearchFilters] = None
+) -> List[Sale]:
+    """Normalize a page of raw listings and apply `filters`"""
+    listings = []
+    with metrics.timer('thewatch_normalize_seconds', source='scraper'):
+        for raw_listing in raw_listings:
+            listing = normalize_listing(raw_listing)
+            if listing:
+                listings.append(listing)
+    metrics.inc('thewatch_listings_processed_total', len(listings), source='scraper')
+    metrics.inc('thewatch_listings_failed_total',
+                len(raw_listings) - len(listings), source='scraper')
+
+    if filters:
+        listings = [listing for listing in listings if filters.matches(listing)]
+
+    return listings
+
+
 class GrailedScraper:
-    def __init__(self):
-        self.base_url = "https://www.grailed.com"
-        self.session = None
+    def __init__(
+            self,
+            rate_limiter: Optional[RateLimiter] = None,
+            base_url: str = BASE_URL,
+            archive=None,
+            session_state: Optional[SessionState] = None
+    ):
+        self.base_url = base_url
+        # Optional ResponseArchive receiving every raw goods response
+        self.archive = archive
+        self._url_queries: Dict[str, str] = {}
+        self.rate_limiter = rate_limiter
         self.last_request_time = 0
         self.min_request_interval = 1.0
         self.request_history = deque(maxlen=10)
@@ -32,46 +98,72 @@ class GrailedScraper:
             'Referer': 'https://www.grailed.com/',
             'X-Requested-With': 'XMLHttpRequest'
         }
+        self.upstream = UpstreamSession(
+            base_url, self.headers, session_state,
+            warm_up_accept=(
+                'text/html,application/xhtml+xml,application/xml;q=0.9,'
+                'image/avif,image/webp,*/*;q=0.8'
+            )
+        )
 
-    async def _init_session(self):
-        if not self.session:
-            self.session = aiohttp.ClientSession(headers=self.headers)
-
-            # Get initial page to set up cookies
-            try:
-                headers = {
-                    **self.headers,
-                    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8'
-                }
-                async with self.session.get(self.base_url, headers=headers) as response:
-                    await response.text()
-            except Exception as e:
-                logger.error(f"Error initializing session: {e}")
+    @property
+    def session(self):
+        return self.upstream.session
 
     async def _make_request(self, url: str, method: str = "GET", **kwargs) -> Optional[Any]:
-        if not self.session:
-            await self._init_session()
+        session = await self.upstream.open()
 
+        if self.rate_limiter:
+            await self.rate_limiter.acquire()
+
+        endpoint = endpoint_label(url) if metrics.enabled else ''
+        started = time.perf_counter()
+        cookies = self.upstream.restored_cookies
         try:
-            async with getattr(self.session, method.lower())(url, **kwargs) as response:
+            async with getattr(session, method.lower())(url, **kwargs) as response:
+                metrics.inc('thewatch_http_responses_total',
+                            endpoint=endpoint, status=response.status)
+                if response.status in SESSION_REJECTED and cookies is not None:
+                    # Sent with saved cookies the upstream no longer accepts; retry
+                    # once with fresh ones
+                    response.release()
+                    await self.upstream.replace_rejected(cookies)
+                    return await self._make_request(url, method, **kwargs)
                 if response.status == 429:
+                    metrics.inc('thewatch_rate_limited_total', endpoint=endpoint)
                     retry_after = int(response.headers.get('Retry-After', 60))
-                    logger.warning(f"Rate limited. Waiting {retry_after} seconds")
+                    logger.warning("Rate limited. Waiting %s seconds", retry_after)
                     await asyncio.sleep(retry_after)
                     return None
 
                 response.raise_for_status()
 
+                if metrics.enabled:
+                    metrics.inc('thewatch_http_response_bytes_total',
+                                len(await response.read()), endpoint=endpoint)
+
                 content_type = response.headers.get('Content-Type', '')
                 if 'application/json' in content_type:
-                    return await response.json()
-                return await response.text()
+                    data = await response.json()
+                else:
+                    data = await response.text()
+                metrics.observe('thewatch_http_request_seconds',
+                                time.perf_counter() - started, endpoint=endpoint)
+                return data
 
         except Exception as e:
-            logger.error(f"Request error: {str(e)}")
+            metrics.inc('thewatch_http_errors_total', endpoint=endpoint)
+            logger.error("Request error: %s", e)
             return None
 
-    async def _get_custom_search_url(self, query: str) -> Optional[str]:
+    async def get_search_url(self, query: str) -> Optional[str]:
+        """Get the custom search URL, remembering its query for the archive"""
+        url = await self._resolve_search_url(query)
+        if url:
+            self._url_queries[url] = query
+        return url
+
+    async def _resolve_search_url(self, query: str) -> Optional[str]:
         """Get the custom search URL by observing network requests"""
         try:
             # Make initial search request
@@ -82,7 +174,9 @@ class GrailedScraper:
                 return None
 
             # Look for redirect URL in the HTML
-            soup = BeautifulSoup(html, 'html.parser')
+            from bs4 import BeautifulSoup
+            with metrics.timer('thewatch_parse_seconds', stage='search_html'):
+                soup = BeautifulSoup(html, 'html.parser')
 
             # Try finding redirect meta tag
             meta_refresh = soup.find('meta', attrs={'http-equiv': 'refresh'})
@@ -110,65 +204,64 @@ class GrailedScraper:
                     except json.JSONDecodeError:
                         continue
 
-            logger.warning(f"Could not find custom URL, using original: {search_url}")
+            logger.warning("Could not find custom URL, using original: %s", search_url)
             return search_url
 
         except Exception as e:
-            logger.error(f"Error getting custom search URL: {str(e)}")
+            logger.error("Error getting custom search URL: %s", e)
             return None
 
+    async def get_goods(
+            self, url: str, page: int = 1, extra_params: Optional[Dict] = None
+    ) -> Optional[Dict]:
+        """One raw goods response (listings and metadata); None on a failed request"""
+        # Extract path part for API request
+        path = urllib.parse.urlparse(url).path.strip('/')
+        api_url = f"{self.base_url}/api/{path}/goods"
+
+        params = {
+            "page": page,
+            "per_page": 40,
+            "sort": "default",
+            **(extra_params or {})
+        }
+
+        data = await self._make_request(api_url, params=params)
+        if not isinstance(data, dict):
+            return None
+        if self.archive is not None:
+            try:
+                self.archive.append(
+                    self._url_queries.get(url, path), page, data, extra_params
+                )
+            except Exception as e:
+                logger.error("Error archiving goods page: %s", e)
+        return data
+
+    async def get_listings_page(self, url: str, page: int = 1) -> Optional[List[Dict]]:
+        """One page of raw listings; None when the request failed, [] past the end"""
+        data = await self.get_goods(url, page)
+        if data is None:
+            return None
+
+        return data.get('listings', [])
+
     async def _get_listings_data(self, url: str, page: int = 1) -> List[Dict]:
         """Get listings data from API"""
         try:
-            # Extract path part for API request
-            path = url.split('www.grailed.com/')[-1]
-            api_url = f"{self.base_url}/api/{path}/goods"
-
-            params = {
-                "page": page,
-                "per_page": 40,
-                "sort": "default"
-            }
-
-            data = await self._make_request(api_url, params=params)
-            if not data:
-                return []
-
-            return data.get('listings', [])
+            return await self.get_listings_page(url, page) or []
 
         except Exception as e:
-            logger.error(f"Error getting listings data: {str(e)}")
+            logger.error("Error getting listings data: %s", e)
             return []
 
-    def _process_listing(self, data: Dict) -> Optional[Sale]:
-        try:
-            original_price = float(data.get('original_price', 0) or data.get('price', 0))
-            price = float(data.get('price', 0))
-
-            discount = original_price - price if original_price > price else None
-            discount_percentage = (discount / original_price * 100) if discount else None
-
-            return Sale(
-                id=data.get('id'),
-                title=data.get('title', '').strip(),
-                price=price,
-                original_price=original_price,
-                designer=' × '.join(data.get('designer_names', ['Unknown'])),
-                size=data.get('size', 'Unknown'),
-                condition=data.get('condition', 'Unknown'),
-                location=data.get('location', 'Unknown'),
-                seller=data.get('seller', {}).get('username', 'Unknown'),
-                url=f"https://www.grailed.com/listings/{data.get('id')}",
-                photos=[p.get('url') for p in data.get('photos', []) if p.get('url')],
-                created_at=datetime.fromisoformat(data.get('created_at', datetime.now().isoformat())),
-                category=data.get('category', 'Unknown'),
-                description=data.get('description', '').strip(),
-                discount=discount,
-                discount_percentage=discount_percentage
-            )
-        except Exception as e:
-            logger.error(f"Error processing listing: {str(e)}")
+    async def get_listing_details(self, listing_id: int) -> Optional[Dict]:
+        """Get the full detail payload for one listing"""
+        url = f"{self.base_url}/api{ENDPOINTS['listing_details'].format(id=listing_id)}"
+        data = await self._make_request(url)
+        if not isinstance(data, dict):
             return None
+        return data.get('data', data)
 
     async def search_listings(
             self,
@@ -178,32 +271,23 @@ class GrailedScraper:
     ) -> List[Sale]:
         try:
             # First get the custom search URL
-            logger.info(f"Getting custom search URL for query: {query}")
-            custom_url = await self._get_custom_search_url(query)
+            logger.debug("Getting custom search URL for query: %s", query)
+            custom_url = await self.get_search_url(query)
 
             if not custom_url:
                 logger.error("Failed to get custom search URL")
                 return []
 
-            logger.info(f"Using custom URL: {custom_url}")
+            logger.debug("Using custom URL: %s", custom_url)
 
             # Get listings using the custom URL
             raw_listings = await self._get_listings_data(custom_url, page)
 
-            # Process listings
-            listings = []
-            for raw_listing in raw_listings:
-                listing = self._process_listing(raw_listing)
-                if listing:
-                    listings.append(listing)
-
-            return listings
+            return normalize_listings(raw_listings, filters)
 
         except Exception as e:
-            logger.error(f"Search error: {str(e)}")
+            logger.error("Search error: %s", e)
             return []
 
     async def close(self):
-        if self.session:
-            await self.session.close()
-            self.session = None
\ No newline at end of file
+        await self.upstream.close()
\ No newline at end of file
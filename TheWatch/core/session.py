@@ -0,0 +1,235 @@
+# TheWatch/core/session.py
+import asyncio
+import ipaddress
+import json
+import logging
+import os
+import time
+from email.utils import parsedate_to_datetime
+from http.cookies import SimpleCookie
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import aiohttp
+from yarl import URL
+
+from ..utils.metrics import metrics
+from .config import SESSION_TTL
+
+logger = logging.getLogger(__name__)
+
+# Statuses meaning the upstream no longer accepts the session's cookies
+SESSION_REJECTED = (401, 403)
+
+
+def cookie_jar(base_url: str) -> aiohttp.CookieJar:
+    """Cookie jar for a session against `base_url`; IP hosts (local stand-ins) need an
+    unsafe jar
+    """
+    host = URL(base_url).host or ''
+    try:
+        ipaddress.ip_address(host)
+        return aiohttp.CookieJar(unsafe=True)
+    except ValueError:
+        return aiohttp.CookieJar()
+
+
+def _cookie_expiry(morsel, set_at: float) -> Optional[float]:
+    if morsel['max-age']:
+        try:
+            return set_at + int(morsel['max-age'])
+        except ValueError:
+            pass
+    if morsel['expires']:
+        try:
+            return parsedate_to_datetime(morsel['expires']).timestamp()
+        except (TypeError, ValueError):
+            pass
+    return None
+
+
+class SessionState:
+    """Cookie jar and warm-up time of an upstream session, saved so later runs skip the
+    homepage visit.
+
+    A saved state belongs to the base URL it was warmed against and lapses
+    `ttl` seconds after the warm-up; cookies past their own expiry are
+    dropped on restore. The file is replaced atomically, so processes
+    sharing it read either the previous state or the new one.
+    """
+
+    def __init__(self, path: str = "data/cache/session.json", ttl: float = SESSION_TTL):
+        self.path = Path(path)
+        self.ttl = ttl
+
+    def _read(self) -> Optional[Dict]:
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning("Ignoring unreadable session state %s: %s", self.path, e)
+            return None
+
+    def restore(self, jar: aiohttp.CookieJar, base_url: str) -> bool:
+        """Load saved cookies into `jar`; False without usable state for `base_url`"""
+        if self.ttl <= 0:
+            return False
+        state = self._read()
+        now = time.time()
+        if (not state or state.get('base_url') != base_url
+                or state.get('expires_at', 0) <= now):
+            return False
+
+        cookies = SimpleCookie()
+        for saved in state.get('cookies', []):
+            expires_at = saved.get('expires_at')
+            if expires_at is not None and expires_at <= now:
+                continue
+            name = saved['name']
+            cookies[name] = saved['value']
+            cookies[name]['path'] = saved.get('path') or '/'
+            if saved.get('domain'):
+                cookies[name]['domain'] = saved['domain']
+            if expires_at is not None:
+                cookies[name]['max-age'] = str(int(expires_at - now))
+        if state.get('cookies') and not cookies:
+            return False  # Every cookie has lapsed
+        jar.update_cookies(cookies, URL(base_url))
+        logger.debug("Restored %d session cookies warmed %.0fs ago",
+                     len(cookies), now - state.get('warmed_at', now))
+        return True
+
+    def save(
+            self,
+            jar: aiohttp.CookieJar,
+            base_url: str,
+            warmed_at: Optional[float] = None,
+    ) -> None:
+        if self.ttl <= 0:
+            return
+        warmed_at = time.time() if warmed_at is None else warmed_at
+        cookies: List[Dict] = [
+            {
+                'name': morsel.key,
+                'value': morsel.value,
+                'domain': morsel['domain'],
+                'path': morsel['path'],
+                'expires_at': _cookie_expiry(morsel, warmed_at),
+            }
+            for morsel in jar
+        ]
+        state = {
+            'base_url': base_url,
+            'warmed_at': warmed_at,
+            'expires_at': warmed_at + self.ttl,
+            'cookies': cookies,
+        }
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_name(f".{self.path.name}.{os.getpid()}.tmp")
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(state, f)
+            os.replace(tmp, self.path)
+        except OSError as e:
+            logger.warning("Could not save session state to %s: %s", self.path, e)
+
+    def clear(self) -> None:
+        try:
+            self.path.unlink()
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning("Could not remove session state %s: %s", self.path, e)
+
+
+class UpstreamSession:
+    """The aiohttp session a client shares for every request to one upstream.
+
+    Opening it restores saved cookies or visits the homepage for fresh ones.
+    When the upstream rejects restored cookies, `replace_rejected` drops them
+    and warms up again; the lock makes concurrent requests that were all
+    rejected share that one warm-up, after which each of them retries.
+    """
+
+    def __init__(
+            self,
+            base_url: str,
+            headers: Dict[str, str],
+            session_state: Optional[SessionState] = None,
+            warm_up_accept: str = 'text/html,application/xhtml+xml'
+    ):
+        self.base_url = base_url
+        self.headers = headers
+        # Optional saved cookies that let a new session skip the homepage warm-up
+        self.session_state = session_state
+        self.warm_up_accept = warm_up_accept
+        self.session: Optional[aiohttp.ClientSession] = None
+        self._lock = asyncio.Lock()
+        self._restored = False
+        self._generation = 0  # Bumped whenever rejected cookies are replaced
+
+    @property
+    def restored_cookies(self) -> Optional[int]:
+        """Token for the saved cookies requests are sending, None once the session
+        warmed up itself
+        """
+        return self._generation if self._restored else None
+
+    async def open(self) -> aiohttp.ClientSession:
+        """The ready session; waits out a warm-up in progress so requests never go
+        without cookies
+        """
+        if self.session is None or self._lock.locked():
+            async with self._lock:
+                if self.session is None:
+                    session = aiohttp.ClientSession(
+                        headers=self.headers, cookie_jar=cookie_jar(self.base_url)
+                    )
+                    if self.session_state is not None and self.session_state.restore(
+                            session.cookie_jar, self.base_url):
+                        metrics.inc('thewatch_sessions_total', outcome='restored')
+                        self._restored = True
+                    else:
+                        await self._warm_up(session)
+                    self.session = session
+        return self.session
+
+    async def _warm_up(self, session: aiohttp.ClientSession) -> None:
+        # Get initial page to set up cookies
+        try:
+            headers = {**self.headers, 'Accept': self.warm_up_accept}
+            async with session.get(self.base_url, headers=headers) as response:
+                await response.text()
+                warmed = response.status < 400
+        except Exception as e:
+            logger.error("Error initializing session: %s", e)
+            return
+        metrics.inc('thewatch_sessions_total', outcome='warmed')
+        if warmed and self.session_state is not None:
+            self.session_state.save(session.cookie_jar, self.base_url)
+
+    async def replace_rejected(self, token: int) -> None:
+        """Drop the cookies `token` stands for and warm up again, unless another request
+        already did
+        """
+        async with self._lock:
+            if not self._restored or token != self._generation:
+                return
+            logger.info("Saved session was rejected; warming up again")
+            metrics.inc('thewatch_sessions_total', outcome='rejected')
+            self.session.cookie_jar.clear()
+            if self.session_state is not None:
+                self.session_state.clear()
+            await self._warm_up(self.session)
+            self._restored = False
+            self._generation += 1
+
+    async def close(self) -> None:
+        if self.session:
+            await self.session.close()
+            self.session = None
+
+
+__all__ = ['SESSION_REJECTED', 'SessionState', 'UpstreamSession', 'cookie_jar']
\ No newline at end of file
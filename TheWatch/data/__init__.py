@@ -2,5 +2,16 @@
 """Data handling components for TheWatch"""
 from TheWatch.data.exporters import SalesExporter
 from TheWatch.data.processors import process_raw_listing
+from TheWatch.data.store import SalesStore
+from TheWatch.data.photos import PhotoCache, PhotoFetcher
+from TheWatch.data.enrichment import DetailEnricher
+from TheWatch.data.lifecycle import LifecycleTracker
+from TheWatch.data.archive import ResponseArchive
+from TheWatch.data.aggregates import AnalyticsIndex
+from TheWatch.data.sellers import SellerIndex
 
-__all__ = ['SalesExporter', 'process_raw_listing']
\ No newline at end of file
+__all__ = [
+    'SalesExporter', 'process_raw_listing', 'SalesStore', 'PhotoCache', 'PhotoFetcher',
+    'DetailEnricher', 'LifecycleTracker', 'ResponseArchive', 'AnalyticsIndex',
+    'SellerIndex'
+]
\ No newline at end of file
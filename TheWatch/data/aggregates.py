@@ -0,0 +1,148 @@
+# TheWatch/data/aggregates.py
+import hashlib
+import json
+import threading
+import time
+from dataclasses import asdict
+from typing import Dict, Optional, Tuple
+
+from TheWatch.core.analytics import SalesAccumulator
+from TheWatch.core.models import Sale
+from TheWatch.data.store import SalesStore, query_key
+from TheWatch.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# (scope, name): ('all', ''), ('designer', lower-cased designer) or ('query', query_key)
+ScopeKey = Tuple[str, str]
+
+
+def _fingerprint(sale: Sale) -> tuple:
+    # The fields SalesAccumulator folds in; other edits leave the aggregates alone
+    return sale.designer.lower(), sale.price, sale.condition_code, sale.size_code
+
+
+class AnalyticsIndex:
+    """SalesAnalytics per designer, per query and overall, kept current from a store.
+
+    The first `refresh` folds in the whole store; later ones only read rows
+    written since the previous refresh. Rows are read `REFRESH_BATCH` at a
+    time and the lock is released between batches. A new listing is added to its
+    scopes in O(log n); a listing whose price, designer, condition or size
+    changed marks its scopes dirty, and dirty scopes are recounted from the
+    store on their next read. Each scope's rendered body and its strong
+    ETag (a hash of the body, identical across processes) are cached until
+    the scope changes.
+    """
+
+    REFRESH_BATCH = 1000
+
+    def __init__(self, store: SalesStore, min_refresh_interval: float = 1.0):
+        self.store = store
+        self.min_refresh_interval = min_refresh_interval
+        self._lock = threading.Lock()
+        self._scopes: Dict[ScopeKey, SalesAccumulator] = {}
+        self._known: Dict[int, Tuple[tuple, frozenset]] = {}
+        self._dirty: set = set()
+        self._rendered: Dict[ScopeKey, Tuple[bytes, str]] = {}
+        self._watermark = 0  # Highest store change sequence number folded in
+        self._refreshed_at = float('-inf')
+
+    def _scopes_of(self, sale: Sale, queries) -> list:
+        return [
+            ('all', ''),
+            ('designer', sale.designer.lower()),
+            *(('query', q) for q in queries),
+        ]
+
+    def _touch(self, key: ScopeKey) -> None:
+        self._rendered.pop(key, None)
+
+    def _fold(self, sale: Sale, queries: frozenset) -> None:
+        fingerprint = _fingerprint(sale)
+        known = self._known.get(sale.id)
+        if known is None:
+            scopes = self._scopes_of(sale, queries)
+        elif known[0] != fingerprint:
+            # Aggregates can't subtract the old values; recount every scope it was
+            # or is in
+            old_designer = ('designer', known[0][0])
+            for key in {old_designer, *self._scopes_of(sale, queries | known[1])}:
+                self._dirty.add(key)
+                self._touch(key)
+            self._known[sale.id] = (fingerprint, queries | known[1])
+            return
+        else:
+            scopes = [('query', q) for q in queries - known[1]]
+        seen_in = queries | known[1] if known else queries
+        self._known[sale.id] = (fingerprint, seen_in)
+        for key in scopes:
+            if key in self._dirty:
+                continue
+            if self._scopes.setdefault(key, SalesAccumulator()).add(sale):
+                self._touch(key)
+
+    def refresh(self, force: bool = False) -> int:
+        """Fold in sales written since the last refresh; returns the rows read"""
+        with self._lock:
+            now = time.monotonic()
+            if not force and now - self._refreshed_at < self.min_refresh_interval:
+                return 0
+            self._refreshed_at = now
+        read = 0
+        while True:
+            with self._lock:
+                rows = self.store.changed_since(self._watermark, self.REFRESH_BATCH)
+                for sale, seq, queries in rows:
+                    self._watermark = max(self._watermark, seq)
+                    self._fold(sale, frozenset(queries))
+            read += len(rows)
+            if len(rows) < self.REFRESH_BATCH:
+                return read
+
+    def _accumulator(self, key: ScopeKey) -> Optional[SalesAccumulator]:
+        if key in self._dirty:
+            scope, name = key
+            accumulator = SalesAccumulator()
+            accumulator.extend(self.store.sales_for(
+                designer=name if scope == 'designer' else None,
+                query=name if scope == 'query' else None
+            ))
+            self._scopes[key] = accumulator
+            self._dirty.discard(key)
+            logger.debug("Recounted analytics for %s %s (%d sales)",
+                         scope, name, len(accumulator))
+        return self._scopes.get(key)
+
+    def render(
+            self, designer: Optional[str] = None, query: Optional[str] = None
+    ) -> Optional[Tuple[bytes, str]]:
+        """JSON body and strong ETag of a scope's analytics; None if it has no sales"""
+        self.refresh()
+        if query is not None:
+            key: ScopeKey = ('query', query_key(query))
+        elif designer is not None:
+            key = ('designer', designer.lower())
+        else:
+            key = ('all', '')
+        with self._lock:
+            rendered = self._rendered.get(key)
+            if rendered is None:
+                accumulator = self._accumulator(key)
+                analytics = accumulator.snapshot() if accumulator else None
+                if analytics is None:
+                    return None
+                # Rounded so workers that summed in a different order still agree on
+                # the ETag
+                fields = {
+                    k: round(v, 2) if isinstance(v, float) else v
+                    for k, v in asdict(analytics).items()
+                }
+                body = json.dumps({'scope': key[0], 'name': key[1], **fields},
+                                  sort_keys=True, separators=(',', ':')).encode('utf-8')
+                etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+                rendered = self._rendered[key] = (body, etag)
+            return rendered
+
+
+__all__ = ['AnalyticsIndex']
\ No newline at end of file
@@ -0,0 +1,231 @@
+# TheWatch/data/archive.py
+import json
+import sqlite3
+import threading
+import time
+import zlib
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from TheWatch.core.models import Sale
+from TheWatch.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+DEFAULT_SEGMENT_BYTES = 64 * 1024 * 1024
+_READ_CHUNK = 1024 * 1024
+
+
+@dataclass
+class ArchiveEntry:
+    """Index row locating one archived response"""
+    segment: int
+    offset: int
+    length: int
+    query: str
+    page: int
+    fetched_at: float
+
+
+def _compress(record: Dict[str, Any]) -> bytes:
+    # One gzip member per record: segments stay valid .gz files, yet any record
+    # can be decompressed on its own from its offset
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    data = json.dumps(record, separators=(',', ':')).encode('utf-8')
+    return compressor.compress(data) + compressor.flush()
+
+
+def iter_segment(path: str) -> Iterator[Dict[str, Any]]:
+    """Stream every record of a segment file in write order"""
+    with open(path, 'rb') as f:
+        pending = b''
+        while True:
+            decompressor = zlib.decompressobj(31)
+            chunks = []
+            while not decompressor.eof:
+                if not pending:
+                    pending = f.read(_READ_CHUNK)
+                    if not pending:
+                        if chunks or decompressor.unconsumed_tail:
+                            logger.warning("Truncated record at end of %s", path)
+                        return
+                chunks.append(decompressor.decompress(pending))
+                pending = decompressor.unused_data
+            yield json.loads(b''.join(chunks))
+
+
+class ResponseArchive:
+    """Append-only, gzip-compressed archive of raw goods responses.
+
+    Records go to numbered segment files that roll over at `segment_bytes`;
+    a SQLite index maps query, page and fetch time to segment offsets.
+    """
+
+    def __init__(
+            self,
+            directory: str = "data/archive",
+            segment_bytes: int = DEFAULT_SEGMENT_BYTES,
+    ):
+        self.root = Path(directory)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.segment_bytes = segment_bytes
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(
+            str(self.root / "index.db"), check_same_thread=False
+        )
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS records (
+                segment INTEGER NOT NULL,
+                offset INTEGER NOT NULL,
+                length INTEGER NOT NULL,
+                query TEXT NOT NULL,
+                page INTEGER NOT NULL,
+                fetched_at REAL NOT NULL,
+                PRIMARY KEY (segment, offset)
+            );
+            CREATE INDEX IF NOT EXISTS records_by_query
+                ON records(query, page, fetched_at);
+            CREATE INDEX IF NOT EXISTS records_by_time ON records(fetched_at);
+        """)
+        # Never append to a segment from an earlier run; it may end in a torn record
+        segments = self.segments()
+        self._segment = segments[-1][0] + 1 if segments else 1
+        self._file = None
+
+    def segment_path(self, segment: int) -> Path:
+        return self.root / f"segment-{segment:06d}.jsonl.gz"
+
+    def segments(self) -> List[Tuple[int, Path]]:
+        """Existing segments, oldest first"""
+        found = []
+        for path in self.root.glob("segment-*.jsonl.gz"):
+            found.append((int(path.name.split('-')[1].split('.')[0]), path))
+        return sorted(found)
+
+    def append(self, query: str, page: int, response: Dict[str, Any],
+               params: Optional[Dict[str, Any]] = None,
+               fetched_at: Optional[float] = None) -> ArchiveEntry:
+        """Compress and append one raw response, then index it"""
+        fetched_at = time.time() if fetched_at is None else fetched_at
+        blob = _compress({
+            'query': query, 'page': page, 'params': params or {},
+            'fetched_at': fetched_at, 'response': response
+        })
+        with self._lock:
+            if self._file is None:
+                self._file = open(self.segment_path(self._segment), 'ab')
+            if self._file.tell() and self._file.tell() + len(blob) > self.segment_bytes:
+                self._file.close()
+                self._segment += 1
+                self._file = open(self.segment_path(self._segment), 'ab')
+            offset = self._file.tell()
+            self._file.write(blob)
+            self._file.flush()
+            entry = ArchiveEntry(
+                self._segment, offset, len(blob), query, page, fetched_at
+            )
+            with self.conn:
+                self.conn.execute(
+                    "INSERT INTO records "
+                    "(segment, offset, length, query, page, fetched_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (entry.segment, entry.offset, entry.length,
+                     entry.query, entry.page, entry.fetched_at)
+                )
+        return entry
+
+    def entries(self, query: Optional[str] = None, since: Optional[float] = None,
+                until: Optional[float] = None) -> List[ArchiveEntry]:
+        """Index rows matching the query and fetch-time window, in write order"""
+        clauses, params = [], []
+        if query is not None:
+            clauses.append("query = ?")
+            params.append(query)
+        if since is not None:
+            clauses.append("fetched_at >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("fetched_at < ?")
+            params.append(until)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        rows = self.conn.execute(
+            "SELECT segment, offset, length, query, page, fetched_at FROM records "
+            f"{where} ORDER BY segment, offset",
+            params
+        )
+        return [ArchiveEntry(*row) for row in rows]
+
+    def read(self, entry: ArchiveEntry) -> Dict[str, Any]:
+        """Load one archived record"""
+        with open(self.segment_path(entry.segment), 'rb') as f:
+            f.seek(entry.offset)
+            return json.loads(zlib.decompress(f.read(entry.length), 31))
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file:
+                self._file.close()
+                self._file = None
+        self.conn.close()
+
+
+def normalize_segment(path: str) -> Tuple[List[Sale], int]:
+    """Run every listing in a segment through the scraper's normalizer.
+
+    Runs in a worker process; returns the sales in archive order and the
+    number of records read.
+    """
+    from TheWatch.core.scraper import normalize_listing
+    sales, records = [], 0
+    for record in iter_segment(path):
+        records += 1
+        for raw_listing in record['response'].get('listings', []):
+            sale = normalize_listing(raw_listing)
+            if sale:
+                sales.append(sale)
+    return sales, records
+
+
+@dataclass
+class ReprocessResult:
+    segments: int = 0
+    records: int = 0
+    listings: int = 0
+    elapsed: float = 0.0
+
+
+def reprocess(
+        archive: ResponseArchive, store, executor: Optional[Executor] = None
+) -> ReprocessResult:
+    """Rebuild `store` from every archived response, one segment per worker.
+
+    Segments are normalized in parallel but written to the store in archive
+    order, so the most recently fetched copy of a listing wins.
+    """
+    started = time.perf_counter()
+    result = ReprocessResult()
+    owns_executor = executor is None
+    executor = executor or ProcessPoolExecutor()
+    try:
+        paths = [str(path) for _, path in archive.segments()]
+        for sales, records in executor.map(normalize_segment, paths):
+            result.segments += 1
+            result.records += records
+            result.listings += store.upsert(sales)
+    finally:
+        if owns_executor:
+            executor.shutdown()
+    result.elapsed = time.perf_counter() - started
+    logger.info("Reprocessed %d records from %d segments into %d listings in %.1fs",
+                result.records, result.segments, result.listings, result.elapsed)
+    return result
+
+
+__all__ = [
+    'ResponseArchive', 'ArchiveEntry', 'ReprocessResult',
+    'iter_segment', 'normalize_segment', 'reprocess'
+]
\ No newline at end of file
@@ -0,0 +1,173 @@
+# TheWatch/data/cache.py
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Optional, Tuple
+
+from TheWatch.utils.logger import setup_logger
+from TheWatch.utils.metrics import metrics
+
+logger = setup_logger(__name__)
+
+
+class ResultCache:
+    """Result cache in one SQLite file, shared by every process that opens it.
+
+    Each entry is a single row written in one transaction, so readers see a
+    whole value or none. Entries expire `ttl` seconds after being stored and
+    the least recently read are evicted beyond `max_entries`; a read only
+    records itself once `touch_interval` (a tenth of the TTL by default) has
+    passed since the last recorded one, so most hits don't write. A refresh lease
+    per key, taken with one conditional upsert, lets exactly one process
+    recompute an expired entry while the others serve the stale value or
+    wait for the fresh one.
+    """
+
+    def __init__(
+            self,
+            path: str = "data/cache/results.db",
+            ttl: float = 300,
+            max_entries: int = 1000,
+            lease: float = 30,
+            name: str = "results",
+            touch_interval: Optional[float] = None
+    ):
+        self.path = path
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.lease = lease
+        self.name = name
+        self.touch_interval = ttl / 10 if touch_interval is None else touch_interval
+        self.owner = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(path, timeout=10, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                expires_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS entries_by_access ON entries(accessed_at);
+            CREATE TABLE IF NOT EXISTS leases (
+                key TEXT PRIMARY KEY,
+                owner TEXT NOT NULL,
+                expires_at REAL NOT NULL
+            );
+        """)
+
+    def lookup(self, key: str) -> Tuple[Optional[Any], bool]:
+        """The cached value (or None) and whether it is still fresh; marks it as used"""
+        now = time.time()
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT value, expires_at, accessed_at FROM entries WHERE key = ?",
+                (key,)
+            ).fetchone()
+            if row is None:
+                return None, False
+            value, expires_at, accessed_at = row
+            # Recency only orders eviction; a recent mark saves taking the write lock
+            if now - accessed_at >= self.touch_interval:
+                with self.conn:
+                    self.conn.execute(
+                        "UPDATE entries SET accessed_at = ? WHERE key = ?", (now, key)
+                    )
+        return json.loads(value), expires_at > now
+
+    def get(self, key: str) -> Optional[Any]:
+        """The value if present and fresh"""
+        value, fresh = self.lookup(key)
+        return value if fresh else None
+
+    def put(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        now = time.time()
+        blob = json.dumps(value, separators=(',', ':'))
+        with self._lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO entries (key, value, expires_at, accessed_at) "
+                "VALUES (?, ?, ?, ?)",
+                (key, blob, now + (self.ttl if ttl is None else ttl), now)
+            )
+            self.conn.execute("""
+                DELETE FROM entries WHERE key IN (
+                    SELECT key FROM entries ORDER BY accessed_at DESC LIMIT -1 OFFSET ?
+                )
+            """, (self.max_entries,))
+
+    def delete(self, key: str) -> None:
+        with self._lock, self.conn:
+            self.conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+
+    def acquire(self, key: str) -> bool:
+        """Take the refresh lease on `key` unless another live owner holds it"""
+        now = time.time()
+        with self._lock, self.conn:
+            cursor = self.conn.execute("""
+                INSERT INTO leases (key, owner, expires_at) VALUES (?, ?, ?)
+                ON CONFLICT(key) DO UPDATE
+                SET owner = excluded.owner, expires_at = excluded.expires_at
+                WHERE leases.expires_at < ?
+            """, (key, self.owner, now + self.lease, now))
+            return cursor.rowcount == 1
+
+    def release(self, key: str) -> None:
+        with self._lock, self.conn:
+            self.conn.execute(
+                "DELETE FROM leases WHERE key = ? AND owner = ?", (key, self.owner)
+            )
+
+    async def get_or_refresh(
+            self,
+            key: str,
+            refresh: Callable[[], Awaitable[Any]],
+            poll: float = 0.05
+    ) -> Any:
+        """Cached value for `key`, computing it with `refresh` when missing or expired.
+
+        Only the lease holder calls `refresh`. Everyone else gets the stale
+        value if there is one, or waits for the holder to store a fresh one;
+        if the holder's lease lapses first, the next waiter takes over. The
+        SQLite calls run in the default executor: one can wait out the busy
+        timeout behind another process's write.
+        """
+        loop = asyncio.get_running_loop()
+        value, fresh = await loop.run_in_executor(None, self.lookup, key)
+        if fresh:
+            metrics.cache(self.name, True)
+            return value
+        while True:
+            if await loop.run_in_executor(None, self.acquire, key):
+                metrics.cache(self.name, False)
+                try:
+                    value = await refresh()
+                    await loop.run_in_executor(None, self.put, key, value)
+                    return value
+                finally:
+                    await loop.run_in_executor(None, self.release, key)
+            if value is not None:
+                metrics.cache(self.name, True)
+                return value
+            await asyncio.sleep(poll)
+            value, fresh = await loop.run_in_executor(None, self.lookup, key)
+            if fresh:
+                metrics.cache(self.name, True)
+                return value
+
+    def __len__(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def close(self) -> None:
+        self.conn.close()
+
+
+__all__ = ['ResultCache']
\ No newline at end of file
@@ -0,0 +1,105 @@
+# TheWatch/data/enrichment.py
+import asyncio
+import time
+from dataclasses import replace
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+from TheWatch.core.models import Sale
+from TheWatch.data.store import SalesStore
+from TheWatch.utils.logger import setup_logger
+from TheWatch.utils.metrics import metrics
+
+logger = setup_logger(__name__)
+
+# Detail payloads older than this are fetched again
+DEFAULT_MAX_AGE = 24 * 60 * 60
+
+
+def merge_details(
+        sale: Sale, details: Dict[str, Any], fetched_at: Optional[float] = None
+) -> Sale:
+    """Return a copy of `sale` filled in from a `/listings/{id}` payload"""
+    seller = details.get('seller') or {}
+    photos = [p.get('url') for p in details.get('photos', []) if p.get('url')]
+    seller_stats = {
+        key: value for key, value in seller.items()
+        if isinstance(value, (int, float)) and not isinstance(value, bool)
+    }
+    return replace(
+        sale,
+        description=(details.get('description') or sale.description).strip(),
+        photos=photos or sale.photos,
+        category=details.get('category') or sale.category,
+        tags=details.get('hashtags') or sale.tags,
+        measurements=details.get('measurements') or sale.measurements,
+        seller_stats=seller_stats or sale.seller_stats,
+        enriched_at=datetime.fromtimestamp(fetched_at) if fetched_at else datetime.now()
+    )
+
+
+class DetailEnricher:
+    """Adds listing-detail data to search results, at most once per `max_age` each.
+
+    Detail payloads are cached in the store; only listings with no cached
+    payload, or a stale one, go upstream, with at most `concurrency` requests
+    in flight through the scraper's rate limiter.
+    """
+
+    def __init__(
+            self,
+            scraper,
+            store: SalesStore,
+            concurrency: int = 4,
+            max_age: float = DEFAULT_MAX_AGE,
+    ):
+        self.scraper = scraper
+        self.store = store
+        self.semaphore = asyncio.Semaphore(max(1, concurrency))
+        self.max_age = max_age
+
+    def pending(self, sales: Iterable[Sale]) -> List[int]:
+        """IDs among `sales` whose details are missing or older than `max_age`"""
+        ids = list(dict.fromkeys(sale.id for sale in sales if sale.id is not None))
+        fetched = self.store.detail_times(ids)
+        cutoff = time.time() - self.max_age
+        pending = []
+        for sale_id in ids:
+            fresh = fetched.get(sale_id, float('-inf')) > cutoff
+            metrics.cache('listing_details', fresh)
+            if not fresh:
+                pending.append(sale_id)
+        return pending
+
+    async def _fetch(self, sale_id: int) -> Optional[Dict[str, Any]]:
+        async with self.semaphore:
+            return await self.scraper.get_listing_details(sale_id)
+
+    async def enrich(self, sales: List[Sale]) -> List[Sale]:
+        """Merge details into `sales`, store the enriched listings and return them"""
+        pending = self.pending(sales)
+        if pending:
+            payloads = await asyncio.gather(
+                *(self._fetch(sale_id) for sale_id in pending)
+            )
+            fetched = {
+                sale_id: payload
+                for sale_id, payload in zip(pending, payloads) if payload
+            }
+            self.store.put_details(fetched)
+            if len(fetched) < len(pending):
+                logger.warning("Listing details unavailable for %d of %d listings",
+                               len(pending) - len(fetched), len(pending))
+
+        details = self.store.get_details(
+            sale.id for sale in sales if sale.id is not None
+        )
+        enriched = [
+            merge_details(sale, *details[sale.id]) if sale.id in details else sale
+            for sale in sales
+        ]
+        self.store.upsert(sale for sale in enriched if sale.enriched_at)
+        return enriched
+
+
+__all__ = ['DetailEnricher', 'merge_details', 'DEFAULT_MAX_AGE']
\ No newline at end of file
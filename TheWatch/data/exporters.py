@@ -1,16 +1,80 @@
 # TheWatch/data/exporters.py
 import csv
+import hashlib
+import io
 import json
+import os
+import re
+import sqlite3
+import time
 from datetime import datetime
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterable, Optional
 import logging
 
 from TheWatch.core.models import Sale
 from TheWatch.utils.logger import setup_logger
+from TheWatch.utils.metrics import metrics
 
 logger = setup_logger(__name__)
 
+CSV_HEADERS = [
+    'Title',
+    'Designer',
+    'Price ($)',
+    'Original Price ($)',
+    'Discount (%)',
+    'Condition',
+    'Location',
+    'Size',
+    'Sale Date',
+    'URL',
+    'Platform'
+]
+# Delta chunks lead with the listing ID so consumers can upsert on it
+DELTA_HEADERS = ['ID'] + CSV_HEADERS
+_DESTINATION_RE = re.compile(r'^[\w.-]+$')
+# Stay under SQLite's default bound-parameter limit
+_ID_CHUNK = 500
+
+
+def _csv_row(sale: Sale) -> List[str]:
+    # Calculate discount percentage
+    if sale.original_price > sale.price:
+        off = (sale.original_price - sale.price) / sale.original_price
+        discount = f"{off * 100:.1f}"
+    else:
+        discount = "0.0"
+
+    return [
+        sale.title,
+        sale.designer_display,
+        f"{sale.price:.2f}",
+        f"{sale.original_price:.2f}",
+        discount,
+        sale.condition_display,
+        sale.location or 'Unknown',
+        sale.size,
+        sale.sold_date.strftime('%Y-%m-%d %H:%M:%S'),
+        sale.url,
+        sale.platform
+    ]
+
+
+def _row_fingerprint(row: List[str]) -> int:
+    digest = hashlib.blake2b('\x1f'.join(row).encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'big', signed=True)
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    # Readers see the old file or the whole new one, never a partial write
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with open(tmp, 'wb') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
 
 class SalesExporter:
     """Handles exporting sales data to various formats"""
@@ -18,62 +82,35 @@ class SalesExporter:
     def __init__(self, output_dir: str = "data/exports"):
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        self._delta_conn: Optional[sqlite3.Connection] = None
 
     def export_csv(self, sales: List[Sale], query: str) -> str:
         """Export sales to a CSV file with proper formatting"""
+        started = time.perf_counter()
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         filename = self.output_dir / f"sales_{query.replace(' ', '_')}_{timestamp}.csv"
 
-        headers = [
-            'Title',
-            'Designer',
-            'Price ($)',
-            'Original Price ($)',
-            'Discount (%)',
-            'Condition',
-            'Location',
-            'Size',
-            'Sale Date',
-            'URL',
-            'Platform'
-        ]
-
         try:
             with open(filename, 'w', newline='', encoding='utf-8-sig') as f:
                 writer = csv.writer(f)
-                writer.writerow(headers)
-
+                writer.writerow(CSV_HEADERS)
                 for sale in sales:
-                    # Calculate discount percentage
-                    if sale.original_price > sale.price:
-                        discount = f"{((sale.original_price - sale.price) / sale.original_price * 100):.1f}"
-                    else:
-                        discount = "0.0"
-
-                    row = [
-                        sale.title,
-                        sale.designer_display,
-                        f"{sale.price:.2f}",
-                        f"{sale.original_price:.2f}",
-                        discount,
-                        sale.condition_display,
-                        sale.location or 'Unknown',
-                        sale.size,
-                        sale.sold_date.strftime('%Y-%m-%d %H:%M:%S'),
-                        sale.url,
-                        sale.platform
-                    ]
-                    writer.writerow(row)
-
-            logger.info(f"Successfully exported {len(sales)} sales to CSV: {filename}")
+                    writer.writerow(_csv_row(sale))
+
+            metrics.observe('thewatch_export_seconds',
+                            time.perf_counter() - started, format='csv')
+            metrics.inc('thewatch_exported_rows_total', len(sales), format='csv')
+            logger.info("Successfully exported %s sales to CSV: %s",
+                        len(sales), filename)
             return str(filename)
 
         except Exception as e:
-            logger.error(f"Error exporting to CSV: {str(e)}")
+            logger.error("Error exporting to CSV: %s", e)
             raise
 
     def export_excel(self, sales: List[Sale], query: str) -> str:
         """Export sales to Excel with formatting"""
+        started = time.perf_counter()
         try:
             import pandas as pd
             import openpyxl
@@ -137,12 +174,203 @@ class SalesExporter:
                     adjusted_width = min(max_length + 2, 50)  # Cap width at 50
                     worksheet.column_dimensions[column[0].column_letter].width = adjusted_width
 
-            logger.info(f"Successfully exported {len(sales)} sales to Excel: {filename}")
+            metrics.observe('thewatch_export_seconds',
+                            time.perf_counter() - started, format='excel')
+            metrics.inc('thewatch_exported_rows_total', len(sales), format='excel')
+            logger.info("Successfully exported %s sales to Excel: %s",
+                        len(sales), filename)
             return str(filename)
 
         except ImportError:
             logger.warning("Excel export requires pandas and openpyxl. Falling back to CSV.")
             return self.export_csv(sales, query)
         except Exception as e:
-            logger.error(f"Error exporting to Excel: {str(e)}")
-            raise
\ No newline at end of file
+            logger.error("Error exporting to Excel: %s", e)
+            raise
+
+    def _delta_state(self) -> sqlite3.Connection:
+        if self._delta_conn is None:
+            self._delta_conn = sqlite3.connect(str(self.output_dir / "delta_state.db"))
+            self._delta_conn.execute("PRAGMA journal_mode=WAL")
+            self._delta_conn.execute("PRAGMA synchronous=NORMAL")
+            self._delta_conn.executescript("""
+                CREATE TABLE IF NOT EXISTS exported (
+                    destination TEXT NOT NULL,
+                    id INTEGER NOT NULL,
+                    fingerprint INTEGER NOT NULL,
+                    PRIMARY KEY (destination, id)
+                );
+                CREATE TABLE IF NOT EXISTS chunks (
+                    destination TEXT NOT NULL,
+                    sequence INTEGER NOT NULL,
+                    file TEXT NOT NULL,
+                    records INTEGER NOT NULL,
+                    added INTEGER NOT NULL,
+                    changed INTEGER NOT NULL,
+                    sha256 TEXT NOT NULL,
+                    created_at TEXT NOT NULL,
+                    PRIMARY KEY (destination, sequence)
+                );
+                CREATE TABLE IF NOT EXISTS watermarks (
+                    destination TEXT PRIMARY KEY,
+                    exported_at TEXT,
+                    last_id INTEGER,
+                    source INTEGER NOT NULL DEFAULT 0
+                );
+            """)
+        return self._delta_conn
+
+    def watermark(self, destination: str) -> Dict[str, Any]:
+        """Last export of `destination`: time, highest listing ID and the store change
+        sequence read up to
+        """
+        row = self._delta_state().execute(
+            "SELECT exported_at, last_id, source FROM watermarks WHERE destination = ?",
+            (destination,)
+        ).fetchone()
+        exported_at, last_id, source = row or (None, None, 0)
+        # Timestamp watermarks from before change sequences: read the store once
+        # more, unchanged rows are skipped
+        return {
+            'exported_at': exported_at,
+            'last_id': last_id,
+            'source': source if isinstance(source, int) else 0,
+        }
+
+    def _write_manifest(self, destination: str) -> Path:
+        conn = self._delta_state()
+        chunks = [
+            {
+                'sequence': sequence, 'file': file, 'records': records, 'added': added,
+                'changed': changed, 'sha256': sha256, 'created_at': created_at
+            }
+            for sequence, file, records, added, changed, sha256, created_at
+            in conn.execute(
+                "SELECT sequence, file, records, added, changed, sha256, created_at "
+                "FROM chunks WHERE destination = ? ORDER BY sequence", (destination,)
+            )
+        ]
+        manifest = {
+            'destination': destination,
+            'watermark': self.watermark(destination),
+            'chunks': chunks,
+        }
+        path = self.output_dir / destination / "manifest.json"
+        _write_atomic(path, json.dumps(manifest, indent=2).encode('utf-8'))
+        return path
+
+    def export_delta(
+            self,
+            sales: Iterable[Sale],
+            destination: str,
+            source_watermark: Optional[int] = None
+    ) -> Optional[str]:
+        """Export only the sales added or changed since `destination`'s last export.
+
+        Each export writes one numbered CSV chunk under
+        `output_dir/<destination>/` and lists it in that directory's
+        `manifest.json`, so consumers read the manifest and fetch only chunks
+        past the last sequence they processed. Chunks and the manifest are
+        replaced atomically, and a chunk only appears in the manifest once
+        its records are recorded as exported. Returns the chunk path, or
+        None when nothing changed.
+        """
+        if not _DESTINATION_RE.match(destination):
+            raise ValueError(f"Invalid export destination: {destination!r}")
+        started = time.perf_counter()
+        conn = self._delta_state()
+        latest: Dict[int, Sale] = {}
+        for sale in sales:
+            if sale.id is not None:
+                latest[sale.id] = sale
+
+        known: Dict[int, int] = {}
+        ids = list(latest)
+        for start in range(0, len(ids), _ID_CHUNK):
+            chunk = ids[start:start + _ID_CHUNK]
+            known.update(conn.execute(
+                "SELECT id, fingerprint FROM exported "
+                f"WHERE destination = ? AND id IN ({','.join('?' * len(chunk))})",
+                [destination, *chunk]
+            ))
+
+        rows, fingerprints, added = [], [], 0
+        for sale_id, sale in latest.items():
+            row = _csv_row(sale)
+            fingerprint = _row_fingerprint(row)
+            if known.get(sale_id) == fingerprint:
+                continue
+            added += sale_id not in known
+            rows.append([str(sale_id)] + row)
+            fingerprints.append((destination, sale_id, fingerprint))
+
+        now = datetime.now().isoformat()
+        previous = self.watermark(destination)
+        source = (
+            source_watermark if source_watermark is not None else previous['source']
+        )
+        path = None
+        if rows:
+            sequence = conn.execute(
+                "SELECT COALESCE(MAX(sequence), 0) + 1 FROM chunks "
+                "WHERE destination = ?",
+                (destination,)
+            ).fetchone()[0]
+            path = self.output_dir / destination / f"chunk_{sequence:06d}.csv"
+            path.parent.mkdir(parents=True, exist_ok=True)
+            buffer = io.StringIO(newline='')
+            writer = csv.writer(buffer)
+            writer.writerow(DELTA_HEADERS)
+            writer.writerows(rows)
+            data = buffer.getvalue().encode('utf-8-sig')
+            # A crash after this leaves an unlisted chunk that the next export
+            # overwrites
+            _write_atomic(path, data)
+
+        with conn:
+            if rows:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO exported (destination, id, fingerprint) "
+                    "VALUES (?, ?, ?)",
+                    fingerprints
+                )
+                conn.execute(
+                    "INSERT INTO chunks (destination, sequence, file, records, added, "
+                    "changed, sha256, created_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (destination, sequence, path.name, len(rows), added,
+                     len(rows) - added, hashlib.sha256(data).hexdigest(), now)
+                )
+            last_id = max([
+                previous['last_id'] or 0, *(sale_id for _, sale_id, _ in fingerprints)
+            ])
+            conn.execute(
+                "INSERT OR REPLACE INTO watermarks "
+                "(destination, exported_at, last_id, source) VALUES (?, ?, ?, ?)",
+                (destination, now if rows else previous['exported_at'],
+                 last_id or None, source)
+            )
+        self._write_manifest(destination)
+
+        metrics.observe('thewatch_export_seconds',
+                        time.perf_counter() - started, format='delta')
+        metrics.inc('thewatch_exported_rows_total', len(rows), format='delta')
+        if path is None:
+            logger.info("No changes to export to %s", destination)
+            return None
+        logger.info("Exported %s changed sales (%s new) to %s", len(rows), added, path)
+        return str(path)
+
+    def export_store_delta(self, store, destination: str) -> Optional[str]:
+        """Delta-export a SalesStore, reading only rows written since the destination's
+        last export
+        """
+        previous = self.watermark(destination)['source']
+        rows = store.changed_since(previous)
+        source = max([previous, *(seq for _, seq, _ in rows)])
+        return self.export_delta((sale for sale, _, _ in rows), destination,
+                                 source_watermark=source)
+
+    def close(self) -> None:
+        if self._delta_conn is not None:
+            self._delta_conn.close()
+            self._delta_conn = None
\ No newline at end of file
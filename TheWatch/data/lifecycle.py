@@ -0,0 +1,234 @@
+# TheWatch/data/lifecycle.py
+import hashlib
+import sqlite3
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+from TheWatch.core.models import Sale
+from TheWatch.utils.logger import setup_logger
+from TheWatch.utils.metrics import metrics
+
+logger = setup_logger(__name__)
+
+# Change kinds written to the log
+NEW = 'new'
+PRICE_CHANGE = 'price_change'
+UPDATED = 'updated'
+REMOVED = 'removed'
+RELIST = 'relist'
+
+
+def content_hash(sale: Sale) -> int:
+    """64-bit fingerprint of the listing fields a seller can change"""
+    content = '\x1f'.join((
+        sale.title, f"{sale.price:.2f}", f"{sale.original_price:.2f}", sale.size,
+        sale.condition, sale.description, '\x1e'.join(sale.photos)
+    ))
+    digest = hashlib.blake2b(content.encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'big', signed=True)
+
+
+@dataclass
+class ListingChange:
+    """One entry of the change log"""
+    listing_id: int
+    kind: str
+    at: float
+    old_price: Optional[float] = None
+    new_price: Optional[float] = None
+    query: Optional[str] = None
+
+    @property
+    def price_delta(self) -> Optional[float]:
+        if self.old_price is None or self.new_price is None:
+            return None
+        return self.new_price - self.old_price
+
+
+class _State(NamedTuple):
+    hash: int
+    price: float
+    active: bool
+    query: Optional[str]
+
+
+class LifecycleTracker:
+    """Tracks listings across polls and logs only what changed.
+
+    The latest content hash of every listing is kept in memory (and in the
+    `listing_state` table), so an unchanged listing costs one hash and one
+    dict lookup. New listings, price changes, other edits, removals and
+    relists are appended to the `listing_changes` log, indexed by kind and
+    time for queries like "price drops in the last hour".
+    """
+
+    def __init__(self, path: str = "data/lifecycle.db"):
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS listing_state (
+                id INTEGER PRIMARY KEY,
+                hash INTEGER NOT NULL,
+                price REAL NOT NULL,
+                active INTEGER NOT NULL,
+                query TEXT,
+                updated_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS listing_changes (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                id INTEGER NOT NULL,
+                kind TEXT NOT NULL,
+                at REAL NOT NULL,
+                old_price REAL,
+                new_price REAL,
+                query TEXT
+            );
+            CREATE INDEX IF NOT EXISTS changes_by_kind ON listing_changes(kind, at);
+            CREATE INDEX IF NOT EXISTS changes_by_listing ON listing_changes(id, seq);
+        """)
+        self._states: Dict[int, _State] = {
+            row[0]: _State(row[1], row[2], bool(row[3]), row[4])
+            for row in self.conn.execute(
+                "SELECT id, hash, price, active, query FROM listing_state"
+            )
+        }
+
+    def __len__(self) -> int:
+        return len(self._states)
+
+    def _write(
+            self, states: Dict[int, _State], changes: List[ListingChange], at: float
+    ) -> None:
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO listing_state "
+                "(id, hash, price, active, query, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    (i, s.hash, s.price, int(s.active), s.query, at)
+                    for i, s in states.items()
+                ]
+            )
+            self.conn.executemany(
+                "INSERT INTO listing_changes "
+                "(id, kind, at, old_price, new_price, query) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    (c.listing_id, c.kind, c.at, c.old_price, c.new_price, c.query)
+                    for c in changes
+                ]
+            )
+        self._states.update(states)
+        for change in changes:
+            metrics.inc('thewatch_listing_changes_total', kind=change.kind)
+
+    def observe(
+            self,
+            sales: Iterable[Sale],
+            query: Optional[str] = None,
+            at: Optional[float] = None,
+    ) -> List[ListingChange]:
+        """Compare polled listings with their last known state and log differences"""
+        at = time.time() if at is None else at
+        states: Dict[int, _State] = {}
+        changes: List[ListingChange] = []
+        unchanged = 0
+        for sale in sales:
+            if sale.id is None:
+                continue
+            digest = content_hash(sale)
+            previous = states.get(sale.id) or self._states.get(sale.id)
+            new_query = (
+                query if query is not None else (previous.query if previous else None)
+            )
+            if previous and previous.active and previous.hash == digest:
+                unchanged += 1
+                if new_query != previous.query:
+                    states[sale.id] = previous._replace(query=new_query)
+                continue
+
+            if previous is None:
+                change = ListingChange(sale.id, NEW, at, None, sale.price, new_query)
+            elif not previous.active:
+                change = ListingChange(
+                    sale.id, RELIST, at, previous.price, sale.price, new_query
+                )
+            elif previous.price != sale.price:
+                change = ListingChange(
+                    sale.id, PRICE_CHANGE, at, previous.price, sale.price, new_query
+                )
+            else:
+                change = ListingChange(
+                    sale.id, UPDATED, at, previous.price, sale.price, new_query
+                )
+            changes.append(change)
+            states[sale.id] = _State(digest, sale.price, True, new_query)
+
+        metrics.inc('thewatch_listings_unchanged_total', unchanged)
+        if states:
+            self._write(states, changes, at)
+        return changes
+
+    def sweep(
+            self, query: str, seen_ids: Iterable[int], at: Optional[float] = None
+    ) -> List[ListingChange]:
+        """Mark listings last seen under `query` but missing from `seen_ids` as removed.
+
+        Only call this after a complete crawl of the query; listings that just
+        moved to an unfetched page would otherwise be logged as sold.
+        """
+        at = time.time() if at is None else at
+        seen = set(seen_ids)
+        states: Dict[int, _State] = {}
+        changes: List[ListingChange] = []
+        for listing_id, state in self._states.items():
+            if state.query == query and state.active and listing_id not in seen:
+                states[listing_id] = state._replace(active=False)
+                changes.append(
+                    ListingChange(listing_id, REMOVED, at, state.price, None, query)
+                )
+        if states:
+            self._write(states, changes, at)
+        return changes
+
+    def _select(self, where: str, params: tuple) -> List[ListingChange]:
+        rows = self.conn.execute(
+            "SELECT id, kind, at, old_price, new_price, query FROM listing_changes "
+            f"WHERE {where} ORDER BY seq",
+            params
+        )
+        return [ListingChange(*row) for row in rows]
+
+    def changes(
+            self, since: float = 0.0, kinds: Optional[Iterable[str]] = None
+    ) -> List[ListingChange]:
+        """Log entries at or after `since` (epoch seconds), optionally of some kinds"""
+        if not kinds:
+            return self._select("at >= ?", (since,))
+        kinds = list(kinds)
+        return self._select(
+            f"kind IN ({','.join('?' * len(kinds))}) AND at >= ?", (*kinds, since)
+        )
+
+    def price_drops(self, since: float) -> List[ListingChange]:
+        """Price reductions logged at or after `since`"""
+        return self._select(
+            "kind = ? AND at >= ? AND new_price < old_price", (PRICE_CHANGE, since)
+        )
+
+    def history(self, listing_id: int) -> List[ListingChange]:
+        return self._select("id = ?", (listing_id,))
+
+    def close(self) -> None:
+        self.conn.close()
+
+
+__all__ = [
+    'LifecycleTracker', 'ListingChange', 'content_hash',
+    'NEW', 'PRICE_CHANGE', 'UPDATED', 'REMOVED', 'RELIST'
+]
\ No newline at end of file
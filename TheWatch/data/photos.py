@@ -0,0 +1,245 @@
+# TheWatch/data/photos.py
+import asyncio
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple
+
+from TheWatch.utils.logger import setup_logger
+from TheWatch.utils.metrics import metrics
+
+logger = setup_logger(__name__)
+
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+DEFAULT_THUMBNAIL_SIZE = 256
+
+
+def _blob_path(root: Path, digest: str) -> Path:
+    return root / "blobs" / digest[:2] / digest
+
+
+def _thumbnail_path(root: Path, digest: str, size: int) -> Path:
+    return root / "thumbs" / digest[:2] / f"{digest}_{size}.jpg"
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Threads of one process may write the same digest concurrently
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    with open(tmp, 'wb') as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def process_photo(
+        data: bytes, root: str, thumbnail_size: int
+) -> Tuple[str, Optional[str]]:
+    """Hash, store and thumbnail one downloaded photo.
+
+    Runs in a worker process. Returns the content digest and the thumbnail path,
+    which is None when Pillow is not installed or the bytes are not an image.
+    """
+    cache_root = Path(root)
+    digest = hashlib.sha256(data).hexdigest()
+    blob = _blob_path(cache_root, digest)
+    if not blob.exists():
+        _write_atomic(blob, data)
+
+    thumbnail = _thumbnail_path(cache_root, digest, thumbnail_size)
+    if thumbnail.exists():
+        return digest, str(thumbnail)
+    try:
+        import io
+        from PIL import Image
+    except ImportError:
+        return digest, None
+
+    try:
+        with Image.open(io.BytesIO(data)) as image:
+            image.thumbnail((thumbnail_size, thumbnail_size))
+            buffer = io.BytesIO()
+            image.convert('RGB').save(buffer, format='JPEG', quality=85)
+    except Exception:
+        return digest, None
+    _write_atomic(thumbnail, buffer.getvalue())
+    return digest, str(thumbnail)
+
+
+class PhotoCache:
+    """Content-addressed on-disk photo store with size-based LRU eviction.
+
+    Photo bytes live under `blobs/<sha256>`, so the same image listed under
+    several URLs is stored once; a SQLite index maps URLs to digests.
+    """
+
+    def __init__(
+            self, cache_dir: str = "data/photos", max_bytes: int = DEFAULT_MAX_BYTES
+    ):
+        self.root = Path(cache_dir)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.conn = sqlite3.connect(str(self.root / "index.db"))
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS blobs (
+                digest TEXT PRIMARY KEY,
+                bytes INTEGER NOT NULL,
+                thumbnail TEXT,
+                last_access REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS urls (
+                url TEXT PRIMARY KEY,
+                digest TEXT NOT NULL REFERENCES blobs(digest) ON DELETE CASCADE
+            );
+            CREATE INDEX IF NOT EXISTS blobs_by_access ON blobs(last_access);
+        """)
+
+    def lookup(self, url: str) -> Optional[str]:
+        """Digest for a cached URL, refreshing its LRU position"""
+        row = self.conn.execute(
+            "SELECT digest FROM urls WHERE url = ?", (url,)
+        ).fetchone()
+        if not row or not _blob_path(self.root, row[0]).exists():
+            return None
+        with self.conn:
+            self.conn.execute(
+                "UPDATE blobs SET last_access = ? WHERE digest = ?",
+                (time.time(), row[0]),
+            )
+        return row[0]
+
+    def path(self, digest: str) -> Path:
+        return _blob_path(self.root, digest)
+
+    def thumbnail(self, digest: str) -> Optional[str]:
+        row = self.conn.execute(
+            "SELECT thumbnail FROM blobs WHERE digest = ?", (digest,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def add(self, url: str, digest: str, size: int, thumbnail: Optional[str]) -> None:
+        with self.conn:
+            self.conn.execute(
+                "INSERT INTO blobs (digest, bytes, thumbnail, last_access) "
+                "VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(digest) DO UPDATE SET last_access = excluded.last_access, "
+                "thumbnail = COALESCE(excluded.thumbnail, blobs.thumbnail)",
+                (digest, size, thumbnail, time.time())
+            )
+            self.conn.execute(
+                "INSERT OR REPLACE INTO urls (url, digest) VALUES (?, ?)", (url, digest)
+            )
+
+    def total_bytes(self) -> int:
+        return self.conn.execute(
+            "SELECT COALESCE(SUM(bytes), 0) FROM blobs"
+        ).fetchone()[0]
+
+    def evict(self) -> int:
+        """Drop least recently used photos until the cache fits `max_bytes`; returns
+        how many were removed
+        """
+        total = self.total_bytes()
+        removed = 0
+        if total <= self.max_bytes:
+            return removed
+
+        rows = self.conn.execute(
+            "SELECT digest, bytes, thumbnail FROM blobs ORDER BY last_access"
+        ).fetchall()
+        with self.conn:
+            for digest, size, thumbnail in rows:
+                if total <= self.max_bytes:
+                    break
+                for path in (self.path(digest), Path(thumbnail) if thumbnail else None):
+                    if path and path.exists():
+                        path.unlink()
+                self.conn.execute("DELETE FROM urls WHERE digest = ?", (digest,))
+                self.conn.execute("DELETE FROM blobs WHERE digest = ?", (digest,))
+                total -= size
+                removed += 1
+        return removed
+
+    def close(self) -> None:
+        self.conn.close()
+
+
+class PhotoFetcher:
+    """Downloads listing photos with bounded concurrency into a PhotoCache.
+
+    Hashing, disk writes and thumbnailing run in a process pool so the event
+    loop only ever waits on the network.
+    """
+
+    def __init__(
+            self,
+            cache: PhotoCache,
+            concurrency: int = 8,
+            thumbnail_size: int = DEFAULT_THUMBNAIL_SIZE,
+            session=None,
+            executor: Optional[Executor] = None
+    ):
+        self.cache = cache
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.thumbnail_size = thumbnail_size
+        self.session = session
+        self._owns_session = session is None
+        self.executor = executor
+        self._owns_executor = executor is None
+
+    async def _session(self):
+        if self.session is None:
+            import aiohttp
+            self.session = aiohttp.ClientSession()
+        return self.session
+
+    def _executor(self) -> Executor:
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor()
+        return self.executor
+
+    async def fetch(self, url: str) -> Optional[str]:
+        """Return the digest of the photo at `url`, downloading it on a cache miss"""
+        digest = self.cache.lookup(url)
+        metrics.cache('photos', digest is not None)
+        if digest:
+            return digest
+
+        async with self.semaphore:
+            session = await self._session()
+            try:
+                async with session.get(url) as response:
+                    response.raise_for_status()
+                    data = await response.read()
+            except Exception as e:
+                logger.warning("Photo download failed for %s: %s", url, e)
+                return None
+
+        loop = asyncio.get_running_loop()
+        digest, thumbnail = await loop.run_in_executor(
+            self._executor(), process_photo,
+            data, str(self.cache.root), self.thumbnail_size
+        )
+        self.cache.add(url, digest, len(data), thumbnail)
+        return digest
+
+    async def fetch_all(self, urls: Iterable[str]) -> Dict[str, Optional[str]]:
+        """Fetch many photos concurrently, then evict down to the cache size limit"""
+        unique = list(dict.fromkeys(urls))
+        digests = await asyncio.gather(*(self.fetch(url) for url in unique))
+        self.cache.evict()
+        return dict(zip(unique, digests))
+
+    async def close(self) -> None:
+        if self._owns_session and self.session:
+            await self.session.close()
+            self.session = None
+        if self._owns_executor and self.executor:
+            self.executor.shutdown()
+            self.executor = None
+
+
+__all__ = ['PhotoCache', 'PhotoFetcher', 'process_photo']
\ No newline at end of file
@@ -5,6 +5,7 @@ from datetime import datetime
 from TheWatch.core.models import Sale
 from TheWatch.utils.logger import setup_logger
 from TheWatch.utils.helpers import clean_text, parse_price
+from TheWatch.utils.normalize import canonical_condition
 
 logger = setup_logger(__name__)
 
@@ -22,7 +23,7 @@ def process_raw_listing(raw_data: Dict[str, Any]) -> Optional[Sale]:
             'sold_date': datetime.fromisoformat(raw_data.get('sold_date', datetime.now().isoformat())),
             'designer': raw_data.get('designer_names', ['Unknown'])[0],
             'size': str(raw_data.get('size', 'Unknown')),
-            'condition': raw_data.get('condition', 'Unknown'),
+            'condition': canonical_condition(raw_data.get('condition') or 'Unknown'),
             'url': f"https://www.grailed.com/listings/{raw_data.get('id')}",
             'location': raw_data.get('location'),
             'seller': raw_data.get('seller', {}).get('username'),
@@ -34,5 +35,5 @@ def process_raw_listing(raw_data: Dict[str, Any]) -> Optional[Sale]:
 
         return Sale(**sale_data)
     except Exception as e:
-        logger.error(f"Error processing raw listing: {str(e)}")
+        logger.error("Error processing raw listing: %s", e)
         return None
\ No newline at end of file
@@ -0,0 +1,215 @@
+# TheWatch/data/sellers.py
+import heapq
+import math
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from TheWatch.core.models import Sale
+from TheWatch.data.store import SalesStore
+from TheWatch.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Width of a price histogram bucket; median prices are exact to about 1%
+PRICE_BUCKET_RATIO = 1.02
+_LOG_RATIO = math.log(PRICE_BUCKET_RATIO)
+_MIN_PRICE = 0.01
+_NO_SELLER = {'', 'unknown'}
+
+SORT_KEYS = ('volume', 'discount', 'recent')
+
+
+def _price_bucket(price: float) -> int:
+    return math.floor(math.log(max(price, _MIN_PRICE)) / _LOG_RATIO)
+
+
+def _discount_bucket(sale: Sale) -> int:
+    # Whole percent off the original price, 0 when not discounted
+    if sale.original_price > sale.price > 0:
+        off = (sale.original_price - sale.price) / sale.original_price
+        return min(100, round(off * 100))
+    return 0
+
+
+@dataclass
+class SellerStats:
+    """What one seller's stored listings add up to"""
+    seller: str
+    listings: int
+    total_value: float
+    average_price: float
+    median_price: float
+    typical_discount: float  # Median percent off the original price
+    last_active: Optional[datetime]
+
+
+@dataclass
+class _SellerState:
+    name: str
+    listings: int = 0
+    total_value: float = 0.0
+    prices: Dict[int, int] = field(default_factory=dict)
+    discounts: List[int] = field(default_factory=lambda: [0] * 101)
+    last_active: Optional[datetime] = None
+
+    def median_price(self) -> float:
+        rank, seen = (self.listings + 1) // 2, 0
+        for bucket in sorted(self.prices):
+            seen += self.prices[bucket]
+            if seen >= rank:
+                # Geometric midpoint of the bucket
+                return round(PRICE_BUCKET_RATIO ** (bucket + 0.5), 2)
+        return 0.0
+
+    def typical_discount(self) -> float:
+        rank, seen = (self.listings + 1) // 2, 0
+        for percent, count in enumerate(self.discounts):
+            seen += count
+            if seen >= rank:
+                return float(percent)
+        return 0.0
+
+    def stats(self) -> SellerStats:
+        return SellerStats(
+            seller=self.name,
+            listings=self.listings,
+            total_value=round(self.total_value, 2),
+            average_price=round(self.total_value / self.listings, 2),
+            median_price=self.median_price(),
+            typical_discount=self.typical_discount(),
+            last_active=self.last_active
+        )
+
+
+class SellerIndex:
+    """Volume, median price, typical discount and recency per seller, kept current as
+    listings arrive.
+
+    Each listing adds one to its seller's count, one to a bucket of a
+    log-scale price histogram and one to a whole-percent discount histogram,
+    so ingesting or re-ingesting a listing costs O(1): a listing seen before
+    first has its previous contribution taken back. Medians are read off the
+    histograms when stats are requested. With a store, `refresh` folds in
+    rows written since the previous refresh, in batches, as AnalyticsIndex does.
+    """
+
+    REFRESH_BATCH = 1000
+
+    def __init__(
+            self, store: Optional[SalesStore] = None, min_refresh_interval: float = 1.0
+    ):
+        self.store = store
+        self.min_refresh_interval = min_refresh_interval
+        self._lock = threading.RLock()
+        self._sellers: Dict[str, _SellerState] = {}
+        # id -> (seller key, price, buckets)
+        self._known: Dict[int, Tuple[str, float, int, int]] = {}
+        self._watermark = 0  # Highest store change sequence number folded in
+        self._refreshed_at = float('-inf')
+
+    def __len__(self) -> int:
+        return len(self._sellers)
+
+    def _retract(self, sale_id: int) -> None:
+        key, price, price_bucket, discount = self._known.pop(sale_id)
+        state = self._sellers[key]
+        state.listings -= 1
+        state.total_value -= price
+        state.prices[price_bucket] -= 1
+        if not state.prices[price_bucket]:
+            del state.prices[price_bucket]
+        state.discounts[discount] -= 1
+        if not state.listings:
+            del self._sellers[key]
+
+    def add(self, sale: Sale) -> bool:
+        """Count `sale` under its seller, replacing an earlier version of it; False
+        without a seller
+        """
+        with self._lock:
+            if sale.id is not None and sale.id in self._known:
+                self._retract(sale.id)
+            name = (sale.seller or '').strip()
+            key = name.lower()
+            if key in _NO_SELLER:
+                return False
+            state = self._sellers.get(key)
+            if state is None:
+                state = self._sellers[key] = _SellerState(name)
+            price_bucket, discount = _price_bucket(sale.price), _discount_bucket(sale)
+            state.listings += 1
+            state.total_value += sale.price
+            state.prices[price_bucket] = state.prices.get(price_bucket, 0) + 1
+            state.discounts[discount] += 1
+            active = sale.sold_date or sale.created_at
+            if active is not None and (
+                    state.last_active is None or active > state.last_active):
+                state.last_active = active
+            if sale.id is not None:
+                self._known[sale.id] = (key, sale.price, price_bucket, discount)
+            return True
+
+    def refresh(self, force: bool = False) -> int:
+        """Fold in store rows written since the last refresh; returns the rows read"""
+        if self.store is None:
+            return 0
+        with self._lock:
+            now = time.monotonic()
+            if not force and now - self._refreshed_at < self.min_refresh_interval:
+                return 0
+            self._refreshed_at = now
+        read = 0
+        while True:
+            with self._lock:
+                rows = self.store.changed_since(self._watermark, self.REFRESH_BATCH)
+                for sale, seq, _ in rows:
+                    self._watermark = max(self._watermark, seq)
+                    self.add(sale)
+            read += len(rows)
+            if len(rows) < self.REFRESH_BATCH:
+                return read
+
+    def get(self, seller: str) -> Optional[SellerStats]:
+        """Stats of one seller (case-insensitive), or None when none of their listings
+        are known
+        """
+        self.refresh()
+        with self._lock:
+            state = self._sellers.get(seller.strip().lower())
+            return state.stats() if state else None
+
+    def top(
+            self, n: int = 10, by: str = 'volume', min_listings: int = 1
+    ) -> List[SellerStats]:
+        """The `n` sellers with the most listings, deepest typical discount or latest
+        activity
+        """
+        if by not in SORT_KEYS:
+            raise ValueError(
+                f"Unknown sort {by!r}; expected one of {', '.join(SORT_KEYS)}"
+            )
+        self.refresh()
+        with self._lock:
+            candidates = [
+                s for s in self._sellers.values() if s.listings >= min_listings
+            ]
+            if by == 'volume':
+                chosen = heapq.nlargest(
+                    n, candidates, key=lambda s: (s.listings, s.total_value)
+                )
+            elif by == 'discount':
+                chosen = heapq.nlargest(
+                    n, candidates, key=lambda s: (s.typical_discount(), s.listings)
+                )
+            else:
+                chosen = heapq.nlargest(
+                    n, candidates,
+                    key=lambda s: (s.last_active or datetime.min, s.listings)
+                )
+            return [s.stats() for s in chosen]
+
+
+__all__ = ['SellerIndex', 'SellerStats']
\ No newline at end of file
@@ -0,0 +1,395 @@
+# TheWatch/data/store.py
+import base64
+import json
+import sqlite3
+import time
+from dataclasses import asdict
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from TheWatch.core.models import Sale
+from TheWatch.utils.logger import setup_logger
+from TheWatch.utils.normalize import canonical_condition, canonical_size, size_labels
+
+logger = setup_logger(__name__)
+
+_DATETIME_FIELDS = ('created_at', 'sold_date', 'enriched_at')
+# Filled in from listing details; a write without details keeps the stored values
+_DETAIL_FIELDS = (
+    'description', 'photos', 'category', 'tags', 'measurements', 'seller_stats'
+)
+# Stay under SQLite's default bound-parameter limit
+_ID_CHUNK = 500
+
+# Position after the last row of a browse page: (sold_date, id)
+BrowseKey = Tuple[str, int]
+
+
+def sale_to_dict(sale: Sale) -> Dict[str, Any]:
+    """Convert a sale to a JSON-serialisable dict (raw payload excluded)"""
+    data = asdict(sale)
+    data.pop('raw_data', None)
+    for name in _DATETIME_FIELDS:
+        if data[name] is not None:
+            data[name] = data[name].isoformat()
+    return data
+
+
+def sale_from_dict(data: Dict[str, Any]) -> Sale:
+    """Rebuild a sale from `sale_to_dict` output"""
+    data = dict(data)
+    for name in _DATETIME_FIELDS:
+        if data.get(name):
+            data[name] = datetime.fromisoformat(data[name])
+    return Sale(**data)
+
+
+def query_key(query: str) -> str:
+    """Normalized form a search query is recorded under"""
+    return ' '.join(query.lower().split())
+
+
+def encode_cursor(key: BrowseKey) -> str:
+    """Opaque cursor for a browse position"""
+    encoded = base64.urlsafe_b64encode(json.dumps(list(key)).encode('utf-8'))
+    return encoded.decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: str) -> BrowseKey:
+    """Browse position of a cursor; ValueError when it is malformed"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        sold_date, sale_id = json.loads(base64.urlsafe_b64decode(padded))
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
+    if not isinstance(sold_date, str) or not isinstance(sale_id, int):
+        raise ValueError(f"Invalid cursor: {cursor!r}")
+    return sold_date, sale_id
+
+
+class SalesStore:
+    """SQLite-backed store of collected listings, keyed by listing ID"""
+
+    def __init__(self, path: str = "data/sales.db"):
+        self.path = path
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        # Web handlers reach the store from the event loop's thread, not the one that
+        # opened it
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self._create_schema()
+
+    def _create_schema(self) -> None:
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS sales (
+                id INTEGER PRIMARY KEY,
+                designer TEXT,
+                size TEXT,
+                condition TEXT,
+                price REAL,
+                sold_date TEXT,
+                data TEXT NOT NULL,
+                updated_at TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS listing_details (
+                id INTEGER PRIMARY KEY,
+                payload TEXT NOT NULL,
+                fetched_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS sale_queries (
+                query TEXT NOT NULL,
+                id INTEGER NOT NULL,
+                PRIMARY KEY (query, id)
+            );
+            CREATE INDEX IF NOT EXISTS sale_queries_by_id ON sale_queries(id);
+            CREATE INDEX IF NOT EXISTS sales_by_update ON sales(updated_at);
+        """)
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(sales)")}
+        if 'size_label' not in columns:
+            # Stores written before size canonicalization: derive the column once
+            with self.conn:
+                self.conn.execute("ALTER TABLE sales ADD COLUMN size_label TEXT")
+                self.conn.executemany(
+                    "UPDATE sales SET size_label = ? WHERE id = ?",
+                    [
+                        (canonical_size(str(data.get('size')), data.get('category')),
+                         sale_id)
+                        for sale_id, data in (
+                            (i, json.loads(d))
+                            for i, d in self.conn.execute("SELECT id, data FROM sales")
+                        )
+                    ]
+                )
+            columns.add('size_label')
+        if 'change_seq' not in columns:
+            # Stores written before change sequences: number the rows in the order
+            # they were written
+            with self.conn:
+                self.conn.execute("ALTER TABLE sales ADD COLUMN change_seq INTEGER")
+                self.conn.executemany(
+                    "UPDATE sales SET change_seq = ? WHERE id = ?",
+                    [
+                        (seq, sale_id) for seq, (sale_id,) in enumerate(
+                            self.conn.execute(
+                                "SELECT id FROM sales ORDER BY updated_at, id"
+                            ).fetchall(),
+                            start=1
+                        )
+                    ]
+                )
+        # Browse pages walk these newest first and seek past the cursor
+        self.conn.executescript("""
+            CREATE INDEX IF NOT EXISTS sales_by_date ON sales(sold_date, id);
+            CREATE INDEX IF NOT EXISTS sales_by_condition
+                ON sales(condition, sold_date, id);
+            CREATE INDEX IF NOT EXISTS sales_by_size
+                ON sales(size_label, sold_date, id);
+            CREATE UNIQUE INDEX IF NOT EXISTS sales_by_change ON sales(change_seq);
+        """)
+
+    def _select_by_ids(
+            self, sql: str, ids: Iterable[int], params: tuple = ()
+    ) -> Iterator[tuple]:
+        ids = list(ids)
+        for start in range(0, len(ids), _ID_CHUNK):
+            chunk = ids[start:start + _ID_CHUNK]
+            placeholders = ','.join('?' * len(chunk))
+            yield from self.conn.execute(sql.format(placeholders), (*params, *chunk))
+
+    @staticmethod
+    def _keep_details(data: Dict[str, Any], stored: Dict[str, Any]) -> Dict[str, Any]:
+        # An unenriched copy of an enriched listing keeps what its details added
+        if data['enriched_at'] or not stored.get('enriched_at'):
+            return data
+        kept = {'enriched_at': stored['enriched_at']}
+        for name in _DETAIL_FIELDS:
+            empty = not data[name] or (name == 'category' and data[name] == 'Unknown')
+            if empty and name in stored:
+                kept[name] = stored[name]
+        return {**data, **kept}
+
+    def upsert(self, sales: Iterable[Sale], query: Optional[str] = None) -> int:
+        """Insert or update sales, recording `query` as a search that found them;
+        returns how many had an ID (listings without one are skipped).
+
+        A listing stored with details keeps them when written again without,
+        and a listing whose data and queries are unchanged is not rewritten,
+        so it keeps its change sequence number.
+        """
+        batch = {sale.id: sale for sale in sales if sale.id is not None}
+        key = query_key(query) if query else None
+        now = datetime.now().isoformat()
+        with self.conn:
+            # Change sequence numbers are handed out under the write lock, so they
+            # follow commit order
+            self.conn.execute("BEGIN IMMEDIATE")
+            stored = dict(self._select_by_ids(
+                "SELECT id, data FROM sales WHERE id IN ({})", batch
+            ))
+            tagged = set()
+            if key:
+                tagged = {sale_id for (sale_id,) in self._select_by_ids(
+                    "SELECT id FROM sale_queries WHERE query = ? AND id IN ({})",
+                    batch, (key,)
+                )}
+            last = self.conn.execute(
+                "SELECT COALESCE(MAX(change_seq), 0) FROM sales"
+            ).fetchone()[0]
+            rows = []
+            for sale_id, sale in batch.items():
+                data = sale_to_dict(sale)
+                if sale_id in stored:
+                    data = self._keep_details(data, json.loads(stored[sale_id]))
+                payload = json.dumps(data)
+                if payload == stored.get(sale_id) and (not key or sale_id in tagged):
+                    continue
+                rows.append((
+                    sale_id, sale.designer, sale.size,
+                    canonical_size(str(sale.size), data['category']),
+                    sale.condition, sale.price, sale.sold_date.isoformat(), payload,
+                    now, last + len(rows) + 1
+                ))
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO sales "
+                "(id, designer, size, size_label, condition, price, sold_date, data, "
+                "updated_at, change_seq) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+            if key:
+                self.conn.executemany(
+                    "INSERT OR IGNORE INTO sale_queries (query, id) VALUES (?, ?)",
+                    [(key, row[0]) for row in rows]
+                )
+        return len(batch)
+
+    def changed_since(
+            self, after: int = 0, limit: Optional[int] = None
+    ) -> List[Tuple[Sale, int, List[str]]]:
+        """Sales written after change sequence number `after`, in write order, with
+        each one's sequence number and every query that found it; at most `limit`.
+
+        Numbers are assigned inside the write transaction, so a reader that
+        passes back the highest number it has seen never skips a later
+        commit, whatever the writers' clocks say. With a `limit` the read
+        seeks on the change sequence index and stops there, so a large
+        backlog can be taken in batches.
+        """
+        rows = self.conn.execute("""
+            SELECT s.data, s.change_seq, (
+                SELECT GROUP_CONCAT(q.query, char(31))
+                FROM sale_queries q WHERE q.id = s.id
+            )
+            FROM sales s
+            WHERE s.change_seq > ?
+            ORDER BY s.change_seq LIMIT ?
+        """, (after, -1 if limit is None else limit))
+        return [
+            (
+                sale_from_dict(json.loads(data)),
+                seq,
+                queries.split('\x1f') if queries else [],
+            )
+            for data, seq, queries in rows
+        ]
+
+    def sales_for(
+            self, designer: Optional[str] = None, query: Optional[str] = None
+    ) -> Iterator[Sale]:
+        """Every stored sale by `designer` (case-insensitive) or found by `query`"""
+        if query is not None:
+            rows = self.conn.execute(
+                "SELECT s.data FROM sale_queries q JOIN sales s ON s.id = q.id "
+                "WHERE q.query = ?",
+                (query_key(query),)
+            )
+        elif designer is not None:
+            rows = self.conn.execute(
+                "SELECT data FROM sales WHERE designer = ? COLLATE NOCASE", (designer,)
+            )
+        else:
+            rows = self.conn.execute("SELECT data FROM sales")
+        for (data,) in rows:
+            yield sale_from_dict(json.loads(data))
+
+    def get(self, sale_id: int) -> Optional[Sale]:
+        row = self.conn.execute(
+            "SELECT data FROM sales WHERE id = ?", (sale_id,)
+        ).fetchone()
+        return sale_from_dict(json.loads(row[0])) if row else None
+
+    def __iter__(self) -> Iterator[Sale]:
+        for (data,) in self.conn.execute("SELECT data FROM sales ORDER BY id"):
+            yield sale_from_dict(json.loads(data))
+
+    def all(self) -> List[Sale]:
+        return list(self)
+
+    def count(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM sales").fetchone()[0]
+
+    def browse(
+            self,
+            designer: Optional[str] = None,
+            size: Optional[str] = None,
+            condition: Optional[str] = None,
+            min_price: Optional[float] = None,
+            max_price: Optional[float] = None,
+            since: Optional[datetime] = None,
+            until: Optional[datetime] = None,
+            after: Optional[BrowseKey] = None,
+            limit: int = 50
+    ) -> Tuple[List[Sale], Optional[BrowseKey]]:
+        """One page of stored sales, newest first, and the `after` key for the next.
+
+        Pages seek past the previous page's last (sold_date, id) on an index
+        instead of skipping rows, so every page costs the same. `designer`
+        is a case-insensitive substring; `size` matches its canonical label in
+        any size system (a bare "10" finds US 10 shoes, "48" finds M tailoring) and
+        `condition` its canonical slug; dates bound `sold_date` as [since, until).
+        """
+        clauses, params = [], []
+        if designer:
+            clauses.append("designer LIKE ? ESCAPE '\\'")
+            escaped = (designer.replace('\\', '\\\\')
+                       .replace('%', '\\%').replace('_', '\\_'))
+            params.append('%' + escaped + '%')
+        if size:
+            labels = size_labels(size)
+            clauses.append(f"size_label IN ({', '.join('?' * len(labels))})")
+            params.extend(labels)
+        if condition:
+            clauses.append("condition = ?")
+            params.append(canonical_condition(condition))
+        if min_price is not None:
+            clauses.append("price >= ?")
+            params.append(min_price)
+        if max_price is not None:
+            clauses.append("price <= ?")
+            params.append(max_price)
+        if since is not None:
+            clauses.append("sold_date >= ?")
+            params.append(since.isoformat())
+        if until is not None:
+            clauses.append("sold_date < ?")
+            params.append(until.isoformat())
+        if after is not None:
+            clauses.append("(sold_date, id) < (?, ?)")
+            params.extend(after)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        rows = self.conn.execute(
+            f"SELECT id, sold_date, data FROM sales {where} "
+            "ORDER BY sold_date DESC, id DESC LIMIT ?",
+            (*params, limit + 1)
+        ).fetchall()
+        sales = [sale_from_dict(json.loads(data)) for _, _, data in rows[:limit]]
+        next_key = (
+            (rows[limit - 1][1], rows[limit - 1][0]) if len(rows) > limit else None
+        )
+        return sales, next_key
+
+    def detail_times(self, ids: Iterable[int]) -> Dict[int, float]:
+        """When each listing's details were fetched (epoch seconds), keyed by ID"""
+        return dict(self._select_by_ids(
+            "SELECT id, fetched_at FROM listing_details WHERE id IN ({})", ids
+        ))
+
+    def get_details(
+            self, ids: Iterable[int]
+    ) -> Dict[int, Tuple[Dict[str, Any], float]]:
+        """Cached detail payloads and their fetch times, keyed by listing ID"""
+        return {
+            sale_id: (json.loads(payload), fetched_at)
+            for sale_id, payload, fetched_at in self._select_by_ids(
+                "SELECT id, payload, fetched_at FROM listing_details WHERE id IN ({})",
+                ids,
+            )
+        }
+
+    def put_details(
+            self,
+            payloads: Dict[int, Dict[str, Any]],
+            fetched_at: Optional[float] = None,
+    ) -> None:
+        fetched_at = time.time() if fetched_at is None else fetched_at
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO listing_details (id, payload, fetched_at) "
+                "VALUES (?, ?, ?)",
+                [
+                    (sale_id, json.dumps(payload), fetched_at)
+                    for sale_id, payload in payloads.items()
+                ],
+            )
+
+    def close(self) -> None:
+        self.conn.close()
+
+
+__all__ = [
+    'SalesStore', 'sale_to_dict', 'sale_from_dict',
+    'query_key', 'encode_cursor', 'decode_cursor'
+]
\ No newline at end of file
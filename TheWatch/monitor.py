@@ -1,5 +1,4 @@
 #!/usr/bin/env python3
-import asyncio
 from TheWatch.ui.cli import main
 
 if __name__ == "__main__":
@@ -0,0 +1,5 @@
+# TheWatch/replay/__init__.py
+"""Local Grailed stand-in used by the benchmarks, load tests and test suite"""
+from TheWatch.replay.server import ReplayServer, ReplayStats, make_png
+
+__all__ = ['ReplayServer', 'ReplayStats', 'make_png']
\ No newline at end of file
@@ -0,0 +1,241 @@
+# TheWatch/replay/server.py
+"""Local stand-in for grailed.com that replays recorded responses"""
+import asyncio
+import copy
+import json
+import struct
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from aiohttp import web
+
+FIXTURES_DIR = Path(__file__).parent
+
+
+def make_png(width: int, height: int, rgb: tuple) -> bytes:
+    """Encode a solid-colour RGB PNG without needing Pillow"""
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        checksum = struct.pack(">I", zlib.crc32(kind + data))
+        return struct.pack(">I", len(data)) + kind + data + checksum
+
+    row = b"\x00" + bytes(rgb) * width
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+        + chunk(b"IDAT", zlib.compress(row * height))
+        + chunk(b"IEND", b"")
+    )
+
+
+@dataclass
+class ReplayStats:
+    requests: int = 0
+    throttled: int = 0
+    goods_pages: int = 0
+    details: int = 0
+    images: int = 0
+    bytes_sent: int = 0
+    warmups: int = 0
+    rejected: int = 0
+
+
+class ReplayServer:
+    """Serves recorded `/shop` HTML, goods and listing-detail JSON on localhost.
+
+    Args:
+        pages: Number of non-empty goods pages per query; later pages are empty
+        per_page: Listings per goods page, cycled from the recorded listings
+        latency: Seconds to wait before answering each request
+        throttle_every: Answer every Nth request with a 429 (0 disables)
+        retry_after: Retry-After value sent with injected 429s
+        catalog_size: When set, each query has a catalog of this many listings that
+            goods requests can narrow with `category`, `size`, `price_min` (inclusive)
+            and `price_max` (exclusive); `pages` then acts as the pagination cap
+        require_session: Answer 403 unless the request carries a session cookie
+            handed out by the homepage; `expire_sessions` revokes them all
+    """
+
+    CATEGORIES = ("tops", "bottoms", "outerwear", "footwear", "accessories")
+
+    def __init__(
+            self,
+            pages: int = 3,
+            per_page: int = 40,
+            latency: float = 0.0,
+            throttle_every: int = 0,
+            retry_after: int = 0,
+            catalog_size: int = 0,
+            require_session: bool = False,
+            fixtures_dir: Path = FIXTURES_DIR
+    ):
+        self.pages = pages
+        self.per_page = per_page
+        self.latency = latency
+        self.throttle_every = throttle_every
+        self.retry_after = retry_after
+        self.catalog_size = catalog_size
+        self.require_session = require_session
+        self._sessions: set = set()
+        self._catalogs: Dict[str, List[Dict]] = {}
+        self.stats = ReplayStats()
+
+        self.shop_template = (fixtures_dir / "shop.html").read_text(encoding="utf-8")
+        self.recorded_listings: List[Dict] = json.loads(
+            (fixtures_dir / "goods.json").read_text(encoding="utf-8")
+        )["listings"]
+
+        self.app = web.Application(middlewares=[self._middleware])
+        self.app.router.add_get("/", self._home)
+        self.app.router.add_get("/shop/{query}", self._shop)
+        self.app.router.add_get("/api/listings/{id:\\d+}", self._details)
+        self.app.router.add_get("/api/{path:.+}/goods", self._goods)
+        self.app.router.add_get("/images/{name}", self._image)
+        self._runner: Optional[web.AppRunner] = None
+        self.url = ""
+
+    @web.middleware
+    async def _middleware(self, request: web.Request, handler):
+        self.stats.requests += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if self.throttle_every and self.stats.requests % self.throttle_every == 0:
+            self.stats.throttled += 1
+            return web.Response(
+                status=429, headers={"Retry-After": str(self.retry_after)}
+            )
+        if (self.require_session and request.path != "/"
+                and request.cookies.get("grailed_session") not in self._sessions):
+            self.stats.rejected += 1
+            return web.Response(status=403, text="Forbidden")
+        response = await handler(request)
+        if response.body is not None:
+            self.stats.bytes_sent += len(response.body)
+        return response
+
+    async def _home(self, request: web.Request) -> web.Response:
+        self.stats.warmups += 1
+        response = web.Response(text="<html><body>Grailed</body></html>",
+                                content_type="text/html")
+        token = f"s{self.stats.warmups}"
+        self._sessions.add(token)
+        response.set_cookie("grailed_session", token, max_age=3600)
+        return response
+
+    def expire_sessions(self) -> None:
+        self._sessions.clear()
+
+    async def _shop(self, request: web.Request) -> web.Response:
+        query = request.match_info["query"].replace("+", " ")
+        slug = f"{zlib.crc32(query.encode()):08x}"
+        html = self.shop_template.format(query=query, slug=slug)
+        return web.Response(text=html, content_type="text/html")
+
+    def goods_page(self, path: str, page: int) -> List[Dict]:
+        """Build the listings for one page; IDs are stable per (path, page, index)"""
+        if page < 1 or page > self.pages:
+            return []
+        base_id = (
+            (zlib.crc32(path.encode()) % 10_000) * 1_000_000
+            + (page - 1) * self.per_page
+        )
+        listings = []
+        for i in range(self.per_page):
+            recorded = self.recorded_listings[i % len(self.recorded_listings)]
+            listing = copy.deepcopy(recorded)
+            listing["id"] = base_id + i
+            listings.append(listing)
+        return listings
+
+    def catalog(self, path: str) -> List[Dict]:
+        """Every listing of a query in catalog mode, with varied categories and prices
+        """
+        if path not in self._catalogs:
+            base_id = (zlib.crc32(path.encode()) % 10_000) * 1_000_000
+            catalog = []
+            for i in range(self.catalog_size):
+                listing = copy.deepcopy(
+                    self.recorded_listings[i % len(self.recorded_listings)]
+                )
+                listing["id"] = base_id + i
+                listing["category"] = self.CATEGORIES[(i * 7) % len(self.CATEGORIES)]
+                # Skewed like real prices: mostly cheap, a long expensive tail
+                listing["price"] = round(20 + ((i * 7919) % 1000) ** 2 / 400, 2)
+                listing["original_price"] = listing["price"]
+                catalog.append(listing)
+            self._catalogs[path] = catalog
+        return self._catalogs[path]
+
+    def _catalog_page(self, path: str, page: int, query) -> Dict:
+        listings = self.catalog(path)
+        if "category" in query:
+            listings = [row for row in listings if row["category"] == query["category"]]
+        if "size" in query:
+            listings = [row for row in listings if row["size"] == query["size"]]
+        if "price_min" in query:
+            low = float(query["price_min"])
+            listings = [row for row in listings if row["price"] >= low]
+        if "price_max" in query:
+            high = float(query["price_max"])
+            listings = [row for row in listings if row["price"] < high]
+        start = (page - 1) * self.per_page
+        page_listings = (
+            listings[start:start + self.per_page] if 1 <= page <= self.pages else []
+        )
+        return {
+            "listings": page_listings,
+            "metadata": {"page": page, "total": len(listings)},
+        }
+
+    async def _goods(self, request: web.Request) -> web.Response:
+        self.stats.goods_pages += 1
+        page = int(request.query.get("page", 1))
+        if self.catalog_size:
+            return web.json_response(
+                self._catalog_page(request.match_info["path"], page, request.query)
+            )
+        listings = self.goods_page(request.match_info["path"], page)
+        return web.json_response({"listings": listings, "metadata": {"page": page}})
+
+    async def _details(self, request: web.Request) -> web.Response:
+        """Listing detail: the recorded listing plus measurements and seller stats"""
+        self.stats.details += 1
+        listing_id = int(request.match_info["id"])
+        listing = copy.deepcopy(
+            self.recorded_listings[listing_id % len(self.recorded_listings)]
+        )
+        listing["id"] = listing_id
+        listing["measurements"] = {"chest": 22 + listing_id % 4, "length": 28}
+        listing["seller"]["listings_count"] = 3 + listing_id % 7
+        listing["hashtags"] = ["archive"]
+        return web.json_response({"data": listing})
+
+    async def _image(self, request: web.Request) -> web.Response:
+        """Photo CDN stand-in: a fixed PNG per name ("same-*" names share one image)"""
+        self.stats.images += 1
+        name = request.match_info["name"]
+        seed = zlib.crc32(b"same" if name.startswith("same-") else name.encode())
+        colour = (seed & 0xFF, (seed >> 8) & 0xFF, (seed >> 16) & 0xFF)
+        return web.Response(body=make_png(64, 48, colour), content_type="image/png")
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        self._runner = web.AppRunner(self.app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        bound_port = site._server.sockets[0].getsockname()[1]
+        self.url = f"http://{host}:{bound_port}"
+        return self.url
+
+    async def stop(self) -> None:
+        if self._runner:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def __aenter__(self) -> "ReplayServer":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.stop()
\ No newline at end of file
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""End-to-end throughput benchmark: search -> normalize -> store -> export.
+
+Runs the real scraper against the local replay server so numbers are
+comparable between commits without touching grailed.com.
+"""
+import argparse
+import asyncio
+import json
+import math
+import tempfile
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+import sys
+
+# Add the project root to the Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root.parent))
+
+from TheWatch.core.pipeline import Pipeline
+from TheWatch.core.scraper import GrailedScraper, normalize_listing
+from TheWatch.data.exporters import SalesExporter
+from TheWatch.data.store import SalesStore
+from TheWatch.replay import ReplayServer
+
+STAGES = ('search', 'normalize', 'store', 'export')
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile; 0.0 for an empty sample"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+@dataclass
+class BenchmarkReport:
+    queries: int
+    pages: int
+    listings: int
+    elapsed: float
+    throttled: int
+    timings: Dict[str, List[float]] = field(default_factory=dict)
+
+    @property
+    def listings_per_sec(self) -> float:
+        return self.listings / self.elapsed if self.elapsed else 0.0
+
+    def summary(self) -> Dict:
+        return {
+            'queries': self.queries,
+            'pages': self.pages,
+            'listings': self.listings,
+            'elapsed_s': round(self.elapsed, 4),
+            'listings_per_sec': round(self.listings_per_sec, 1),
+            'throttled': self.throttled,
+            'stages': {
+                stage: {
+                    'count': len(values),
+                    'p50_ms': round(percentile(values, 50) * 1000, 3),
+                    'p99_ms': round(percentile(values, 99) * 1000, 3),
+                }
+                for stage, values in self.timings.items()
+            }
+        }
+
+
+async def _crawl_query(
+        scraper: GrailedScraper,
+        store: SalesStore,
+        query: str,
+        pages: int,
+        timings: Dict[str, List[float]]
+) -> List:
+    collected = []
+    url = await scraper.get_search_url(query)
+    if not url:
+        return collected
+
+    for page in range(1, pages + 1):
+        started = time.perf_counter()
+        raw_listings = await scraper.get_listings_page(url, page) or []
+        fetched = time.perf_counter()
+        sales = [sale for sale in map(normalize_listing, raw_listings) if sale]
+        normalized = time.perf_counter()
+        store.upsert(sales)
+        stored = time.perf_counter()
+
+        timings['search'].append(fetched - started)
+        timings['normalize'].append(normalized - fetched)
+        timings['store'].append(stored - normalized)
+        collected.extend(sales)
+    return collected
+
+
+async def run_benchmark(
+        queries: int = 8,
+        pages: int = 5,
+        per_page: int = 40,
+        latency: float = 0.0,
+        throttle_every: int = 0,
+        output_dir: Optional[str] = None
+) -> BenchmarkReport:
+    """Crawl `queries` synthetic queries of `pages` pages each and time every stage"""
+    timings: Dict[str, List[float]] = {stage: [] for stage in STAGES}
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(output_dir or tmp)
+        async with ReplayServer(
+                pages=pages, per_page=per_page, latency=latency,
+                throttle_every=throttle_every
+        ) as server:
+            scraper = GrailedScraper(base_url=server.url)
+            store = SalesStore(str(workdir / "bench.db"))
+            exporter = SalesExporter(output_dir=str(workdir / "exports"))
+            try:
+                started = time.perf_counter()
+                results = await asyncio.gather(*(
+                    _crawl_query(scraper, store, f"benchmark query {i}", pages, timings)
+                    for i in range(queries)
+                ))
+                sales = [sale for batch in results for sale in batch]
+
+                export_started = time.perf_counter()
+                exporter.export_csv(sales, "benchmark")
+                timings['export'].append(time.perf_counter() - export_started)
+                elapsed = time.perf_counter() - started
+            finally:
+                await scraper.close()
+                store.close()
+
+            return BenchmarkReport(
+                queries=queries,
+                pages=len(timings['search']),
+                listings=len(sales),
+                elapsed=elapsed,
+                throttled=server.stats.throttled,
+                timings=timings
+            )
+
+
+async def run_pipeline_benchmark(
+        queries: int = 8,
+        pages: int = 5,
+        per_page: int = 40,
+        latency: float = 0.0,
+        fetch_concurrency: int = 4,
+        parse_workers: int = 2,
+        queue_size: int = 8,
+        processes: bool = False
+) -> Dict:
+    """The same workload through the staged pipeline; returns per-stage stats"""
+    with tempfile.TemporaryDirectory() as tmp:
+        replay = ReplayServer(pages=pages, per_page=per_page, latency=latency)
+        async with replay as server:
+            scraper = GrailedScraper(base_url=server.url)
+            store = SalesStore(str(Path(tmp) / "bench.db"))
+            pipeline = Pipeline(
+                scraper, store, SalesExporter(output_dir=str(Path(tmp) / "exports")),
+                fetch_concurrency=fetch_concurrency, parse_workers=parse_workers,
+                queue_size=queue_size, max_pages=pages, processes=processes
+            )
+            try:
+                result = await pipeline.run(
+                    [f"benchmark query {i}" for i in range(queries)], "benchmark"
+                )
+            finally:
+                await scraper.close()
+                store.close()
+    return {
+        'listings': len(result.sales),
+        'elapsed_s': round(result.elapsed, 4),
+        'listings_per_sec': (
+            round(len(result.sales) / result.elapsed, 1) if result.elapsed else 0.0
+        ),
+        'bottleneck': result.bottleneck,
+        'stages': result.summary()
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark the scrape pipeline against the replay server"
+    )
+    parser.add_argument("--queries", type=int, default=8)
+    parser.add_argument("--pages", type=int, default=5)
+    parser.add_argument("--per-page", type=int, default=40)
+    parser.add_argument("--latency", type=float, default=0.0,
+                        help="Simulated upstream latency (s)")
+    parser.add_argument("--throttle-every", type=int, default=0,
+                        help="Inject a 429 every N requests")
+    parser.add_argument("--min-listings-per-sec", type=float, default=0.0,
+                        help="Exit non-zero when throughput falls below this floor")
+    parser.add_argument("--pipeline", action="store_true",
+                        help="Run the staged pipeline instead")
+    parser.add_argument("--parse-workers", type=int, default=2)
+    parser.add_argument("--queue-size", type=int, default=8)
+    parser.add_argument("--processes", action="store_true",
+                        help="Parse in worker processes, not threads")
+    args = parser.parse_args()
+
+    if args.pipeline:
+        summary = asyncio.run(run_pipeline_benchmark(
+            queries=args.queries,
+            pages=args.pages,
+            per_page=args.per_page,
+            latency=args.latency,
+            parse_workers=args.parse_workers,
+            queue_size=args.queue_size,
+            processes=args.processes
+        ))
+        print(json.dumps(summary, indent=2))
+        if summary['listings_per_sec'] < args.min_listings_per_sec:
+            sys.exit(1)
+        return
+
+    report = asyncio.run(run_benchmark(
+        queries=args.queries,
+        pages=args.pages,
+        per_page=args.per_page,
+        latency=args.latency,
+        throttle_every=args.throttle_every
+    ))
+    print(json.dumps(report.summary(), indent=2))
+
+    if report.listings_per_sec < args.min_listings_per_sec:
+        print(f"Throughput {report.listings_per_sec:.1f}/s is below the "
+              f"{args.min_listings_per_sec:.1f}/s floor")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
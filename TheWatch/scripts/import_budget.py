@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""Import-time budget for CLI startup.
+
+Runs each entry path in a fresh interpreter with `-X importtime`, sums the
+time spent importing modules beyond a bare interpreter, and checks that
+heavy optional dependencies stay unloaded.
+"""
+import argparse
+import os
+import subprocess
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+# Add the project root to the Python path
+project_root = Path(__file__).parent.parent
+
+HEAVY_MODULES = {
+    'rich', 'aiohttp', 'bs4', 'pydantic_settings', 'pydantic', 'pandas', 'openpyxl',
+    'fastapi'
+}
+
+CASES: Dict[str, List[str]] = {
+    'help': ['-m', 'TheWatch.monitor', '--help'],
+    'headless_search': ['-c', 'import TheWatch.core.scraper'],
+    # `thewatch search` with no queries loads settings, rich and the scraper, then
+    # exits before any request
+    'search': ['-m', 'TheWatch.monitor', 'search'],
+}
+
+# Modules each path must not import
+FORBIDDEN: Dict[str, Set[str]] = {
+    'help': HEAVY_MODULES,
+    'headless_search': HEAVY_MODULES - {'aiohttp'},
+    'search': HEAVY_MODULES - {'rich', 'aiohttp', 'pydantic_settings', 'pydantic'},
+}
+
+# Seconds of import time; scaled by THEWATCH_IMPORT_BUDGET_SCALE for slow machines
+BUDGETS: Dict[str, float] = {
+    'help': 0.2,
+    'headless_search': 0.5,
+    'search': 0.8,
+}
+
+
+@dataclass
+class ImportProfile:
+    seconds: float
+    modules: Set[str] = field(default_factory=set)
+
+
+def _profile(args: List[str]) -> ImportProfile:
+    env = {**os.environ, 'PYTHONPATH': str(project_root.parent)}
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', *args],
+        capture_output=True, text=True, env=env, cwd=str(project_root.parent)
+    )
+    total_us = 0
+    modules = set()
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        modules.add(name.strip())
+        # Unindented names are top-level imports; their cumulative time covers all
+        # children
+        if not name[1:].startswith(' '):
+            total_us += int(cumulative)
+    return ImportProfile(seconds=total_us / 1e6, modules=modules)
+
+
+def measure(case: str) -> ImportProfile:
+    """Import time and module set for `case`, minus what a bare interpreter imports"""
+    baseline = _profile(['-c', 'pass'])
+    profile = _profile(CASES[case])
+    return ImportProfile(
+        seconds=max(profile.seconds - baseline.seconds, 0.0),
+        modules=profile.modules - baseline.modules
+    )
+
+
+def check(
+        case: str, profile: Optional[ImportProfile] = None, timed: bool = True
+) -> List[str]:
+    """Return budget violations for `case` (empty when within budget);
+    `timed=False` skips the time budget
+    """
+    profile = profile or measure(case)
+    problems = []
+    loaded = sorted(
+        name for name in FORBIDDEN[case]
+        if name in profile.modules
+        or any(m.startswith(name + '.') for m in profile.modules)
+    )
+    if loaded:
+        problems.append(f"{case}: imports heavy modules {', '.join(loaded)}")
+
+    budget = BUDGETS[case] * float(os.environ.get('THEWATCH_IMPORT_BUDGET_SCALE', 1))
+    if timed and profile.seconds > budget:
+        problems.append(f"{case}: {profile.seconds * 1000:.0f}ms import time exceeds "
+                        f"{budget * 1000:.0f}ms budget")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check CLI import-time budgets")
+    parser.add_argument("cases", nargs="*",
+                        help=f"Paths to check: {', '.join(CASES)} (default: all)")
+    args = parser.parse_args()
+    unknown = set(args.cases) - set(CASES)
+    if unknown:
+        parser.error(f"unknown case(s): {', '.join(sorted(unknown))}")
+
+    failed = False
+    for case in args.cases or CASES:
+        profile = measure(case)
+        print(f"{case}: {profile.seconds * 1000:.0f}ms "
+              f"(budget {BUDGETS[case] * 1000:.0f}ms), "
+              f"{len(profile.modules)} modules")
+        for problem in check(case, profile):
+            print(f"  FAIL {problem}")
+            failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+"""Load test for the web API against the local replay server.
+
+Starts the replay server as the Grailed upstream, runs the FastAPI app under
+uvicorn (optionally with several workers) pointed at it, then drives
+`/api/search` with a weighted query mix from many concurrent clients.
+Results are saved as JSON so runs can be compared across releases.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import tempfile
+import time
+import uuid
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+import sys
+
+# Add the project root to the Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root.parent))
+
+import aiohttp
+
+from TheWatch.scripts.benchmark import percentile
+from TheWatch.replay import ReplayServer
+
+DEFAULT_MIX = "rick owens=5,raf simons=3,acne studios=2,margiela tabi=1"
+# Relative changes smaller than this are reported as unchanged
+COMPARE_TOLERANCE = 0.05
+
+
+def parse_mix(spec: str) -> List[Tuple[str, float]]:
+    """Parse ``query=weight,query=weight``; a query without a weight counts once"""
+    mix = []
+    for part in spec.split(','):
+        query, _, weight = part.partition('=')
+        if query.strip():
+            mix.append((query.strip(), float(weight) if weight.strip() else 1.0))
+    if not mix:
+        raise ValueError(f"Empty query mix: {spec!r}")
+    return mix
+
+
+@dataclass
+class LoadReport:
+    """Outcome of one load-test run"""
+    config: Dict
+    requests: int = 0
+    errors: int = 0
+    elapsed: float = 0.0
+    latencies: List[float] = field(default_factory=list, repr=False)
+    statuses: Dict[str, int] = field(default_factory=dict)
+    queries: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def throughput(self) -> float:
+        return self.requests / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def error_rate(self) -> float:
+        return self.errors / self.requests if self.requests else 0.0
+
+    def summary(self) -> Dict:
+        return {
+            'config': self.config,
+            'requests': self.requests,
+            'elapsed_s': round(self.elapsed, 3),
+            'throughput_rps': round(self.throughput, 1),
+            'error_rate': round(self.error_rate, 4),
+            'latency_ms': {
+                f'p{pct}': round(percentile(self.latencies, pct) * 1000, 2)
+                for pct in (50, 95, 99)
+            },
+            'statuses': self.statuses,
+            'queries': self.queries,
+        }
+
+
+async def drive(
+        api_url: str,
+        mix: List[Tuple[str, float]],
+        concurrency: int = 16,
+        duration: Optional[float] = 10.0,
+        requests: Optional[int] = None,
+        unique_ratio: float = 0.0,
+        seed: int = 0
+) -> LoadReport:
+    """Hit `api_url`/api/search from `concurrency` clients until `duration` or
+    `requests` runs out.
+
+    `unique_ratio` of the requests get a random extra term so they miss the
+    result cache and go upstream.
+    """
+    report = LoadReport(config={
+        'concurrency': concurrency, 'duration': duration, 'requests': requests,
+        'mix': dict(mix), 'unique_ratio': unique_ratio
+    })
+    rng = random.Random(seed)
+    queries, weights = zip(*mix)
+    statuses: Counter = Counter()
+    per_query: Counter = Counter()
+    issued = 0
+    started = time.perf_counter()
+    deadline = None if duration is None else started + duration
+
+    def next_query() -> Optional[str]:
+        nonlocal issued
+        if requests is not None and issued >= requests:
+            return None
+        if deadline is not None and time.perf_counter() >= deadline:
+            return None
+        issued += 1
+        query = rng.choices(queries, weights)[0]
+        per_query[query] += 1
+        if unique_ratio and rng.random() < unique_ratio:
+            query = f"{query} {uuid.uuid4().hex[:8]}"
+        return query
+
+    async def client(session: aiohttp.ClientSession) -> None:
+        while True:
+            query = next_query()
+            if query is None:
+                return
+            sent = time.perf_counter()
+            try:
+                async with session.get(f"{api_url}/api/search",
+                                       params={'query': query}) as response:
+                    await response.read()
+                    status = str(response.status)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                status = type(e).__name__
+            report.latencies.append(time.perf_counter() - sent)
+            statuses[status] += 1
+            if status != '200':
+                report.errors += 1
+
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    timeout = aiohttp.ClientTimeout(total=60)
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+        await asyncio.gather(*(client(session) for _ in range(concurrency)))
+
+    report.elapsed = time.perf_counter() - started
+    report.requests = len(report.latencies)
+    report.statuses = dict(statuses)
+    report.queries = dict(per_query)
+    return report
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+async def _wait_until_up(
+        url: str, process: subprocess.Popen, timeout: float = 30.0
+) -> None:
+    deadline = time.monotonic() + timeout
+    async with aiohttp.ClientSession() as session:
+        while time.monotonic() < deadline:
+            if process.poll() is not None:
+                raise RuntimeError(f"API server exited with code {process.returncode}")
+            try:
+                async with session.get(f"{url}/metrics") as response:
+                    if response.status == 200:
+                        return
+            except aiohttp.ClientError:
+                pass
+            await asyncio.sleep(0.1)
+    raise RuntimeError(f"API server did not start within {timeout}s")
+
+
+async def run_load_test(
+        workers: int = 1,
+        upstream_latency: float = 0.02,
+        cache_ttl: int = 300,
+        **load
+) -> LoadReport:
+    """Run the replay upstream and a uvicorn instance of the API, then `drive` it"""
+    with tempfile.TemporaryDirectory() as tmp:
+        replay = ReplayServer(pages=1, per_page=40, latency=upstream_latency)
+        async with replay as upstream:
+            port = _free_port()
+            env = {
+                **os.environ,
+                'GRAILED_BASE_URL': upstream.url,
+                'GRAILED_RESULT_CACHE_PATH': str(Path(tmp) / 'results.db'),
+                'GRAILED_RESULT_CACHE_TTL': str(cache_ttl),
+                'GRAILED_STORE_PATH': str(Path(tmp) / 'sales.db'),
+                'GRAILED_SESSION_STATE_PATH': str(Path(tmp) / 'session.json'),
+                'GRAILED_LOG_LEVEL': 'WARNING',
+            }
+            process = subprocess.Popen(
+                [sys.executable, '-m', 'uvicorn', 'TheWatch.web.app:app',
+                 '--host', '127.0.0.1', '--port', str(port), '--workers', str(workers),
+                 '--log-level', 'warning', '--no-access-log'],
+                cwd=str(project_root.parent), env=env
+            )
+            try:
+                api_url = f"http://127.0.0.1:{port}"
+                await _wait_until_up(api_url, process)
+                report = await drive(api_url, **load)
+            finally:
+                process.terminate()
+                try:
+                    process.wait(10)
+                except subprocess.TimeoutExpired:
+                    process.kill()
+            report.config.update(workers=workers, upstream_latency=upstream_latency,
+                                 cache_ttl=cache_ttl,
+                                 upstream_requests=upstream.stats.requests)
+            return report
+
+
+def save_report(report: LoadReport, directory: str) -> Path:
+    path = Path(directory)
+    path.mkdir(parents=True, exist_ok=True)
+    target = path / f"loadtest_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    with open(target, 'w', encoding='utf-8') as f:
+        json.dump(report.summary(), f, indent=2)
+    return target
+
+
+def compare(current: Dict, baseline: Dict) -> List[str]:
+    """Human-readable changes from `baseline` to `current` summaries"""
+    lines = []
+    rows = [
+        ('throughput_rps', current['throughput_rps'], baseline['throughput_rps'], True)
+    ]
+    rows += [
+        (f'latency {pct}', current['latency_ms'][pct], baseline['latency_ms'][pct],
+         False)
+        for pct in ('p50', 'p95', 'p99')
+    ]
+    rows.append(('error_rate', current['error_rate'], baseline['error_rate'], False))
+    for name, now, before, higher_is_better in rows:
+        if name == 'error_rate':
+            # Compared in points: the usual baseline is zero errors
+            change = now - before
+        elif before:
+            change = (now - before) / before
+        else:
+            change = float('inf') if now else 0.0
+        shown = f"{change * 100:+.1f} pts" if name == 'error_rate' else f"{change:+.1%}"
+        # Anything appearing where the baseline had none is a change, however small
+        if abs(change) < COMPARE_TOLERANCE and (before or not now):
+            verdict = 'unchanged'
+        else:
+            verdict = 'better' if (change > 0) == higher_is_better else 'worse'
+        lines.append(f"{name}: {before} -> {now} ({shown}, {verdict})")
+    return lines
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Load-test /api/search against the replay server"
+    )
+    parser.add_argument("--concurrency", type=int, default=16,
+                        help="Concurrent clients")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds to run")
+    parser.add_argument("--requests", type=int, default=None,
+                        help="Stop after this many requests instead")
+    parser.add_argument("--mix", default=DEFAULT_MIX,
+                        help="Weighted queries: 'query=weight,...'")
+    parser.add_argument("--unique-ratio", type=float, default=0.0,
+                        help="Share of requests made unique so they miss the result "
+                             "cache")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="uvicorn worker processes")
+    parser.add_argument("--upstream-latency", type=float, default=0.02,
+                        help="Replay server latency (s)")
+    parser.add_argument("--cache-ttl", type=int, default=300,
+                        help="Result cache TTL (0 disables hits)")
+    parser.add_argument("--output-dir", default="loadtest-results",
+                        help="Where results are saved")
+    parser.add_argument("--compare", help="Earlier results file to compare against")
+    args = parser.parse_args()
+
+    report = asyncio.run(run_load_test(
+        workers=args.workers,
+        upstream_latency=args.upstream_latency,
+        cache_ttl=args.cache_ttl,
+        mix=parse_mix(args.mix),
+        concurrency=args.concurrency,
+        duration=None if args.requests else args.duration,
+        requests=args.requests,
+        unique_ratio=args.unique_ratio
+    ))
+    summary = report.summary()
+    print(json.dumps(summary, indent=2))
+    print(f"Saved to {save_report(report, args.output_dir)}")
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+        print(f"Compared with {args.compare}:")
+        for line in compare(summary, baseline):
+            print(f"  {line}")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -1,23 +1,46 @@
 #!/usr/bin/env python3
-import asyncio
+import argparse
 from pathlib import Path
 import sys
 
 # Add the project root to the Python path
 project_root = Path(__file__).parent.parent
-sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root.parent))
 
-async def main():
+from TheWatch.core.monitor import ShardedMonitor
+
+
+def main():
     """Main entry point"""
-    # Your main logic here
-    pass
+    parser = argparse.ArgumentParser(
+        description="Poll watch queries across worker processes"
+    )
+    parser.add_argument("queries", nargs="+", help="Search terms to watch")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Worker processes (default: CPU count)")
+    parser.add_argument("--cycles", type=int, default=1, help="Polls per query")
+    parser.add_argument("--interval", type=float, default=60.0,
+                        help="Seconds between polls")
+    args = parser.parse_args()
+
+    monitor = ShardedMonitor(args.queries, workers=args.workers)
+    result = monitor.run(cycles=args.cycles, interval=args.interval)
+
+    for query, sales in result.results.items():
+        print(f"{query}: {len(sales)} listings")
+    for shard in result.health:
+        healthy = shard.alive and not shard.failed
+        status = "ok" if healthy else f"error: {shard.last_error}"
+        print(f"shard {shard.shard} (pid {shard.pid}): {shard.completed} searches, "
+              f"{shard.listings} listings, {status}")
+    print(f"{result.total_listings} listings in {result.elapsed:.1f}s")
+
 
 if __name__ == "__main__":
     try:
-        asyncio.run(main())
+        main()
     except KeyboardInterrupt:
-        print("
-Script terminated by user")
+        print("\nScript terminated by user")
     except Exception as e:
         print(f"Fatal error: {str(e)}")
-        raise
+        raise
\ No newline at end of file
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""Alert-rule matching benchmark: RuleIndex against a linear scan of every rule.
+
+Builds random single-designer rules (most with a size, condition or price
+bound too) and times matching random sales through the index and through
+`SearchFilters.matches` on each rule, checking both give the same answer.
+"""
+import argparse
+import json
+import random
+import time
+from pathlib import Path
+from typing import Dict, List
+import sys
+
+# Add the project root to the Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root.parent))
+
+from TheWatch.core.models import Sale, SearchFilters
+from TheWatch.core.rules import AlertRule, RuleIndex
+
+SIZES = [
+    "44", "46", "48", "50", "S", "M", "L", "XL", "US 9", "US 10", "US 11", "W30", "W32"
+]
+CATEGORIES = ["tops", "bottoms", "footwear", "outerwear"]
+CONDITIONS = ["is_new", "is_gently_used", "is_used", "is_very_worn"]
+
+
+def make_rules(n: int, designers: List[str], rng: random.Random) -> List[AlertRule]:
+    def maybe(value):
+        return value if rng.random() < 0.5 else None
+
+    return [
+        AlertRule(f"rule-{i}", SearchFilters(
+            designers=[rng.choice(designers)],
+            sizes=maybe([rng.choice(SIZES)]),
+            conditions=maybe(rng.sample(CONDITIONS, 2)),
+            max_price=maybe(float(rng.choice([150, 300, 400, 800])))
+        ))
+        for i in range(n)
+    ]
+
+
+def make_sales(n: int, designers: List[str], rng: random.Random) -> List[Sale]:
+    return [
+        Sale(title=f"Item {i}", price=float(rng.randint(20, 1200)),
+             original_price=1200.0, designer=rng.choice(designers),
+             size=rng.choice(SIZES), condition=rng.choice(CONDITIONS),
+             url=f"https://www.grailed.com/listings/{i}", id=i,
+             category=rng.choice(CATEGORIES))
+        for i in range(n)
+    ]
+
+
+def run_rules_benchmark(rules: int = 100_000, sales: int = 1000, linear_sales: int = 20,
+                        designers: int = 2000, seed: int = 1) -> Dict:
+    """Time indexed and linear matching; the linear scan only sees the first
+    `linear_sales` sales
+    """
+    rng = random.Random(seed)
+    names = [f"Designer {i:05d}" for i in range(designers)]
+    rule_list = make_rules(rules, names, rng)
+    sale_list = make_sales(sales, names, rng)
+
+    started = time.perf_counter()
+    index = RuleIndex(rule_list)
+    built = time.perf_counter() - started
+
+    started = time.perf_counter()
+    indexed = [index.match(sale) for sale in sale_list]
+    index_per_match = (time.perf_counter() - started) / len(sale_list)
+
+    sample = sale_list[:linear_sales]
+    started = time.perf_counter()
+    linear = [
+        [rule for rule in rule_list if rule.filters.matches(sale)] for sale in sample
+    ]
+    linear_per_match = (time.perf_counter() - started) / len(sample)
+
+    for found, expected in zip(indexed, linear):
+        if {rule.id for rule in found} != {rule.id for rule in expected}:
+            raise AssertionError("Index and linear scan disagree")
+
+    return {
+        'rules': rules,
+        'sales': sales,
+        'build_s': round(built, 3),
+        'index_us_per_match': round(index_per_match * 1e6, 1),
+        'linear_ms_per_match': round(linear_per_match * 1e3, 2),
+        'speedup': (
+            round(linear_per_match / index_per_match, 1) if index_per_match else 0.0
+        ),
+        'matches_per_sale': round(sum(map(len, indexed)) / len(sale_list), 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark alert-rule matching against a linear scan"
+    )
+    parser.add_argument("--rules", type=int, default=100_000)
+    parser.add_argument("--sales", type=int, default=1000)
+    parser.add_argument("--linear-sales", type=int, default=20,
+                        help="Sales matched by the slow linear scan")
+    parser.add_argument("--designers", type=int, default=2000,
+                        help="Distinct designers across rules and sales")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--min-speedup", type=float, default=0.0,
+                        help="Exit non-zero when the index is less than this many "
+                             "times faster")
+    args = parser.parse_args()
+
+    summary = run_rules_benchmark(args.rules, args.sales, args.linear_sales,
+                                  args.designers, args.seed)
+    print(json.dumps(summary, indent=2))
+    if summary['speedup'] < args.min_speedup:
+        print(f"Speedup {summary['speedup']}x is below the {args.min_speedup}x floor")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,39 @@
+# tests/conftest.py
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import FastAPI
+from TheWatch.core.models import Sale
+
+START = datetime(2024, 11, 1)
+
+
+@pytest.fixture
+def make_sale():
+    """Builds listing `i` at `price`, created `i` hours after START; keywords override
+    any field
+    """
+    def make(i: int, price: float = 100.0, **fields) -> Sale:
+        values = dict(title=f"Listing {i}", price=price, original_price=price,
+                      designer="Acne Studios", size="M", condition="is_used",
+                      url=f"https://www.grailed.com/listings/{i}", id=i,
+                      created_at=START + timedelta(hours=i))
+        values.update(fields)
+        return Sale(**values)
+    return make
+
+
+@pytest.fixture
+def api_app(monkeypatch):
+    """Builds an app serving just the API routes, with module state such as `_store`
+    swapped in first
+    """
+    from TheWatch.web import routes
+
+    def build(**state) -> FastAPI:
+        for name, value in state.items():
+            monkeypatch.setattr(routes, name, value)
+        app = FastAPI()
+        app.include_router(routes.router)
+        return app
+    return build
\ No newline at end of file
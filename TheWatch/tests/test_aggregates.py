@@ -0,0 +1,163 @@
+# tests/test_aggregates.py
+import json
+from dataclasses import replace
+from datetime import datetime, timedelta
+
+from fastapi.testclient import TestClient
+from TheWatch.core.models import SalesAnalytics
+from TheWatch.data import store as store_module
+from TheWatch.data.aggregates import AnalyticsIndex
+from TheWatch.data.exporters import SalesExporter
+from TheWatch.data.sellers import SellerIndex
+from TheWatch.data.store import SalesStore
+
+
+def body(rendered):
+    return json.loads(rendered[0])
+
+
+def test_scopes_match_a_full_recount(tmp_path, make_sale):
+    store = SalesStore(str(tmp_path / "sales.db"))
+    acne = [make_sale(i, 50.0 * i) for i in range(1, 8)]
+    rick = [
+        make_sale(i, 120.0 * i, designer="Rick Owens", condition="is_new")
+        for i in range(8, 12)
+    ]
+    store.upsert(acne, "acne jacket")
+    store.upsert(rick)
+    index = AnalyticsIndex(store, min_refresh_interval=0)
+
+    data = body(index.render(designer="ACNE STUDIOS"))
+    assert data["total_sales"] == 7
+    assert data["median_price"] == SalesAnalytics.from_sales(acne).median_price
+    assert body(index.render(query="Acne  Jacket"))["total_sales"] == 7
+    overall = body(index.render())
+    assert overall["total_sales"] == 11
+    assert overall["condition_distribution"] == {"Used": 7, "New": 4}
+    assert index.render(designer="nobody") is None
+    store.close()
+
+
+def test_indexes_read_the_store_in_batches(tmp_path, monkeypatch, make_sale):
+    store = SalesStore(str(tmp_path / "sales.db"))
+    store.upsert([make_sale(i, 100.0 + i, seller="big") for i in range(1, 8)], "acne")
+    assert [seq for _, seq, _ in store.changed_since(2, limit=3)] == [3, 4, 5]
+
+    limits = []
+    changed_since = store.changed_since
+
+    def counted(after=0, limit=None):
+        limits.append(limit)
+        return changed_since(after, limit)
+
+    monkeypatch.setattr(store, "changed_since", counted)
+    index = AnalyticsIndex(store, min_refresh_interval=0)
+    sellers = SellerIndex(store, min_refresh_interval=0)
+    index.REFRESH_BATCH = sellers.REFRESH_BATCH = 3
+    assert index.refresh(force=True) == 7 and limits == [3, 3, 3]
+    assert body(index.render(query="acne"))["total_sales"] == 7
+    assert sellers.refresh(force=True) == 7 and sellers.get("big").listings == 7
+    store.close()
+
+
+def test_readers_follow_commit_order_not_clocks(tmp_path, monkeypatch, make_sale):
+    path = str(tmp_path / "sales.db")
+    store = SalesStore(path)
+    store.upsert([make_sale(1, 100.0), make_sale(2, 200.0)])
+    index = AnalyticsIndex(store, min_refresh_interval=0)
+    sellers = SellerIndex(store, min_refresh_interval=0)
+    exporter = SalesExporter(output_dir=str(tmp_path / "exports"))
+    assert index.refresh(force=True) == 2 and sellers.refresh(force=True) == 2
+    exporter.export_store_delta(store, "etl")
+
+    # Another writer whose clock is an hour behind commits afterwards
+    class Behind(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return datetime.now(tz) - timedelta(hours=1)
+
+    monkeypatch.setattr(store_module, "datetime", Behind)
+    late = SalesStore(path)
+    late.upsert([replace(make_sale(3, 300.0), seller="latecomer")])
+    late.close()
+
+    assert [sale.id for sale, _, _ in store.changed_since(2)] == [3]
+    assert index.refresh(force=True) == 1
+    assert body(index.render())["total_sales"] == 3
+    assert sellers.refresh(force=True) == 1 and sellers.get("latecomer").listings == 1
+    assert exporter.export_store_delta(store, "etl") is not None
+    assert exporter.watermark("etl")["source"] == 3
+    exporter.close()
+    store.close()
+
+
+def test_existing_store_numbers_rows_in_write_order(tmp_path, make_sale):
+    path = str(tmp_path / "sales.db")
+    store = SalesStore(path)
+    store.upsert([make_sale(1, 100.0), make_sale(2, 200.0)])
+    store.conn.execute("DROP INDEX sales_by_change")
+    store.conn.execute("ALTER TABLE sales DROP COLUMN change_seq")
+    store.conn.execute("UPDATE sales SET updated_at = '2020-01-01' WHERE id = 2")
+    store.conn.commit()
+    store.close()
+
+    store = SalesStore(path)
+    assert [(sale.id, seq) for sale, seq, _ in store.changed_since()] == [
+        (2, 1), (1, 2)
+    ]
+    store.upsert([make_sale(1, 150.0)])
+    assert [(sale.id, seq) for sale, seq, _ in store.changed_since(2)] == [(1, 3)]
+    store.close()
+
+
+def test_etag_changes_only_with_the_aggregates(tmp_path, make_sale):
+    store = SalesStore(str(tmp_path / "sales.db"))
+    sales = [make_sale(i, 100.0 + i) for i in range(1, 6)]
+    store.upsert(sales, "acne")
+    index = AnalyticsIndex(store, min_refresh_interval=0)
+    _, etag = index.render(designer="acne studios")
+
+    # Re-scraping the same listings, or an edit analytics ignore, keeps the ETag
+    store.upsert(sales, "acne")
+    store.upsert([replace(sales[0], title="Renamed")])
+    assert index.render(designer="acne studios")[1] == etag
+
+    store.upsert([make_sale(6, 900.0)])
+    _, added = index.render(designer="acne studios")
+    assert added != etag
+
+    # A price change is recounted from the store
+    store.upsert([replace(sales[1], price=10.0)])
+    data = body(index.render(designer="acne studios"))
+    assert data["min_price"] == 10.0 and data["total_sales"] == 6
+    assert body(index.render(query="acne"))["min_price"] == 10.0
+
+    # A fresh index (another worker) renders the same bytes and ETag
+    rendered = index.render(designer="acne studios")
+    assert AnalyticsIndex(store).render(designer="acne studios") == rendered
+    store.close()
+
+
+def test_analytics_endpoint_revalidates(tmp_path, make_sale, api_app):
+    store = SalesStore(str(tmp_path / "sales.db"))
+    store.upsert([make_sale(i, 80.0 * i) for i in range(1, 4)], "acne")
+    index = AnalyticsIndex(store, min_refresh_interval=0)
+    client = TestClient(api_app(_analytics=index))
+
+    first = client.get("/api/analytics", params={"query": "acne"})
+    assert first.status_code == 200
+    assert first.json()["total_sales"] == 3
+    etag = first.headers["etag"]
+    assert etag.startswith('"')
+
+    cached = client.get("/api/analytics", params={"query": "acne"},
+                        headers={"If-None-Match": etag})
+    assert cached.status_code == 304 and not cached.content
+
+    store.upsert([make_sale(4, 999.0)], "acne")
+    changed = client.get("/api/analytics", params={"query": "acne"},
+                         headers={"If-None-Match": etag})
+    assert changed.status_code == 200 and changed.headers["etag"] != etag
+    missing = client.get("/api/analytics", params={"designer": "nobody"})
+    assert missing.status_code == 404
+    store.close()
\ No newline at end of file
@@ -0,0 +1,69 @@
+# tests/test_analytics.py
+import io
+import random
+import statistics
+from rich.console import Console
+from TheWatch.core.analytics import RunningMedian, SalesAccumulator, TopK, price_range
+from TheWatch.core.models import SalesAnalytics
+from TheWatch.ui.display import LiveDashboard
+
+
+def test_running_median_matches_statistics():
+    rng = random.Random(7)
+    values = [rng.uniform(10, 1000) for _ in range(501)]
+    median = RunningMedian()
+    for n, value in enumerate(values, 1):
+        median.add(value)
+        if n in (1, 2, 10, 101, 500, 501):
+            assert median.median == statistics.median(values[:n])
+
+
+def test_top_k_matches_full_sort(make_sale):
+    rng = random.Random(3)
+    sales = [make_sale(i, rng.randint(20, 900)) for i in range(300)]
+    rng.shuffle(sales)
+
+    newest, cheapest = TopK(5, "newest"), TopK(5, "cheapest")
+    newest.extend(sales)
+    cheapest.extend(sales)
+
+    assert newest.items() == sorted(sales, key=lambda s: s.sold_date, reverse=True)[:5]
+    assert [s.price for s in cheapest.items()] == sorted(s.price for s in sales)[:5]
+
+
+def test_accumulator_snapshot_matches_batch_analytics(make_sale):
+    listings = [
+        (60, "is_new"), (95, "is_used"), (120, "is_used"),
+        (310, "is_gently_used"), (1200, "is_new"),
+    ]
+    sales = [
+        make_sale(i, price, condition=cond)
+        for i, (price, cond) in enumerate(listings)
+    ]
+    accumulator = SalesAccumulator()
+    accumulator.extend(sales[:3])
+    accumulator.extend(sales)  # duplicates are ignored
+
+    snapshot = accumulator.snapshot()
+    assert snapshot == SalesAnalytics.from_sales(sales)
+    assert snapshot.total_sales == 5
+    assert snapshot.median_price == 120
+    assert snapshot.price_ranges == {
+        "Under $100": 2, "$100-$250": 1, "$250-$500": 1, "$1,000+": 1
+    }
+    assert snapshot.condition_distribution == {"New": 2, "Used": 2, "Gently Used": 1}
+    assert price_range(100) == "$100-$250"
+    assert SalesAnalytics.from_sales([]) is None
+
+
+def test_live_dashboard_renders_top_k_only(make_sale):
+    console = Console(file=io.StringIO(), width=120)
+    dashboard = LiveDashboard("acne", k=3, order="cheapest", total=2, console=console)
+    assert dashboard.add([make_sale(i, 100 + i) for i in range(50)], completed=1) == 50
+    overlapping = [make_sale(i, 100 + i) for i in range(40, 60)]
+    assert dashboard.add(overlapping, completed=1) == 10
+
+    console.print(dashboard.render())
+    output = console.file.getvalue()
+    assert "2/2 done: 60 listings" in output
+    assert "Listing 2 " in output and "Listing 3 " not in output
\ No newline at end of file
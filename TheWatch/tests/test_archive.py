@@ -0,0 +1,75 @@
+# tests/test_archive.py
+from concurrent.futures import ThreadPoolExecutor
+
+from TheWatch.core.crawl import crawl
+from TheWatch.core.scraper import GrailedScraper
+from TheWatch.data.archive import ResponseArchive, iter_segment, reprocess
+from TheWatch.data.store import SalesStore
+from TheWatch.replay import ReplayServer
+
+
+async def crawl_into_archive(archive: ResponseArchive, store: SalesStore, queries):
+    async with ReplayServer(pages=3, per_page=10) as server:
+        scraper = GrailedScraper(base_url=server.url, archive=archive)
+        try:
+            for query in queries:
+                await crawl(scraper, query,
+                            on_page=lambda page, sales: store.upsert(sales))
+        finally:
+            await scraper.close()
+
+
+async def test_goods_pages_are_archived_and_indexed(tmp_path):
+    archive = ResponseArchive(str(tmp_path / "archive"), segment_bytes=4096)
+    store = SalesStore(str(tmp_path / "sales.db"))
+    await crawl_into_archive(archive, store, ["rick owens", "acne studios"])
+
+    entries = archive.entries(query="rick owens")
+    # Three listing pages plus the empty page that ended the crawl
+    assert [e.page for e in entries] == [1, 2, 3, 4]
+    assert len(archive.entries()) == 8
+    assert len(archive.segments()) > 1
+
+    record = archive.read(entries[1])
+    assert record["query"] == "rick owens" and record["page"] == 2
+    assert len(record["response"]["listings"]) == 10
+
+    streamed = [r for _, path in archive.segments() for r in iter_segment(str(path))]
+    assert [(r["query"], r["page"]) for r in streamed] == [
+        (e.query, e.page) for e in archive.entries()
+    ]
+    latest = archive.entries(since=entries[-1].fetched_at, query="rick owens")
+    assert latest == entries[-1:]
+    archive.close()
+    store.close()
+
+
+async def test_reprocess_rebuilds_store_without_network(tmp_path):
+    archive = ResponseArchive(str(tmp_path / "archive"), segment_bytes=4096)
+    original = SalesStore(str(tmp_path / "sales.db"))
+    await crawl_into_archive(archive, original, ["rick owens", "raf simons"])
+    archive.close()
+
+    archive = ResponseArchive(str(tmp_path / "archive"))
+    rebuilt = SalesStore(str(tmp_path / "rebuilt.db"))
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        result = reprocess(archive, rebuilt, executor)
+
+    assert result.records == 8 and result.listings == 60
+    assert rebuilt.count() == original.count() == 60
+    assert [s.id for s in rebuilt] == [s.id for s in original]
+    assert rebuilt.get(original.all()[0].id).title == original.all()[0].title
+    for store in (archive, original, rebuilt):
+        store.close()
+
+
+async def test_torn_tail_record_is_skipped(tmp_path):
+    archive = ResponseArchive(str(tmp_path / "archive"))
+    for page in (1, 2):
+        archive.append("q", page, {"listings": [], "metadata": {"page": page}})
+    archive.close()
+    _, path = archive.segments()[-1]
+    data = path.read_bytes()
+    path.write_bytes(data + data[:20])
+
+    assert [r["page"] for r in iter_segment(str(path))] == [1, 2]
\ No newline at end of file
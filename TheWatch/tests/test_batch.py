@@ -0,0 +1,130 @@
+# tests/test_batch.py
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from TheWatch.core.batch import load_queries, parse_filters, parse_query_line, run_batch
+from TheWatch.core.models import SearchFilters
+from TheWatch.data.lifecycle import REMOVED, LifecycleTracker
+from TheWatch.data.store import SalesStore
+from TheWatch.replay import ReplayServer
+from TheWatch.ui.cli import build_parser, run_batch_search, run_crawl, run_watch
+
+
+def test_parse_query_line():
+    base = SearchFilters(max_price=500)
+    parsed = parse_query_line(
+        "rick owens | designers=Rick Owens, DRKSHDW sizes=48", base
+    )
+    assert parsed.query == "rick owens"
+    assert parsed.filters.max_price == 500
+    assert parsed.filters.designers == ["Rick Owens", "DRKSHDW"]
+    assert parsed.filters.sizes == ["48"]
+
+    assert parse_query_line("nike dunk").filters is None
+    assert parse_query_line("  # comment") is None
+    with pytest.raises(ValueError):
+        parse_filters("colour=red")
+
+
+def test_load_queries_reports_line_numbers(tmp_path):
+    path = tmp_path / "queries.txt"
+    path.write_text("nike dunk\n\nraf simons | min_price=100\nbad | nonsense\n")
+    with pytest.raises(ValueError, match="queries.txt:4"):
+        load_queries(path)
+
+
+async def test_run_batch_bounds_concurrency():
+    in_flight = peak = 0
+
+    async def search(query, filters):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        if query == "bad":
+            raise RuntimeError("boom")
+        return []
+
+    queries = [parse_query_line(q) for q in ["a", "b", "bad", "c", "d", "e"]]
+    finished = []
+    results = await run_batch(queries, search, concurrency=2, on_result=finished.append)
+
+    assert peak == 2
+    assert len(finished) == 6
+    assert [r.error for r in results if r.error] == ["boom"]
+
+
+async def test_search_command_streams_into_store(tmp_path):
+    query_file = tmp_path / "queries.txt"
+    query_file.write_text("rick owens | max_price=200\nraf simons\n")
+    args = build_parser().parse_args([
+        "search", "nike dunk", "--file", str(query_file),
+        "--store", str(tmp_path / "sales.db"), "--export", "csv",
+        "--output-dir", str(tmp_path / "exports"), "--concurrency", "3"
+    ])
+
+    async with ReplayServer(pages=1, per_page=8) as server:
+        settings = SimpleNamespace(rate_limit_requests=1000, rate_limit_window=60,
+                                   base_url=server.url, session_ttl=3600,
+                                   session_state_path=str(tmp_path / "session.json"))
+        assert await run_batch_search(args, settings) == 0
+
+    store = SalesStore(str(tmp_path / "sales.db"))
+    try:
+        # Two unfiltered queries of 8 plus the recorded listings priced at or under 200
+        assert store.count() == 8 + 8 + 6
+    finally:
+        store.close()
+    assert len(list((tmp_path / "exports").glob("sales_batch_*.csv"))) == 1
+
+
+async def test_tracked_crawl_logs_listings_gone_from_the_query(tmp_path):
+    def crawl_args(*extra):
+        return build_parser().parse_args([
+            "crawl", "rick owens", "--store", str(tmp_path / "sales.db"),
+            "--track", str(tmp_path / "lifecycle.db"),
+            "--checkpoint-dir", str(tmp_path / "checkpoints"), *extra
+        ])
+
+    async with ReplayServer(pages=3, per_page=4) as server:
+        settings = SimpleNamespace(rate_limit_requests=1000, rate_limit_window=60,
+                                   base_url=server.url, session_ttl=3600,
+                                   session_state_path=str(tmp_path / "session.json"))
+        assert await run_crawl(crawl_args(), settings) == 0
+        server.pages = 2
+        # A crawl cut short by --max-pages cannot tell what is gone
+        assert await run_crawl(crawl_args("--max-pages", "1"), settings) == 0
+        tracker = LifecycleTracker(str(tmp_path / "lifecycle.db"))
+        assert tracker.changes(kinds=[REMOVED]) == []
+        tracker.close()
+        assert await run_crawl(crawl_args(), settings) == 0
+
+    tracker = LifecycleTracker(str(tmp_path / "lifecycle.db"))
+    try:
+        assert len(tracker) == 12
+        assert len(tracker.changes(kinds=[REMOVED])) == 4
+    finally:
+        tracker.close()
+
+
+async def test_watch_command_polls_each_query(tmp_path, capsys):
+    rules_file = tmp_path / "rules.txt"
+    rules_file.write_text("anything | max_price=100000\n")
+    args = build_parser().parse_args([
+        "watch", "rick owens", "raf simons", "--minutes", "0.01",
+        "--rules", str(rules_file), "--alert-delay", "0"
+    ])
+    async with ReplayServer(pages=1, per_page=4) as server:
+        settings = SimpleNamespace(rate_limit_requests=1000, rate_limit_window=60,
+                                   base_url=server.url, session_ttl=3600,
+                                   session_state_path=str(tmp_path / "session.json"))
+        assert await run_watch(args, settings) == 0
+        # One baseline poll per query inside the time limit, two requests each after
+        # the warm-up
+        assert server.stats.requests - server.stats.warmups == 4
+    out = capsys.readouterr().out
+    assert "0 new listings from 2 searches (4 requests)" in out
+    # Baseline polls find nothing new, so nothing is alerted
+    assert "Alert anything" not in out
\ No newline at end of file
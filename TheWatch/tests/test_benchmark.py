@@ -0,0 +1,23 @@
+# tests/test_benchmark.py
+from TheWatch.scripts.benchmark import percentile, run_benchmark
+
+
+def test_percentile():
+    values = [float(v) for v in range(1, 101)]
+    assert percentile(values, 50) == 50.0
+    assert percentile(values, 99) == 99.0
+    assert percentile([], 50) == 0.0
+
+
+async def test_benchmark_reports_every_stage(tmp_path):
+    report = await run_benchmark(
+        queries=3, pages=2, per_page=20, output_dir=str(tmp_path)
+    )
+    summary = report.summary()
+
+    assert report.listings == 3 * 2 * 20
+    assert summary['pages'] == 6
+    assert summary['listings_per_sec'] > 0
+    assert set(summary['stages']) == {'search', 'normalize', 'store', 'export'}
+    assert summary['stages']['export']['count'] == 1
+    assert list((tmp_path / "exports").glob("*.csv"))
\ No newline at end of file
@@ -0,0 +1,150 @@
+# tests/test_browse.py
+import json
+import random
+import sqlite3
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from TheWatch.core.models import Sale
+from TheWatch.data.store import SalesStore, decode_cursor, encode_cursor, sale_to_dict
+
+START = datetime(2024, 6, 1)
+DESIGNERS = ["Acne Studios", "Rick Owens", "Our Legacy", "100%_Cotton"]
+
+
+def make_sales(n: int):
+    rng = random.Random(11)
+    return [
+        Sale(title=f"Listing {i}", price=float(rng.randint(20, 900)),
+             original_price=1000.0, designer=DESIGNERS[i % len(DESIGNERS)],
+             size=rng.choice(["M", "Medium", "EU 42", "US 9"]),
+             condition=rng.choice(["is_new", "is_used"]),
+             url=f"https://www.grailed.com/listings/{i}", id=i,
+             category="footwear" if i % 2 else "tops",
+             # Plenty of identical timestamps so the id tiebreak matters
+             created_at=START + timedelta(hours=i // 3))
+        for i in range(1, n + 1)
+    ]
+
+
+def walk(store: SalesStore, limit: int, **filters):
+    pages, after = [], None
+    while True:
+        sales, after = store.browse(after=after, limit=limit, **filters)
+        pages.append([s.id for s in sales])
+        if after is None:
+            return pages
+
+
+def test_keyset_pages_cover_everything_once(tmp_path):
+    store = SalesStore(str(tmp_path / "sales.db"))
+    sales = make_sales(203)
+    store.upsert(sales)
+
+    pages = walk(store, 20)
+    newest = sorted(sales, key=lambda s: (s.sold_date, s.id), reverse=True)
+    assert [i for page in pages for i in page] == [s.id for s in newest]
+    assert len(pages) == 11 and len(pages[-1]) == 3
+
+    filtered = walk(store, 7, designer="acne", condition="New",
+                    min_price=100, max_price=600)
+    assert [i for page in filtered for i in page] == [
+        s.id for s in newest
+        if s.designer == "Acne Studios" and s.condition == "is_new"
+        and 100 <= s.price <= 600
+    ]
+
+    window, _ = store.browse(since=START + timedelta(hours=10),
+                             until=START + timedelta(hours=12), limit=50)
+    assert sorted(s.id for s in window) == list(range(30, 36))
+
+    # Literal wildcards in the designer filter
+    cotton = store.browse(designer="0%_c", limit=100)[0]
+    assert {s.designer for s in cotton} == {"100%_Cotton"}
+    # Sizes match canonically in every size system: "EU 42" is US 8.5 shoes and
+    # XXS tops
+    eu42 = store.browse(size="eu 42", limit=500)[0]
+    assert {s.category for s in eu42} == {"footwear", "tops"}
+    assert all(s.size == "EU 42" for s in eu42)
+
+    plan = " ".join(str(row) for row in store.conn.execute(
+        "EXPLAIN QUERY PLAN SELECT id FROM sales WHERE (sold_date, id) < (?, ?) "
+        "ORDER BY sold_date DESC, id DESC LIMIT 5",
+        ("2024-06-02", 10)
+    ))
+    assert "sales_by_date" in plan
+    store.close()
+
+
+def test_bare_sizes_match_every_size_system(tmp_path):
+    store = SalesStore(str(tmp_path / "sales.db"))
+    listed = [("US 10", "footwear"), ("EU 44", "sneakers"), ("M", "outerwear"),
+              ("48", "tailoring"), ("32", "bottoms"), ("W32 L30", "jeans"),
+              ("L", "tops")]
+    store.upsert([
+        Sale(title=f"Listing {i}", price=100.0, original_price=100.0,
+             designer="Acne Studios", size=size, condition="is_used",
+             url=f"https://www.grailed.com/listings/{i}", id=i, category=category,
+             created_at=START)
+        for i, (size, category) in enumerate(listed, start=1)
+    ])
+
+    def ids(size):
+        return sorted(s.id for s in store.browse(size=size, limit=50)[0])
+
+    assert ids("10") == [1, 2]
+    # A bare 48 is an M in tailoring; only EU 48 reads as W32 trousers
+    assert ids("48") == [3, 4]
+    assert ids("eu 48") == [3, 4, 5, 6]
+    assert ids("32") == [5, 6]
+    assert ids("medium") == [3, 4]
+    assert ids("US 10") == [1, 2]
+    store.close()
+
+
+def test_cursor_round_trip():
+    key = ("2024-06-01T10:00:00", 42)
+    assert decode_cursor(encode_cursor(key)) == key
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor")
+
+
+def test_existing_store_gains_size_column(tmp_path):
+    path = str(tmp_path / "old.db")
+    sale = make_sales(1)[0]
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE sales (id INTEGER PRIMARY KEY, designer TEXT, "
+                 "size TEXT, condition TEXT, price REAL, sold_date TEXT, "
+                 "data TEXT NOT NULL, updated_at TEXT NOT NULL)")
+    conn.execute("INSERT INTO sales VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                 (sale.id, sale.designer, sale.size, sale.condition, sale.price,
+                  sale.sold_date.isoformat(), json.dumps(sale_to_dict(sale)),
+                  "2024-06-01"))
+    conn.commit()
+    conn.close()
+
+    store = SalesStore(path)
+    assert [s.id for s in store.browse(size=sale.size, limit=5)[0]] == [sale.id]
+    store.close()
+
+
+def test_sales_endpoint(tmp_path, api_app):
+    store = SalesStore(str(tmp_path / "sales.db"))
+    store.upsert(make_sales(30))
+    client = TestClient(api_app(_store=store))
+
+    seen, cursor = [], None
+    while True:
+        params = {"limit": 8, "designer": "rick"}
+        if cursor:
+            params["cursor"] = cursor
+        body = client.get("/api/sales", params=params).json()
+        seen.extend(s["id"] for s in body["sales"])
+        cursor = body["next_cursor"]
+        if not cursor:
+            break
+    assert len(seen) == len(set(seen)) == 8
+    assert client.get("/api/sales", params={"cursor": "garbage"}).status_code == 400
+    assert client.get("/api/sales", params={"limit": 0}).status_code == 422
+    store.close()
\ No newline at end of file
@@ -0,0 +1,115 @@
+# tests/test_cache.py
+import asyncio
+import multiprocessing
+import time
+
+import httpx
+
+from TheWatch.core.session import SessionState
+from TheWatch.data.cache import ResultCache
+from TheWatch.replay import ReplayServer
+
+
+def test_ttl_and_lru_eviction(tmp_path):
+    cache = ResultCache(
+        str(tmp_path / "cache.db"), ttl=60, max_entries=3, touch_interval=0
+    )
+    cache.put("expired", [1], ttl=-1)
+    assert cache.get("expired") is None
+    assert cache.lookup("expired") == ([1], False)
+
+    for key in ("a", "b", "c"):
+        cache.put(key, {"key": key})
+        time.sleep(0.01)
+    cache.get("a")
+    cache.put("d", {"key": "d"})
+    assert len(cache) == 3
+    assert cache.get("b") is None
+    assert cache.get("a") == {"key": "a"}
+    cache.close()
+
+
+def test_hits_only_write_once_per_touch_interval(tmp_path):
+    cache = ResultCache(str(tmp_path / "cache.db"), ttl=60)
+    cache.put("q", ["hit"])
+    writes = cache.conn.total_changes
+    assert [cache.get("q") for _ in range(5)] == [["hit"]] * 5
+    assert cache.conn.total_changes == writes
+
+    cache.touch_interval = 0
+    cache.get("q")
+    assert cache.conn.total_changes == writes + 1
+    cache.close()
+
+
+def _worker(path: str, log: str, start: float) -> None:
+    async def refresh():
+        with open(log, "a") as f:
+            f.write("refresh\n")
+        await asyncio.sleep(0.3)
+        return ["fresh"]
+
+    cache = ResultCache(path, ttl=60)
+    time.sleep(max(0.0, start - time.time()))
+    assert asyncio.run(cache.get_or_refresh("popular", refresh)) == ["fresh"]
+    cache.close()
+
+
+def test_one_process_refreshes_a_key(tmp_path):
+    path, log = str(tmp_path / "cache.db"), str(tmp_path / "refreshes.log")
+    ResultCache(path).close()
+    ctx = multiprocessing.get_context("spawn")
+    start = time.time() + 1.0
+    workers = [ctx.Process(target=_worker, args=(path, log, start)) for _ in range(4)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join(30)
+    assert all(worker.exitcode == 0 for worker in workers)
+    with open(log) as f:
+        assert f.read().count("refresh") == 1
+
+
+async def test_stale_value_served_while_another_owner_refreshes(tmp_path):
+    path = str(tmp_path / "cache.db")
+    first, second = ResultCache(path), ResultCache(path)
+    first.put("q", ["old"], ttl=-1)
+    assert first.acquire("q")
+    assert not second.acquire("q")
+
+    async def refresh():
+        raise AssertionError("lease is held elsewhere")
+
+    assert await second.get_or_refresh("q", refresh) == ["old"]
+    first.release("q")
+
+    async def fresh():
+        return ["new"]
+
+    assert await second.get_or_refresh("q", fresh) == ["new"]
+    assert first.get("q") == ["new"]
+
+
+async def test_failed_upstream_search_is_not_cached(tmp_path, monkeypatch, api_app):
+    from TheWatch.web import routes
+
+    cache = ResultCache(str(tmp_path / "cache.db"), ttl=300)
+    session_state = SessionState(str(tmp_path / "session.json"))
+    app = api_app(_result_cache=cache, _session_state=session_state)
+
+    # Every request is throttled, so the search never gets through
+    throttled = ReplayServer(pages=1, per_page=5, throttle_every=1, retry_after=0)
+    async with throttled as server:
+        monkeypatch.setattr(routes.settings, "base_url", server.url)
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport,
+                                     base_url="http://test") as client:
+            failed = await client.get("/api/search", params={"query": "rick owens"})
+            assert failed.status_code == 502
+            assert len(cache) == 0
+
+            server.throttle_every = 0
+            recovered = await client.get("/api/search", params={"query": "rick owens"})
+            assert recovered.status_code == 200 and len(recovered.json()["sales"]) == 5
+            assert len(cache) == 1
+    cache.close()
\ No newline at end of file
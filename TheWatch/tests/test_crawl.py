@@ -0,0 +1,83 @@
+# tests/test_crawl.py
+import json
+
+from TheWatch.core.crawl import CheckpointStore, checkpoint_key, crawl
+from TheWatch.core.models import SearchFilters
+from TheWatch.core.scraper import GrailedScraper
+from TheWatch.replay import ReplayServer
+
+
+class Crash(Exception):
+    pass
+
+
+async def test_resumed_crawl_continues_where_it_stopped(tmp_path):
+    checkpoints = CheckpointStore(str(tmp_path / "checkpoints"))
+    delivered = {}
+
+    def crash_on_page_4(page, sales):
+        if page == 4:
+            raise Crash()
+        delivered[page] = [s.id for s in sales]
+
+    async with ReplayServer(pages=6, per_page=5) as server:
+        scraper = GrailedScraper(base_url=server.url)
+        try:
+            reference = await crawl(scraper, "rick owens")
+            assert reference.checkpoint.completed and reference.pages_fetched == 7
+
+            # The crawl carries on past the failed delivery, but its checkpoint can't
+            await crawl(scraper, "rick owens", checkpoints=checkpoints,
+                        on_page=crash_on_page_4)
+            saved = checkpoints.load(checkpoint_key("rick owens"))
+            assert saved.last_page == 3 and not saved.completed
+
+            def deliver(page, sales):
+                delivered[page] = [s.id for s in sales]
+
+            requests_before = server.stats.requests
+            resumed = await crawl(scraper, "rick owens", checkpoints=checkpoints,
+                                  on_page=deliver)
+        finally:
+            await scraper.close()
+        # Pages 4-6 plus the empty page 7; the search URL is not resolved again
+        assert server.stats.requests - requests_before == 4
+
+    assert resumed.resumed_from == 3 and resumed.pages_fetched == 4
+    assert resumed.checkpoint.completed
+    assert sorted(delivered) == [1, 2, 3, 4, 5, 6]
+    delivered_ids = [i for page in sorted(delivered) for i in delivered[page]]
+    assert delivered_ids == [s.id for s in reference.sales]
+    assert resumed.checkpoint.listings == 30
+
+
+async def test_failed_page_is_retried_and_completed_crawl_restarts(tmp_path):
+    checkpoints = CheckpointStore(str(tmp_path / "checkpoints"))
+    filters = SearchFilters(max_price=100)
+    async with ReplayServer(pages=2, per_page=8, throttle_every=4) as server:
+        scraper = GrailedScraper(base_url=server.url)
+        try:
+            # Requests: home, shop, page 1, page 2 (throttled) -> stops after page 1
+            first = await crawl(scraper, "acne", filters, checkpoints=checkpoints)
+            assert first.checkpoint.last_page == 1 and not first.checkpoint.completed
+
+            server.throttle_every = 0
+            second = await crawl(scraper, "acne", filters,
+                                 checkpoints=checkpoints, max_pages=2)
+            assert second.resumed_from == 1 and second.checkpoint.completed
+            assert all(s.price <= 100 for s in second.sales)
+
+            third = await crawl(scraper, "acne", filters,
+                                checkpoints=checkpoints, max_pages=1)
+            assert third.resumed_from == 0
+        finally:
+            await scraper.close()
+
+
+def test_checkpoint_with_dropped_fields_still_loads(tmp_path):
+    checkpoints = CheckpointStore(str(tmp_path))
+    key = checkpoint_key("acne")
+    (tmp_path / f"{key}.json").write_text(
+        json.dumps({"query": "acne", "last_page": 4, "max_seen_id": 99})
+    )
+    assert checkpoints.load(key).last_page == 4
\ No newline at end of file
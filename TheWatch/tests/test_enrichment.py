@@ -0,0 +1,107 @@
+# tests/test_enrichment.py
+import time
+
+from dataclasses import replace
+
+from TheWatch.core.models import Sale
+from TheWatch.core.ratelimit import RateLimiter
+from TheWatch.core.scraper import GrailedScraper
+from TheWatch.data.enrichment import DetailEnricher, merge_details
+from TheWatch.data.store import SalesStore
+from TheWatch.replay import ReplayServer
+
+
+async def test_only_unseen_listings_are_fetched(tmp_path):
+    store = SalesStore(str(tmp_path / "sales.db"))
+    async with ReplayServer(pages=1, per_page=10) as server:
+        scraper = GrailedScraper(rate_limiter=RateLimiter(1000, 1), base_url=server.url)
+        try:
+            sales = await scraper.search_listings("rick owens")
+            enricher = DetailEnricher(scraper, store, concurrency=3)
+            first = await enricher.enrich(sales[:6])
+            assert server.stats.details == 6
+
+            second = await enricher.enrich(sales)
+            assert server.stats.details == 10
+            assert enricher.pending(sales) == []
+        finally:
+            await scraper.close()
+
+    assert [s.id for s in second] == [s.id for s in sales]
+    assert all(
+        s.enriched_at and s.measurements and "listings_count" in s.seller_stats
+        for s in second
+    )
+    assert first[0].measurements == second[0].measurements
+    stored = store.get(sales[0].id)
+    assert stored.measurements == second[0].measurements
+    assert store.count() == 10
+    store.close()
+
+
+async def test_stale_details_are_refetched(tmp_path):
+    store = SalesStore(str(tmp_path / "sales.db"))
+    async with ReplayServer(pages=1, per_page=4) as server:
+        scraper = GrailedScraper(base_url=server.url)
+        try:
+            sales = await scraper.search_listings("raf simons")
+            store.put_details(
+                {sales[0].id: {"measurements": {"chest": 1}}},
+                fetched_at=time.time() - 3600,
+            )
+            store.put_details({sales[1].id: {"measurements": {"chest": 2}}})
+
+            enriched = await DetailEnricher(scraper, store, max_age=60).enrich(sales)
+        finally:
+            await scraper.close()
+        assert server.stats.details == 3
+
+    assert enriched[0].measurements["chest"] != 1
+    assert enriched[1].measurements == {"chest": 2}
+    store.close()
+
+
+async def test_plain_writes_keep_stored_details(tmp_path):
+    store = SalesStore(str(tmp_path / "sales.db"))
+    async with ReplayServer(pages=1, per_page=3) as server:
+        scraper = GrailedScraper(base_url=server.url)
+        try:
+            sales = await scraper.search_listings("rick owens")
+            enriched = await DetailEnricher(scraper, store).enrich(sales)
+        finally:
+            await scraper.close()
+    _, seq, _ = store.changed_since()[-1]
+
+    # A later crawl writes the same listings without details
+    store.upsert(sales)
+    assert store.changed_since(seq) == []
+    stored = store.get(sales[0].id)
+    assert stored.measurements == enriched[0].measurements and stored.measurements
+    assert stored.seller_stats == enriched[0].seller_stats
+    assert stored.enriched_at == enriched[0].enriched_at
+
+    store.upsert([replace(sales[0], price=1.0)])
+    [(changed, _, _)] = store.changed_since(seq)
+    assert changed.price == 1.0 and changed.measurements == enriched[0].measurements
+    assert changed.enriched_at == enriched[0].enriched_at
+    store.close()
+
+
+def test_merge_details_keeps_search_fields_when_missing():
+    sale = Sale(title="Jacket", price=100, original_price=150, designer="Acne",
+                size="M",
+                condition="is_used", url="https://www.grailed.com/listings/1", id=1,
+                description="short", photos=["a.jpg"])
+    merged = merge_details(sale, {
+        "description": " Full description ",
+        "seller": {"username": "x", "rating": 4.9, "verified": True},
+        "measurements": {"chest": 21},
+    }, fetched_at=1_700_000_000)
+
+    assert merged.description == "Full description"
+    assert merged.photos == ["a.jpg"]
+    assert merged.seller_stats == {"rating": 4.9}
+    assert merged.measurements == {"chest": 21}
+    assert merged.enriched_at.timestamp() == 1_700_000_000
+    assert merged.discount == sale.discount
+    assert sale.enriched_at is None
\ No newline at end of file
@@ -1,7 +1,10 @@
 # tests/test_exporters.py
+import csv
+import json
 import pytest
 from pathlib import Path
 from TheWatch.data.exporters import SalesExporter
+from TheWatch.data.store import SalesStore
 from TheWatch.core.models import Sale
 from datetime import datetime
 
@@ -44,4 +47,58 @@ def test_excel_export(sample_sales, tmp_path):
     exporter = SalesExporter(output_dir=str(tmp_path))
     filepath = exporter.export_excel(sample_sales, "test")
     assert Path(filepath).exists()
-    assert Path(filepath).suffix == ".xlsx"
\ No newline at end of file
+    assert Path(filepath).suffix == ".xlsx"
+
+
+def _ids(path):
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        return [int(row['ID']) for row in csv.DictReader(f)]
+
+
+def test_delta_export_writes_only_changes(tmp_path, make_sale):
+    exporter = SalesExporter(output_dir=str(tmp_path))
+    first = exporter.export_delta([make_sale(i, 100.0) for i in range(1, 6)], "etl")
+    assert _ids(first) == [1, 2, 3, 4, 5]
+
+    # Unchanged listings are skipped, the repriced one and the new one go out
+    unchanged = [make_sale(i, 100.0) for i in range(1, 6)]
+    assert exporter.export_delta(unchanged, "etl") is None
+    second = exporter.export_delta(
+        [make_sale(2, 80.0), make_sale(3, 100.0), make_sale(6, 50.0)], "etl"
+    )
+    assert _ids(second) == [2, 6]
+    # Destinations keep separate watermarks
+    assert _ids(exporter.export_delta([make_sale(2, 80.0)], "archive")) == [2]
+
+    manifest = json.loads((tmp_path / "etl" / "manifest.json").read_text())
+    assert [
+        (c['sequence'], c['file'], c['records'], c['added'], c['changed'])
+        for c in manifest['chunks']
+    ] == [
+        (1, "chunk_000001.csv", 5, 5, 0), (2, "chunk_000002.csv", 2, 1, 1)
+    ]
+    assert manifest['watermark']['last_id'] == 6
+    assert not list((tmp_path / "etl").glob(".*.tmp"))
+    exporter.close()
+
+    # State survives a restart
+    reopened = SalesExporter(output_dir=str(tmp_path))
+    assert reopened.export_delta([make_sale(6, 50.0)], "etl") is None
+    with pytest.raises(ValueError):
+        reopened.export_delta([], "../elsewhere")
+    reopened.close()
+
+
+def test_store_delta_reads_past_watermark(tmp_path, make_sale):
+    store = SalesStore(str(tmp_path / "sales.db"))
+    exporter = SalesExporter(output_dir=str(tmp_path / "exports"))
+    store.upsert([make_sale(i, 100.0) for i in range(1, 4)])
+    assert _ids(exporter.export_store_delta(store, "etl")) == [1, 2, 3]
+    assert exporter.watermark("etl")['source'] == 3
+
+    store.upsert([make_sale(3, 100.0), make_sale(4, 120.0)])
+    assert _ids(exporter.export_store_delta(store, "etl")) == [4]
+    # The unchanged listing 3 kept its sequence number
+    assert exporter.watermark("etl")['source'] == 4
+    exporter.close()
+    store.close()
\ No newline at end of file
@@ -0,0 +1,60 @@
+# tests/test_lifecycle.py
+from dataclasses import replace
+
+from TheWatch.data.lifecycle import (
+    NEW, PRICE_CHANGE, RELIST, REMOVED, UPDATED, LifecycleTracker, content_hash
+)
+
+
+def test_only_real_changes_are_logged(tmp_path, make_sale):
+    tracker = LifecycleTracker(str(tmp_path / "lifecycle.db"))
+    sales = [make_sale(i) for i in range(5)]
+
+    assert [c.kind for c in tracker.observe(sales, "acne", at=1000)] == [NEW] * 5
+    assert tracker.observe(sales, "acne", at=1100) == []
+
+    polled = [
+        replace(sales[0], price=80.0),
+        replace(sales[1], description="now with receipt"),
+        *sales[2:],
+    ]
+    changes = tracker.observe(polled, "acne", at=1200)
+    assert [(c.listing_id, c.kind) for c in changes] == [
+        (0, PRICE_CHANGE), (1, UPDATED)
+    ]
+    assert changes[0].price_delta == -20.0
+
+    removed = tracker.sweep("acne", [s.id for s in polled[:4]], at=1300)
+    assert [(c.listing_id, c.kind) for c in removed] == [(4, REMOVED)]
+    assert tracker.sweep("acne", [s.id for s in polled[:4]], at=1400) == []
+
+    relisted = tracker.observe([sales[4]], "acne", at=1500)
+    assert [c.kind for c in relisted] == [RELIST]
+    assert [c.kind for c in tracker.history(4)] == [NEW, REMOVED, RELIST]
+    tracker.close()
+
+
+def test_price_drops_query_and_state_survive_reopen(tmp_path, make_sale):
+    path = str(tmp_path / "lifecycle.db")
+    tracker = LifecycleTracker(path)
+    tracker.observe([make_sale(1), make_sale(2), make_sale(3)], at=0)
+    tracker.observe([make_sale(1, 90.0), make_sale(2, 120.0)], at=100)
+    tracker.close()
+
+    tracker = LifecycleTracker(path)
+    assert len(tracker) == 3
+    assert tracker.observe([make_sale(1, 90.0)], at=3000) == []
+    tracker.observe([make_sale(3, 50.0)], at=4000)
+
+    assert [d.listing_id for d in tracker.price_drops(since=0)] == [1, 3]
+    assert [d.listing_id for d in tracker.price_drops(since=3600)] == [3]
+    changed = tracker.changes(since=50, kinds=[PRICE_CHANGE])
+    assert [c.listing_id for c in changed] == [1, 2, 3]
+    tracker.close()
+
+
+def test_content_hash_ignores_fields_sellers_cannot_edit(make_sale):
+    sale = make_sale(1)
+    moved = replace(sale, seller="someone_else", location="Paris")
+    assert content_hash(sale) == content_hash(moved)
+    assert content_hash(sale) != content_hash(replace(sale, size="L"))
\ No newline at end of file
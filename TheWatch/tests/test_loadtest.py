@@ -0,0 +1,48 @@
+# tests/test_loadtest.py
+import json
+
+import pytest
+from TheWatch.scripts.loadtest import compare, parse_mix, run_load_test, save_report
+
+
+def test_parse_mix():
+    assert parse_mix("rick owens=3, acne ,raf=0.5") == [
+        ("rick owens", 3.0), ("acne", 1.0), ("raf", 0.5)
+    ]
+    with pytest.raises(ValueError):
+        parse_mix(" , ")
+
+
+def test_compare_flags_regressions():
+    base = {'throughput_rps': 100.0, 'error_rate': 0.0,
+            'latency_ms': {'p50': 10.0, 'p95': 40.0, 'p99': 80.0}}
+    now = {'throughput_rps': 80.0, 'error_rate': 0.0,
+           'latency_ms': {'p50': 10.2, 'p95': 30.0, 'p99': 120.0}}
+    lines = compare(now, base)
+    assert lines[0].startswith("throughput_rps") and lines[0].endswith("worse)")
+    assert "unchanged" in lines[1] and "better" in lines[2] and "worse" in lines[3]
+    assert lines[4] == "error_rate: 0.0 -> 0.0 (+0.0 pts, unchanged)"
+
+    # Errors appearing over a zero-error baseline are a regression, even a few
+    regressed = compare({**now, 'error_rate': 0.4}, base)
+    assert regressed[4] == "error_rate: 0.0 -> 0.4 (+40.0 pts, worse)"
+    assert compare({**now, 'error_rate': 0.01}, base)[4].endswith("worse)")
+    assert compare(base, {**base, 'error_rate': 0.2})[4].endswith("better)")
+
+
+@pytest.mark.integration
+async def test_load_test_against_replay_upstream(tmp_path):
+    report = await run_load_test(
+        workers=2, upstream_latency=0.0, mix=parse_mix("rick owens=3,acne=1"),
+        concurrency=4, duration=None, requests=40
+    )
+    summary = report.summary()
+    assert summary['requests'] == 40 and summary['error_rate'] == 0
+    assert summary['statuses'] == {'200': 40}
+    latency = summary['latency_ms']
+    assert 0 < latency['p50'] <= latency['p95'] <= latency['p99']
+    # Two queries, shared result cache: far fewer upstream requests than API requests
+    assert report.config['upstream_requests'] < 40
+
+    saved = save_report(report, str(tmp_path))
+    assert json.loads(saved.read_text())['requests'] == 40
\ No newline at end of file
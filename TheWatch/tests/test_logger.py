@@ -0,0 +1,92 @@
+# tests/test_logger.py
+import json
+import logging
+import threading
+import time
+
+import pytest
+from TheWatch.utils.logger import (
+    SampleRepeatsFilter, configure_logging, setup_logger, shutdown_logging
+)
+
+
+class ThreadRecorder:
+    """Log argument that remembers which thread formatted it"""
+
+    def __init__(self):
+        self.thread = None
+
+    def __str__(self):
+        self.thread = threading.current_thread()
+        return "recorded"
+
+
+@pytest.fixture
+def log_dir(tmp_path):
+    configure_logging(log_dir=str(tmp_path), sample_burst=0)
+    yield tmp_path
+    shutdown_logging()
+    configure_logging()
+
+
+def test_formatting_happens_off_the_calling_thread(log_dir):
+    logger = setup_logger('thewatch_test_lazy', 'lazy')
+    arg = ThreadRecorder()
+    logger.info("value: %s", arg)
+    assert arg.thread is None
+    shutdown_logging()
+
+    assert arg.thread is not None
+    assert arg.thread is not threading.current_thread()
+    assert "value: recorded" in (log_dir / "lazy.log").read_text()
+
+
+def test_json_lines_output(log_dir):
+    configure_logging(log_dir=str(log_dir), json_lines=True, sample_burst=0)
+    logger = setup_logger('thewatch_test_json', 'events')
+    logger.warning("listing %s failed", 42)
+    shutdown_logging()
+
+    entry = json.loads((log_dir / "events.jsonl").read_text().splitlines()[0])
+    assert entry['level'] == 'WARNING'
+    assert entry['logger'] == 'thewatch_test_json'
+    assert entry['message'] == 'listing 42 failed'
+
+
+def test_size_rotation(log_dir):
+    configure_logging(
+        log_dir=str(log_dir), max_bytes=300, backup_count=2, sample_burst=0
+    )
+    logger = setup_logger('thewatch_test_rotate', 'rotate')
+    for i in range(50):
+        logger.info("line %s with some padding to fill the file", i)
+    shutdown_logging()
+
+    assert (log_dir / "rotate.log").exists()
+    assert (log_dir / "rotate.log.1").exists()
+    assert not (log_dir / "rotate.log.3").exists()
+
+
+def test_debug_records_are_dropped_before_enqueue(log_dir):
+    logger = setup_logger('thewatch_test_level', 'level')
+    arg = ThreadRecorder()
+    logger.debug("hidden %s", arg)
+    shutdown_logging()
+    assert arg.thread is None
+
+
+def test_repeated_errors_are_sampled():
+    sampler = SampleRepeatsFilter(burst=3, window=0.05)
+
+    def record(msg, level=logging.ERROR, args=('boom',)):
+        return logging.LogRecord('scraper', level, __file__, 1, msg, args, None)
+
+    passed = [sampler.filter(record("Error processing listing: %s")) for _ in range(10)]
+    assert passed.count(True) == 3
+    assert sampler.filter(record("Request error: %s"))
+    assert sampler.filter(record("Error processing listing: %s", logging.INFO, ()))
+
+    time.sleep(0.06)
+    summary = record("Error processing listing: %s")
+    assert sampler.filter(summary)
+    assert "suppressed 7 similar messages" in summary.getMessage()
\ No newline at end of file
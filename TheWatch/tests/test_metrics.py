@@ -0,0 +1,93 @@
+# tests/test_metrics.py
+import pytest
+from fastapi.testclient import TestClient
+
+from TheWatch.core.scraper import GrailedScraper
+from TheWatch.data.exporters import SalesExporter
+from TheWatch.replay import ReplayServer
+from TheWatch.utils.metrics import Metrics, endpoint_label, metrics
+
+
+@pytest.fixture
+def enabled_metrics():
+    metrics.reset()
+    metrics.enable()
+    yield metrics
+    metrics.enable(False)
+    metrics.reset()
+
+
+def test_disabled_metrics_record_nothing():
+    registry = Metrics()
+    registry.inc('requests_total', endpoint='goods')
+    registry.observe('latency_seconds', 0.2)
+    with registry.timer('parse_seconds'):
+        pass
+    registry.cache('details', hit=True)
+    assert registry.render_prometheus() == "\n"
+
+
+def test_prometheus_rendering():
+    registry = Metrics(enabled=True)
+    registry.inc('requests_total', endpoint='goods', status=200)
+    registry.inc('requests_total', endpoint='goods', status=200)
+    registry.observe('latency_seconds', 0.02, endpoint='goods')
+    registry.cache('details', hit=True)
+    registry.cache('details', hit=False)
+    text = registry.render_prometheus()
+
+    assert 'requests_total{endpoint="goods",status="200"} 2' in text
+    assert 'latency_seconds_bucket{endpoint="goods",le="0.025"} 1' in text
+    assert 'latency_seconds_bucket{endpoint="goods",le="0.01"} 0' in text
+    assert 'latency_seconds_count{endpoint="goods"} 1' in text
+    assert 'thewatch_cache_hit_ratio{cache="details"} 0.5000' in text
+
+
+def test_endpoint_label():
+    assert endpoint_label("https://www.grailed.com") == "home"
+    assert endpoint_label("https://www.grailed.com/shop/nike+dunk") == "shop"
+    assert endpoint_label("http://127.0.0.1:8000/api/shop/abc123/goods") == "goods"
+    details = endpoint_label("https://www.grailed.com/api/listings/123")
+    assert details == "listing_details"
+
+
+async def test_scrape_and_export_are_instrumented(enabled_metrics, tmp_path):
+    async with ReplayServer(pages=1, per_page=5, throttle_every=4) as server:
+        scraper = GrailedScraper(base_url=server.url)
+        try:
+            sales = await scraper.search_listings("nike dunk")
+            # The 4th request (the shop page) is throttled
+            await scraper.search_listings("nike dunk")
+        finally:
+            await scraper.close()
+    SalesExporter(output_dir=str(tmp_path)).export_csv(sales, "test")
+
+    value = enabled_metrics.counter_value
+    assert value('thewatch_http_responses_total', endpoint='goods', status=200) == 1
+    assert value('thewatch_rate_limited_total', endpoint='shop') == 1
+    assert value('thewatch_http_response_bytes_total', endpoint='goods') > 0
+    assert value('thewatch_listings_processed_total', source='scraper') == 5
+    assert value('thewatch_exported_rows_total', format='csv') == 5
+    summary = "\n".join(enabled_metrics.summary())
+    assert 'thewatch_http_request_seconds{endpoint="goods"}' in summary
+    assert 'thewatch_normalize_seconds{source="scraper"}' in summary
+
+
+def test_metrics_endpoint(monkeypatch):
+    from TheWatch.web import app as web_app
+
+    # Importing the app leaves collection alone; startup turns it on from settings
+    assert not metrics.enabled
+    monkeypatch.setattr(web_app.settings, "metrics_enabled", True)
+    metrics.reset()
+    with TestClient(web_app.app) as client:
+        assert metrics.enabled
+        metrics.inc('thewatch_http_responses_total', endpoint='goods', status=200)
+        response = client.get("/metrics")
+    metrics.reset()
+    assert not metrics.enabled
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    expected = 'thewatch_http_responses_total{endpoint="goods",status="200"} 1'
+    assert expected in response.text
\ No newline at end of file
@@ -0,0 +1,89 @@
+# tests/test_monitor.py
+import time
+from datetime import datetime
+
+from TheWatch.core.models import WatchQuery
+from TheWatch.core.monitor import ShardedMonitor, split_queries
+from TheWatch.core.ratelimit import RateLimiter
+
+
+class FakeScraper:
+    """Stands in for GrailedScraper inside worker processes"""
+
+    def __init__(self, rate_limiter=None):
+        self.rate_limiter = rate_limiter
+
+    async def get_search_url(self, query):
+        return query
+
+    async def get_listings_page(self, url, page=1):
+        await self.rate_limiter.acquire()
+        if url == "boom":
+            raise RuntimeError("upstream exploded")
+        return [
+            {
+                'id': hash(url) % 1000 + i,
+                'title': f"{url} {i}",
+                'price': 100.0,
+                'designer_names': ["Nike"],
+                'size': "L",
+                'condition': "is_new",
+                'location': "US",
+                'seller': {'username': "seller"},
+                'created_at': datetime(2024, 11, 15).isoformat(),
+                'category': "tops",
+            }
+            for i in range(3)
+        ]
+
+    async def close(self):
+        pass
+
+
+def test_split_queries():
+    queries = [WatchQuery(str(i)) for i in range(5)]
+    shards = split_queries(queries, 3)
+    assert [[q.query for q in s] for s in shards] == [["0", "3"], ["1", "4"], ["2"]]
+    assert len(split_queries(queries[:1], 4)) == 1
+
+
+async def test_rate_limiter_budget():
+    limiter = RateLimiter(max_requests=5, window=0.5)
+    started = time.monotonic()
+    for _ in range(7):
+        await limiter.acquire()
+    # 5 burst tokens, then two more at 10/s
+    assert time.monotonic() - started >= 0.15
+
+
+def test_sharded_monitor_aggregates_results_and_health():
+    monitor = ShardedMonitor(
+        ["nike dunk", "rick owens", "boom", "raf simons"],
+        workers=2,
+        max_requests=100,
+        window=1,
+        scraper_factory=FakeScraper
+    )
+    result = monitor.run(cycles=2)
+
+    assert len(result.health) == 2
+    assert result.results["nike dunk"] and len(result.results["nike dunk"]) == 3
+    assert result.results["boom"] == []
+    assert sum(h.completed for h in result.health) == 6
+    assert sum(h.failed for h in result.health) == 2
+    assert all(h.alive and h.cycles == 2 for h in result.health)
+    assert not result.healthy
+
+
+def test_shared_budget_is_global():
+    # 4 workers x 3 queries each would need 12 tokens; only 4 are available up front
+    monitor = ShardedMonitor(
+        [f"q{i}" for i in range(12)],
+        workers=4,
+        max_requests=4,
+        window=0.5,
+        scraper_factory=FakeScraper
+    )
+    result = monitor.run()
+    assert result.total_listings == 36
+    assert result.elapsed >= (12 - 4) * 0.5 / 4 * 0.9
\ No newline at end of file
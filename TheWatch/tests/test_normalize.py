@@ -0,0 +1,74 @@
+# tests/test_normalize.py
+from TheWatch.core.analytics import SalesAccumulator
+from TheWatch.core.models import SearchFilters
+from TheWatch.utils import normalize
+from TheWatch.utils.helpers import parse_condition, parse_size
+from TheWatch.utils.normalize import (
+    UNKNOWN, canonical_condition, canonical_size, condition_code, condition_label,
+    size_code, size_label
+)
+
+
+def test_regional_sizes_share_canonical_codes():
+    assert canonical_size("EU 42", "footwear") == "US 8.5"
+    assert canonical_size("UK 8", "footwear") == "US 9"
+    assert canonical_size("27cm", "footwear") == "US 9"
+    assert canonical_size("48", "outerwear") == "M"
+    assert canonical_size("Medium", "tops") == "M"
+    assert canonical_size("IT 50", "bottoms") == "W34"
+    assert canonical_size("32x30", "bottoms") == "W32"
+    assert canonical_size("one size", None) == "ONE SIZE"
+
+    assert (
+        size_code("EU 44", "footwear")
+        == size_code("10", "footwear")
+        == size_code("UK 9", "sneakers")
+    )
+    assert size_code("48", "outerwear") != size_code("48", "footwear")
+    assert size_label(size_code("xl", "tops")) == "XL"
+    assert size_code("", "tops") == UNKNOWN
+
+
+def test_conditions_resolve_to_one_code():
+    for raw in ("is_gently_used", "Gently Used", "gently-used", "like new"):
+        assert condition_label(condition_code(raw)) == "Gently Used"
+    assert condition_code("Brand new with tags") == condition_code("is_new")
+    assert condition_code("mystery") == UNKNOWN
+    assert canonical_condition("Very Worn") == "is_very_worn"
+    assert canonical_condition("mystery") == "mystery"
+    assert parse_condition("New") == "is_new"
+    assert parse_size("us 10") == "US 10"
+
+
+def test_filters_match_on_codes(make_sale):
+    sales = [
+        make_sale(1, size="EU 42", category="footwear"),
+        make_sale(2, size="US 8.5", category="sneakers", condition="Gently Used"),
+        make_sale(3, size="48", category="outerwear"),
+        make_sale(4, size="M", category="tops", condition="is_very_worn"),
+    ]
+    shoes = SearchFilters(sizes=["US 8.5"])
+    assert [s.id for s in sales if shoes.matches(s)] == [1, 2]
+
+    medium = SearchFilters(sizes=["Medium"], conditions=["used", "very worn"])
+    assert [s.id for s in sales if medium.matches(s)] == [3, 4]
+
+
+def test_analytics_group_by_code(make_sale):
+    acc = SalesAccumulator()
+    acc.extend([
+        make_sale(1, size="EU 42", category="footwear", condition="is_new"),
+        make_sale(2, size="8.5", category="footwear", condition="New"),
+        make_sale(3, size="M", category="tops", condition="Used"),
+    ])
+    snap = acc.snapshot()
+    assert snap.size_distribution == {"US 8.5": 2, "M": 1}
+    assert snap.condition_distribution == {"New": 2, "Used": 1}
+
+
+def test_lookups_are_memoized():
+    size_code.cache_clear()
+    for _ in range(100):
+        size_code("EU 43", "footwear")
+    info = normalize.cache_info()['size']
+    assert info.misses == 1 and info.hits == 99
\ No newline at end of file
@@ -0,0 +1,110 @@
+# tests/test_overlap.py
+from TheWatch.core.models import SearchFilters, WatchQuery
+from TheWatch.core.overlap import plan_queries, subsumes
+from TheWatch.core.scraper import normalize_listings
+
+TITLES = [
+    "Nike Dunk Low Panda", "Nike Dunk High", "Nike Air Max 90", "Nike Dunk Low Travis"
+]
+
+
+def make_listing(i: int, title: str, price: float) -> dict:
+    return {'id': i, 'title': title, 'price': price, 'designer_names': ["Nike"],
+            'size': "US 10", 'condition': "is_used", 'category': "footwear"}
+
+
+class CountingScraper:
+    """Pages of ten raw listings from `catalog` whose titles hold every search term"""
+
+    def __init__(self, catalog=None):
+        if catalog is None:
+            catalog = [
+                make_listing(i, title, 80.0 + 60 * i) for i, title in enumerate(TITLES)
+            ]
+        self.catalog = catalog
+        self.searches = []
+
+    async def get_search_url(self, query):
+        self.searches.append(query)
+        return query
+
+    async def get_listings_page(self, url, page=1):
+        terms = url.lower().split()
+        hits = [
+            listing for listing in self.catalog
+            if all(t in listing['title'].lower() for t in terms)
+        ]
+        return hits[(page - 1) * 10:page * 10]
+
+
+def test_subsumption_needs_terms_and_filters():
+    nike = WatchQuery("nike", SearchFilters(max_price=200))
+    assert subsumes(WatchQuery("nike dunk"), WatchQuery("Nike Dunk Low"))
+    assert not subsumes(WatchQuery("nike dunk low"), WatchQuery("nike dunk"))
+    dunk_under_150 = WatchQuery("nike dunk", SearchFilters(min_price=50, max_price=150))
+    assert subsumes(nike, dunk_under_150)
+    assert not subsumes(nike, WatchQuery("nike dunk"))
+    assert subsumes(WatchQuery("nike", SearchFilters(conditions=["used", "new"])),
+                    WatchQuery("nike dunk", SearchFilters(conditions=["is_new"])))
+    assert not subsumes(WatchQuery("nike", SearchFilters(designers=["nike"])),
+                        WatchQuery("nike dunk", SearchFilters(designers=["adidas"])))
+
+
+async def test_plan_shares_fetches_and_derives_locally():
+    queries = [
+        WatchQuery("nike dunk low"),
+        WatchQuery("nike", SearchFilters(max_price=200)),
+        WatchQuery("nike dunk"),
+        WatchQuery("nike air", SearchFilters(max_price=150)),
+        WatchQuery("salomon"),
+    ]
+    plan = plan_queries(queries)
+    assert plan.queries == 5
+    assert plan.fetches == 3
+    assert sorted(g.query for g in plan.groups) == ["nike", "nike dunk", "salomon"]
+
+    scraper = CountingScraper()
+    results = await plan.execute(scraper)
+    assert sorted(scraper.searches) == ["nike", "nike dunk", "salomon"]
+
+    for query in queries:
+        raw = await CountingScraper().get_listings_page(query.query)
+        direct = normalize_listings(raw, query.filters)
+        expected = [s.id for s in direct]
+        assert [s.id for s in results[query.query]] == expected
+
+
+async def test_failed_fetch_fails_every_member():
+    class Failing(CountingScraper):
+        async def get_search_url(self, query):
+            raise RuntimeError("down")
+
+    results = await plan_queries(["nike", "nike dunk"]).execute(Failing())
+    assert all(isinstance(outcome, RuntimeError) for outcome in results.values())
+    assert len(results) == 2
+
+
+async def test_full_broad_page_is_not_shared():
+    # 12 air listings fill the first page of "nike" before any dunk turns up
+    catalog = [make_listing(i, "Nike Air Max", 100.0) for i in range(12)]
+    catalog += [make_listing(100 + i, "Nike Dunk Low", 100.0 + i) for i in range(3)]
+
+    queries = ["nike", WatchQuery("nike", SearchFilters(max_price=100)), "nike dunk"]
+    plan = plan_queries(queries, page_size=10)
+    assert plan.fetches == 1
+
+    scraper = CountingScraper(catalog)
+    results = await plan.execute(scraper)
+    # Filters on the same terms are still derived; the extra term is searched directly
+    assert scraper.searches == ["nike", "nike dunk"]
+    assert plan.searches == 2
+    assert [s.id for s in results["nike dunk"]] == [100, 101, 102]
+    assert len(results["nike"]) == 10
+
+    # Once the broad search fits on a page, everything is derived from it
+    del catalog[:8]
+    scraper = CountingScraper(catalog)
+    results = await plan.execute(scraper)
+    assert scraper.searches == ["nike"]
+    assert plan.searches == 3
+    assert [s.id for s in results["nike dunk"]] == [100, 101, 102]
\ No newline at end of file
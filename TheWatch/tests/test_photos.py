@@ -0,0 +1,83 @@
+# tests/test_photos.py
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from TheWatch.data.photos import PhotoCache, PhotoFetcher
+from TheWatch.replay import ReplayServer
+
+
+@pytest.fixture
+def executor():
+    pool = ThreadPoolExecutor(max_workers=2)
+    yield pool
+    pool.shutdown()
+
+
+async def test_photos_are_cached_by_content(tmp_path, executor):
+    cache = PhotoCache(str(tmp_path / "photos"))
+    async with ReplayServer() as server:
+        fetcher = PhotoFetcher(cache, concurrency=2, executor=executor)
+        urls = [
+            f"{server.url}/images/{name}.png" for name in ("a", "b", "same-1", "same-2")
+        ]
+        try:
+            first = await fetcher.fetch_all(urls + urls[:1])
+            second = await fetcher.fetch_all(urls)
+        finally:
+            await fetcher.close()
+        assert server.stats.images == 4
+
+    assert first == second
+    assert len(set(first.values())) == 3
+    assert first[urls[2]] == first[urls[3]]
+    assert cache.path(first[urls[0]]).read_bytes().startswith(b"\x89PNG")
+    cache.close()
+
+
+async def test_thumbnails_are_generated(tmp_path, executor):
+    Image = pytest.importorskip("PIL.Image")
+    cache = PhotoCache(str(tmp_path / "photos"))
+    async with ReplayServer() as server:
+        fetcher = PhotoFetcher(cache, thumbnail_size=16, executor=executor)
+        try:
+            digest = await fetcher.fetch(f"{server.url}/images/x.png")
+        finally:
+            await fetcher.close()
+
+    with Image.open(cache.thumbnail(digest)) as thumbnail:
+        assert max(thumbnail.size) == 16
+    cache.close()
+
+
+async def test_eviction_drops_least_recently_used(tmp_path, executor):
+    cache = PhotoCache(str(tmp_path / "photos"), max_bytes=10 ** 9)
+    async with ReplayServer() as server:
+        fetcher = PhotoFetcher(cache, executor=executor)
+        try:
+            digests = [
+                await fetcher.fetch(f"{server.url}/images/{i}.png") for i in range(3)
+            ]
+            await asyncio.sleep(0.01)
+            await fetcher.fetch(f"{server.url}/images/0.png")  # refresh 0
+        finally:
+            await fetcher.close()
+
+    size = cache.path(digests[0]).stat().st_size
+    cache.max_bytes = size * 2
+    assert cache.evict() == 1
+    assert cache.lookup(f"{server.url}/images/1.png") is None
+    assert cache.lookup(f"{server.url}/images/0.png") == digests[0]
+    assert not cache.path(digests[1]).exists()
+    cache.close()
+
+
+async def test_default_process_pool(tmp_path):
+    cache = PhotoCache(str(tmp_path / "photos"))
+    async with ReplayServer() as server:
+        fetcher = PhotoFetcher(cache)
+        try:
+            assert await fetcher.fetch(f"{server.url}/images/p.png")
+        finally:
+            await fetcher.close()
+    cache.close()
\ No newline at end of file
@@ -0,0 +1,77 @@
+# tests/test_pipeline.py
+import time
+
+from TheWatch.core.models import SearchFilters, WatchQuery
+from TheWatch.core.pipeline import Pipeline
+from TheWatch.core.scraper import GrailedScraper
+from TheWatch.data.exporters import SalesExporter
+from TheWatch.data.store import SalesStore
+from TheWatch.replay import ReplayServer
+
+
+class SlowStore:
+    """Store whose writes take long enough for the queues in front of it to fill"""
+
+    def __init__(self):
+        self.batches = 0
+
+    def upsert(self, sales, query=None):
+        time.sleep(0.02)
+        self.batches += 1
+        return len(sales)
+
+
+async def test_pipeline_stores_and_exports_every_page(tmp_path):
+    store = SalesStore(str(tmp_path / "sales.db"))
+    async with ReplayServer(pages=3, per_page=10) as server:
+        scraper = GrailedScraper(base_url=server.url)
+        exporter = SalesExporter(output_dir=str(tmp_path / "exports"))
+        pipeline = Pipeline(scraper, store, exporter,
+                            fetch_concurrency=2, parse_workers=2, max_pages=5)
+        try:
+            result = await pipeline.run([
+                "rick owens", "raf simons",
+                WatchQuery("acne", SearchFilters(min_price=10**6)),
+            ])
+        finally:
+            await scraper.close()
+
+    assert len(result.sales) == 2 * 3 * 10
+    assert store.count() == 60
+    assert result.exported and list((tmp_path / "exports").glob("*.csv"))
+    summary = result.summary()
+    assert summary['fetch']['items'] == 9 and summary['parse']['items'] == 9
+    assert summary['parse']['listings_per_sec'] > 0
+    assert summary['store']['items'] == 9 and result.stages['export'].listings == 60
+    assert result.bottleneck in summary
+    store.close()
+
+
+async def test_bounded_queues_hold_back_fetching():
+    store = SlowStore()
+    async with ReplayServer(pages=10, per_page=5) as server:
+        scraper = GrailedScraper(base_url=server.url)
+        pipeline = Pipeline(scraper, store, fetch_concurrency=4, parse_workers=1,
+                            queue_size=2, max_pages=10)
+        try:
+            result = await pipeline.run([f"query {i}" for i in range(4)])
+        finally:
+            await scraper.close()
+
+    assert store.batches == 40 and len(result.sales) == 200
+    assert all(
+        result.stages[name].max_depth <= 2 for name in ('parse', 'store', 'export')
+    )
+    assert result.bottleneck == 'store'
+    assert result.stages['store'].mean_depth > result.stages['export'].mean_depth
+
+
+async def test_parse_stage_in_processes(tmp_path):
+    async with ReplayServer(pages=2, per_page=5) as server:
+        scraper = GrailedScraper(base_url=server.url)
+        try:
+            pipeline = Pipeline(scraper, processes=True, max_pages=3)
+            result = await pipeline.run(["rick owens"])
+        finally:
+            await scraper.close()
+    assert len(result.sales) == 10 and result.stages['parse'].errors == 0
\ No newline at end of file
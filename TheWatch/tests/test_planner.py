@@ -0,0 +1,56 @@
+# tests/test_planner.py
+from TheWatch.core.models import SearchFilters
+from TheWatch.core.planner import CrawlPlanner, Partition
+from TheWatch.core.scraper import GrailedScraper
+from TheWatch.replay import ReplayServer
+
+
+async def test_partitions_cover_catalog_beyond_page_cap():
+    async with ReplayServer(pages=3, per_page=20, catalog_size=1500) as server:
+        scraper = GrailedScraper(base_url=server.url)
+        pages = []
+        try:
+            result = await CrawlPlanner(scraper, page_cap=3, concurrency=4).run(
+                "rick owens",
+                on_page=lambda part, page, sales: pages.append(
+                    (part, page, len(sales))
+                ),
+            )
+        finally:
+            await scraper.close()
+
+    catalog = server.catalog(next(iter(server._catalogs)))
+    catalog_ids = {listing["id"] for listing in catalog}
+    assert {sale.id for sale in result.sales} == catalog_ids
+    assert len(result.sales) == 1500
+    assert result.splits > 0 and not result.truncated and not result.failed
+    assert result.uncovered == 0
+    assert result.requests == server.stats.goods_pages == len(pages)
+    # Within 2x of the 75 pages an uncapped API would need
+    assert result.requests < 150
+
+
+async def test_unlisted_categories_are_reported_and_filters_narrow_the_root():
+    async with ReplayServer(pages=2, per_page=20, catalog_size=400) as server:
+        scraper = GrailedScraper(base_url=server.url)
+        try:
+            partial = await CrawlPlanner(
+                scraper, page_cap=2, categories=["tops", "bottoms"]
+            ).run("acne")
+            cheap = await CrawlPlanner(scraper, page_cap=2).run(
+                "acne", SearchFilters(max_price=100)
+            )
+        finally:
+            await scraper.close()
+
+    catalog = server.catalog(next(iter(server._catalogs)))
+    assert partial.uncovered > 0
+    assert len(partial.sales) < len(catalog)
+    cheap_ids = {row["id"] for row in catalog if row["price"] <= 100}
+    assert {s.id for s in cheap.sales} == cheap_ids
+
+
+def test_partition_params():
+    part = Partition(category="tops", min_price=50.0, max_price=120.0)
+    assert part.params() == {"category": "tops", "price_min": 50.0, "price_max": 120.0}
+    assert str(Partition()) == "all"
\ No newline at end of file
@@ -0,0 +1,154 @@
+# tests/test_rules.py
+import asyncio
+import random
+
+import pytest
+from TheWatch.core.models import Sale, SearchFilters
+from TheWatch.core.rules import (
+    AlertBatcher, AlertRule, PriceIntervals, RuleIndex, load_rules
+)
+from TheWatch.scripts.rules_benchmark import run_rules_benchmark
+
+DESIGNERS = [
+    "Rick Owens", "Rick Owens DRKSHDW", "Raf Simons", "Acne Studios",
+    "Maison Margiela", "Nike"
+]
+SIZES = ["48", "M", "US 10", "EU 43", "32", "W32", "L"]
+CATEGORIES = ["tops", "footwear", "bottoms", "accessories"]
+CONDITIONS = ["is_new", "is_gently_used", "is_used", "is_very_worn", "mystery"]
+
+
+def random_sale(make_sale, i: int, rng: random.Random) -> Sale:
+    return make_sale(i, rng.choice([45.0, 120.0, 250.0, 399.0, 400.0, 800.0]),
+                     original_price=900.0, designer=rng.choice(DESIGNERS),
+                     size=rng.choice(SIZES), condition=rng.choice(CONDITIONS),
+                     category=rng.choice(CATEGORIES),
+                     location=rng.choice(["US", "Europe"]))
+
+
+def make_rule(i: int, rng: random.Random) -> AlertRule:
+    def pick(options, k):
+        return rng.sample(options, rng.randint(1, k)) if rng.random() < 0.6 else None
+
+    low = rng.choice([None, 50, 120, 300])
+    return AlertRule(f"rule-{i}", SearchFilters(
+        min_price=low,
+        max_price=rng.choice([None, 120, 400, 1000]),
+        designers=pick(
+            ["rick owens", "drkshdw", "raf", "acne", "margiela", "nike", "ick"], 2
+        ),
+        sizes=pick(SIZES, 2),
+        conditions=pick(["new", "gently used", "used", "worn"], 2),
+        locations=["europe"] if rng.random() < 0.1 else None,
+        categories=["foot"] if rng.random() < 0.1 else None,
+    ))
+
+
+def test_price_intervals_match_brute_force():
+    rng = random.Random(1)
+    intervals = PriceIntervals()
+    spans = {}
+    for i in range(500):
+        low = rng.choice([float('-inf'), rng.uniform(0, 500)])
+        bounded = (
+            low + rng.uniform(0, 300) if low > float('-inf') else rng.uniform(0, 500)
+        )
+        high = rng.choice([float('inf'), bounded])
+        intervals.add(i, low, high)
+        spans[i] = (low, high)
+    for i in range(0, 500, 3):
+        intervals.discard(i)
+        del spans[i]
+    prices = [0.0, 99.5, 250.0, 499.9, 900.0] + [rng.uniform(0, 800) for _ in range(50)]
+    for price in prices:
+        expected = {k for k, (low, high) in spans.items() if low <= price <= high}
+        assert sorted(intervals.stab(price)) == sorted(expected)
+
+
+def test_index_agrees_with_filters(make_sale):
+    rng = random.Random(7)
+    rules = [make_rule(i, rng) for i in range(2000)]
+    index = RuleIndex(rules)
+    for i in range(300):
+        sale = random_sale(make_sale, i, rng)
+        expected = {rule.id for rule in rules if rule.filters.matches(sale)}
+        assert {rule.id for rule in index.match(sale)} == expected
+
+    # Removing and replacing rules keeps the partitions consistent
+    for rule in rules[::2]:
+        assert index.remove(rule.id)
+    replaced = AlertRule(rules[1].id, SearchFilters(designers=["nike"], max_price=100))
+    index.add(replaced)
+    live = [replaced] + [rule for rule in rules[3::2]]
+    assert len(index) == len(live)
+    for i in range(300, 500):
+        sale = random_sale(make_sale, i, rng)
+        expected = {rule.id for rule in live if rule.filters.matches(sale)}
+        assert {rule.id for rule in index.match(sale)} == expected
+
+
+def test_example_rule(make_sale):
+    rule = AlertRule("r1", SearchFilters(designers=["Rick Owens"], sizes=["48"],
+                                         max_price=400,
+                                         conditions=["is_new", "is_gently_used"]))
+    index = RuleIndex([rule])
+    sale = make_sale(1, 380.0, title="Geobasket", original_price=600.0,
+                     designer="Rick Owens", size="48", condition="Gently Used",
+                     category="tops")
+    assert index.match(sale) == [rule]
+    sale.price = 401.0
+    assert index.match(sale) == []
+    sale.price, sale.condition = 200.0, "is_used"
+    assert index.match(sale) == []
+
+
+def test_batcher_sends_one_notification_per_rule(make_sale):
+    now = [0.0]
+    sent = []
+    index = RuleIndex([
+        AlertRule("cheap", SearchFilters(max_price=150)),
+        AlertRule("nike", SearchFilters(designers=["nike"])),
+    ])
+
+    def notify(rule, sales):
+        sent.append((rule.id, [s.id for s in sales]))
+
+    batcher = AlertBatcher(index, notify, max_batch=3, max_delay=60,
+                           clock=lambda: now[0])
+
+    def sale(i, price, designer):
+        return make_sale(i, price, designer=designer)
+
+    assert batcher.add([sale(1, 100, "Acne"), sale(2, 500, "Nike")]) == 0
+    assert batcher.add(
+        [sale(1, 100, "Acne"), sale(3, 90, "Raf"), sale(4, 80, "Nike")]
+    ) == 1
+    assert sent == [("cheap", [1, 3, 4])]
+    now[0] = 61
+    assert batcher.flush() == 1
+    assert sent[1] == ("nike", [2, 4]) and batcher.pending == 0
+    batcher.add([sale(5, 10, "Raf")])
+    assert batcher.flush(force=True) == 1 and sent[-1] == ("cheap", [5])
+
+
+async def test_batcher_flushes_on_a_timer(tmp_path, make_sale):
+    rules_file = tmp_path / "rules.txt"
+    rules_file.write_text("# alerts\ncheap | max_price=150\n"
+                          "rick 48 | designers=Rick Owens sizes=48\n")
+    rules = load_rules(str(rules_file))
+    assert [rule.id for rule in rules] == ["cheap", "rick 48"]
+
+    sent = []
+    batcher = AlertBatcher(RuleIndex(rules), lambda rule, sales: sent.append(rule.id),
+                           max_delay=0.05)
+    batcher.add([make_sale(1, 100.0)])
+    flusher = asyncio.create_task(batcher.flush_every(0.01))
+    await asyncio.sleep(0.2)
+    flusher.cancel()
+    assert sent == ["cheap"] and batcher.pending == 0
+
+
+@pytest.mark.benchmark
+def test_index_beats_linear_scan():
+    summary = run_rules_benchmark(rules=20_000, sales=200, linear_sales=5)
+    assert summary['speedup'] > 50
\ No newline at end of file
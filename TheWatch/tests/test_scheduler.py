@@ -0,0 +1,81 @@
+# tests/test_scheduler.py
+import itertools
+
+from TheWatch.core.models import WatchQuery
+from TheWatch.core.scheduler import AdaptiveScheduler, allocate
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    async def sleep(self, seconds):
+        self.now += seconds
+
+
+class StreamScraper:
+    """Each search returns `per_poll[query]` listings that were not there last time"""
+
+    def __init__(self, per_poll):
+        self.per_poll = per_poll
+        self.ids = itertools.count(1)
+        self.searches = []
+
+    async def get_search_url(self, query):
+        self.searches.append(query)
+        return query
+
+    async def get_listings_page(self, url, page=1):
+        return [{'id': i, 'title': f"{url} {i}", 'price': 100.0,
+                 'designer_names': ["Acne"], 'size': "M", 'condition': "is_used"}
+                for i in itertools.islice(self.ids, self.per_poll[url])]
+
+
+def test_allocate_is_proportional_within_bounds():
+    freqs = allocate([4.0, 1.0, 0.0], [0.1, 0.1, 0.1], [10, 10, 10], 2.0)
+    assert abs(sum(freqs) - 2.0) < 1e-6
+    assert freqs[2] == 0.1
+    assert abs(freqs[0] / freqs[1] - 4.0) < 1e-6
+
+    assert allocate([1.0, 1.0], [0.5, 0.5], [1, 1], 0.5) == [0.25, 0.25]
+    assert allocate([1.0, 9.0], [0.1, 0.1], [0.2, 0.2], 5) == [0.2, 0.2]
+
+
+async def test_hot_queries_get_more_polls_within_budget():
+    clock = FakeClock()
+    scraper = StreamScraper({"hot": 6, "quiet": 0, "capped": 0})
+    scheduler = AdaptiveScheduler(
+        ["hot", "quiet", WatchQuery("capped", max_interval=300)],
+        budget=6, window=60, min_interval=20, max_interval=3600, halflife=120,
+        clock=clock, sleep=clock.sleep
+    )
+    report = await scheduler.run(scraper, duration=3 * 3600)
+
+    counts = {q: scraper.searches.count(q) for q in ("hot", "quiet", "capped")}
+    assert counts["hot"] > 10 * counts["quiet"]
+    # Never more than the budget of 6 searches a minute, never slower than max_interval
+    assert report.searches == len(scraper.searches) <= 6 * clock.now / 60 + 1
+    assert report.requests == 2 * report.searches
+    assert counts["capped"] >= clock.now // 300
+    intervals = scheduler.intervals()
+    assert intervals["hot"] >= 20 and intervals["capped"] <= 300
+    assert scheduler.stats["hot"].rate > 1.0 > scheduler.stats["quiet"].rate
+
+    # The baseline poll of each query finds nothing new
+    assert report.new_listings == 6 * (counts["hot"] - 1)
+    assert report.new_per_request == report.new_listings / report.requests
+
+
+async def test_overlapping_queries_share_polls():
+    clock = FakeClock()
+    scraper = StreamScraper({"acne": 2})
+    scheduler = AdaptiveScheduler(["acne", "acne studios"],
+                                  clock=clock, sleep=clock.sleep)
+    new = []
+    await scheduler.run(scraper, polls=3, on_new=lambda query, sales: new.append(query))
+    assert scraper.searches == ["acne"] * 3
+    assert new == ["acne", "acne"]
+    assert scheduler.stats["acne studios"].polls == 3
\ No newline at end of file
@@ -2,23 +2,45 @@
 import pytest
 from TheWatch.core.scraper import GrailedScraper
 from TheWatch.core.models import SearchFilters
+from TheWatch.replay import ReplayServer
 
 @pytest.mark.asyncio
 async def test_scraper_initialization():
     scraper = GrailedScraper()
     assert scraper.base_url == "https://www.grailed.com"
-    assert scraper.search_url == "https://www.grailed.com/shop"
-    assert len(scraper.user_agents) > 0
+    assert scraper.session is None
+    assert 'User-Agent' in scraper.headers
 
 @pytest.mark.asyncio
-async def test_build_search_url():
-    scraper = GrailedScraper()
-    filters = SearchFilters(
-        min_price=100,
-        max_price=500,
-        designers=['Nike']
-    )
-    url = scraper._build_search_url("test query", filters, page=1)
-    assert "test query" in url
-    assert "price[min]=100" in url
-    assert "price[max]=500" in url
+async def test_search_listings_against_replay_server():
+    async with ReplayServer(pages=2, per_page=10) as server:
+        scraper = GrailedScraper(base_url=server.url)
+        try:
+            listings = await scraper.search_listings(
+                "nike dunk", SearchFilters(max_price=500)
+            )
+            url = await scraper.get_search_url("nike dunk")
+            second_page = await scraper.get_listings_page(url, page=2)
+            past_end = await scraper.get_listings_page(url, page=3)
+        finally:
+            await scraper.close()
+
+    assert url.startswith("https://www.grailed.com/shop/")
+    assert len(listings) == 10
+    assert len({listing.id for listing in listings}) == 10
+    assert listings[0].designer == "Nike"
+    assert listings[0].description == "Dunk Low Panda in great shape.\n Ships fast."
+    assert len(second_page) == 10
+    assert past_end == []
+
+@pytest.mark.asyncio
+async def test_rate_limited_page_is_skipped():
+    # Homepage, shop page, then the goods request gets a 429
+    async with ReplayServer(throttle_every=3) as server:
+        scraper = GrailedScraper(base_url=server.url)
+        try:
+            listings = await scraper.search_listings("rick owens")
+        finally:
+            await scraper.close()
+        assert server.stats.throttled == 1
+    assert listings == []
\ No newline at end of file
@@ -0,0 +1,66 @@
+# tests/test_sellers.py
+import statistics
+from dataclasses import replace
+
+from fastapi.testclient import TestClient
+from TheWatch.data.sellers import SellerIndex
+from TheWatch.data.store import SalesStore
+
+
+def test_stats_track_updates(make_sale):
+    index = SellerIndex()
+    prices = [35.0, 80.0, 120.0, 150.0, 410.0, 999.0, 60.0]
+    for i, price in enumerate(prices):
+        original = price * 2 if i % 2 else price
+        index.add(make_sale(i, price, seller="archive_jp", original_price=original))
+    assert not index.add(make_sale(100, 10.0, seller="Unknown"))
+
+    stats = index.get("ARCHIVE_JP")
+    assert stats.listings == 7 and stats.total_value == sum(prices)
+    median = statistics.median(prices)
+    assert abs(stats.median_price - median) <= median * 0.02
+    assert stats.typical_discount == 0
+    assert stats.last_active == make_sale(6, 60.0).created_at
+
+    # Re-ingesting a listing replaces its old contribution, including a move to
+    # another seller
+    index.add(make_sale(0, 35.0, seller="archive_jp", original_price=100.0))
+    index.add(make_sale(2, 120.0, seller="archive_jp", original_price=240.0))
+    assert index.get("archive_jp").typical_discount == 50
+    index.add(make_sale(6, 60.0, seller="other"))
+    assert index.get("archive_jp").listings == 6 and index.get("other").listings == 1
+    index.add(make_sale(6, 60.0, seller="archive_jp"))
+    assert index.get("other") is None and len(index) == 1
+
+
+def test_top_and_refresh_from_store(tmp_path, make_sale):
+    store = SalesStore(str(tmp_path / "sales.db"))
+    store.upsert([make_sale(i, 100.0, seller="big") for i in range(5)])
+    store.upsert([
+        make_sale(i, 50.0, seller="deals", original_price=200.0) for i in range(5, 8)
+    ])
+    store.upsert([make_sale(8, 300.0, seller="late")])
+    index = SellerIndex(store, min_refresh_interval=0)
+
+    assert [s.seller for s in index.top(2)] == ["big", "deals"]
+    assert [s.seller for s in index.top(1, by="discount")] == ["deals"]
+    assert [s.seller for s in index.top(1, by="recent")] == ["late"]
+    assert [s.seller for s in index.top(5, by="discount", min_listings=4)] == ["big"]
+
+    store.upsert([
+        replace(make_sale(i, 40.0, seller="late"), id=100 + i) for i in range(6)
+    ])
+    assert index.top(1)[0].seller == "late" and index.get("late").listings == 7
+
+
+def test_seller_endpoints(tmp_path, make_sale, api_app):
+    store = SalesStore(str(tmp_path / "sales.db"))
+    store.upsert([make_sale(i, 100.0 + i, seller="big") for i in range(3)]
+                 + [make_sale(3, 20.0, seller="small")])
+    client = TestClient(api_app(_sellers=SellerIndex(store, min_refresh_interval=0)))
+
+    ranked = client.get("/api/sellers", params={"limit": 1}).json()
+    assert [s["seller"] for s in ranked["sellers"]] == ["big"]
+    assert client.get("/api/sellers/SMALL").json()["listings"] == 1
+    assert client.get("/api/sellers/nobody").status_code == 404
+    assert client.get("/api/sellers", params={"sort": "cheapest"}).status_code == 422
\ No newline at end of file
@@ -0,0 +1,80 @@
+# tests/test_session.py
+import asyncio
+import json
+
+from TheWatch.core.api import GrailedAPI
+from TheWatch.core.scraper import GrailedScraper
+from TheWatch.core.session import SessionState
+from TheWatch.replay import ReplayServer
+
+
+async def search(server, state, client=GrailedScraper):
+    scraper = client(base_url=server.url, session_state=state)
+    try:
+        if client is GrailedAPI:
+            return await scraper.search_sales("rick owens")
+        return await scraper.search_listings("rick owens")
+    finally:
+        await scraper.close()
+
+
+async def test_warm_start_skips_homepage(tmp_path):
+    state = SessionState(str(tmp_path / "session.json"))
+    async with ReplayServer(pages=1, per_page=5, require_session=True) as server:
+        assert len(await search(server, state)) == 5
+        assert server.stats.warmups == 1
+        saved = json.loads((tmp_path / "session.json").read_text())
+        assert saved["base_url"] == server.url
+        assert saved["cookies"][0]["name"] == "grailed_session"
+
+        # Later sessions, scraper or API, reuse the saved cookies
+        assert len(await search(server, state)) == 5
+        assert len(await search(server, state, GrailedAPI)) == 5
+        assert server.stats.warmups == 1 and server.stats.rejected == 0
+
+
+async def test_rejected_cookies_rewarm_once(tmp_path):
+    state = SessionState(str(tmp_path / "session.json"))
+    async with ReplayServer(pages=1, per_page=5, require_session=True) as server:
+        await search(server, state)
+        server.expire_sessions()
+        assert len(await search(server, state)) == 5
+        assert server.stats.warmups == 2 and server.stats.rejected == 1
+        # The fresh cookies were saved for the next run
+        assert len(await search(server, state)) == 5
+        assert server.stats.warmups == 2
+
+
+async def test_concurrent_rejections_share_one_rewarm(tmp_path):
+    state = SessionState(str(tmp_path / "session.json"))
+    replay = ReplayServer(pages=1, per_page=5, require_session=True, latency=0.02)
+    async with replay as server:
+        await search(server, state)
+        server.expire_sessions()
+        api = GrailedAPI(base_url=server.url, session_state=state)
+        try:
+            found = await asyncio.gather(
+                *(api.search_sales(f"query {i}") for i in range(6))
+            )
+        finally:
+            await api.close()
+        # Every request sent with the revoked cookies was retried after a single warm-up
+        assert [len(sales) for sales in found] == [5] * 6
+        assert server.stats.warmups == 2 and server.stats.rejected == 6
+
+
+async def test_expired_or_foreign_state_warms_up(tmp_path):
+    path = tmp_path / "session.json"
+    async with ReplayServer(pages=1, per_page=5, require_session=True) as server:
+        await search(server, SessionState(str(path)))
+        saved = json.loads(path.read_text())
+        path.write_text(json.dumps({**saved, "expires_at": saved["warmed_at"] - 1}))
+        await search(server, SessionState(str(path)))
+        assert server.stats.warmups == 2
+
+        moved = {**json.loads(path.read_text()), "base_url": "https://example.com"}
+        path.write_text(json.dumps(moved))
+        await search(server, SessionState(str(path)))
+        await search(server, SessionState(str(path), ttl=0))
+        await search(server, None)
+        assert server.stats.warmups == 5 and server.stats.rejected == 0
\ No newline at end of file
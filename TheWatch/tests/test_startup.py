@@ -0,0 +1,16 @@
+# tests/test_startup.py
+import pytest
+from TheWatch.scripts.import_budget import CASES, check
+
+
+@pytest.mark.parametrize("case", sorted(CASES))
+def test_heavy_modules_stay_unloaded(case):
+    assert check(case, timed=False) == []
+
+
+# Wall-clock budgets depend on the machine; run with `pytest -m benchmark` or
+# scripts/import_budget.py
+@pytest.mark.benchmark
+@pytest.mark.parametrize("case", sorted(CASES))
+def test_import_budget(case):
+    assert check(case) == []
\ No newline at end of file
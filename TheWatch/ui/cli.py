@@ -1,16 +1,39 @@
+import argparse
 import asyncio
-from typing import Optional
-from rich.console import Console
-from rich.progress import Progress, SpinnerColumn, TextColumn
+from typing import List, Optional
 from ..core.models import SearchFilters, Sale
-from ..core.scraper import GrailedScraper
+from ..utils.logger import configure_logging
+from ..utils.metrics import metrics
 
-console = Console()
+
+_console = None
+
+
+def get_console():
+    """Return the shared rich Console, importing rich on first use"""
+    global _console
+    if _console is None:
+        from rich.console import Console
+        _console = Console()
+    return _console
+
+
+class _LazyConsole:
+    """Module-level `console` proxy so `--help` never imports rich"""
+
+    def __getattr__(self, name):
+        return getattr(get_console(), name)
+
+
+console = _LazyConsole()
 
 
 class CLI:
     def __init__(self):
-        self.scraper = GrailedScraper()
+        from ..core.config import settings
+        from ..core.scraper import GrailedScraper
+        self.scraper = GrailedScraper(base_url=settings.base_url,
+                                      session_state=_session_state(settings))
 
     def _get_filters_from_input(self) -> SearchFilters:
         filters = SearchFilters()
@@ -68,6 +91,8 @@ class CLI:
         return "\n".join(lines)
 
     async def run(self):
+        from rich.progress import Progress, SpinnerColumn, TextColumn
+
         console.print("[bold]Grailed Sales Monitor[/bold]")
         console.print("Enter search terms to monitor sales. Type 'quit' to exit.")
 
@@ -87,7 +112,7 @@ class CLI:
                     with Progress(
                             SpinnerColumn(),
                             TextColumn("[progress.description]{task.description}"),
-                            console=console
+                            console=get_console()
                     ) as progress:
                         progress.add_task("Fetching search URL...", total=None)
                         listings = await self.scraper.search_listings(query, filters)
@@ -117,10 +142,645 @@ class CLI:
             await self.scraper.close()
 
 
-def main():
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="thewatch",
+        description=(
+            "Grailed sales monitor. "
+            "Run without arguments for an interactive search prompt."
+        )
+    )
+    subparsers = parser.add_subparsers(dest="command")
+
+    search = subparsers.add_parser(
+        "search",
+        help="Run many searches concurrently without prompts",
+        description="Run queries concurrently under one session and rate budget. "
+                    "Query files hold one query per line, optionally followed by "
+                    "'| key=value ...' filters, e.g. 'rick owens | max_price=400 "
+                    "sizes=48 conditions=is_new,is_gently_used'."
+    )
+    search.add_argument("queries", nargs="*", help="Search terms")
+    search.add_argument("-f", "--file", help="File with one query per line")
+    search.add_argument("--min-price", type=float, help="Minimum price for every query")
+    search.add_argument("--max-price", type=float, help="Maximum price for every query")
+    search.add_argument("--designer", action="append", dest="designers",
+                        help="Designer filter (repeatable)")
+    search.add_argument("--condition", action="append", dest="conditions",
+                        help="Condition filter (repeatable)")
+    search.add_argument("--size", action="append", dest="sizes",
+                        help="Size filter (repeatable)")
+    search.add_argument("-c", "--concurrency", type=int, default=8,
+                        help="Searches in flight at once")
+    search.add_argument("--rate", type=int,
+                        help="Requests per minute across the batch (default: settings)")
+    search.add_argument("--export", choices=["csv", "excel"],
+                        help="Write combined results to a file")
+    search.add_argument("--output-dir", default="data/exports", help="Export directory")
+    search.add_argument("--name", default="batch",
+                        help="Name used in the export filename")
+    search.add_argument("--store", metavar="PATH",
+                        help="Stream results into a SQLite listing store")
+    search.add_argument("--enrich", action="store_true",
+                        help="Fetch listing details (measurements, seller stats) "
+                             "for new listings; needs --store")
+    search.add_argument("--track", metavar="PATH",
+                        help="Log new listings and price changes to a lifecycle "
+                             "database")
+    search.add_argument("--archive", metavar="DIR",
+                        help="Keep every raw goods response in a compressed archive")
+    search.add_argument("--live", nargs="?", const="newest",
+                        choices=["newest", "cheapest", "discount"],
+                        help="Show a live dashboard of the top listings "
+                             "(default order: newest)")
+    search.add_argument("--top", type=int, default=10, help="Listings shown by --live")
+
+    crawl = subparsers.add_parser(
+        "crawl",
+        help="Fetch every page of queries into a store, resuming interrupted crawls",
+        description="Walk all goods pages of each query into a SQLite store. Progress "
+                    "is checkpointed after every page, so rerunning the same command "
+                    "after a crash continues where it stopped."
+    )
+    crawl.add_argument("queries", nargs="*", help="Search terms")
+    crawl.add_argument("-f", "--file",
+                       help="File with one query per line (same format as 'search')")
+    crawl.add_argument("--max-pages", type=int,
+                       help="Stop each query after this many pages")
+    crawl.add_argument("--store", metavar="PATH", default="data/sales.db",
+                       help="SQLite listing store")
+    crawl.add_argument("--checkpoint-dir", default="data/checkpoints",
+                       help="Crawl checkpoint directory")
+    crawl.add_argument("-c", "--concurrency", type=int, default=4,
+                       help="Queries crawled at once")
+    crawl.add_argument("--rate", type=int,
+                       help="Requests per minute across the crawl (default: settings)")
+    crawl.add_argument("--archive", metavar="DIR",
+                       help="Keep every raw goods response in a compressed archive")
+    crawl.add_argument("--track", metavar="PATH",
+                       help="Log listing changes to a lifecycle database, and removals "
+                            "once a query is fully crawled")
+    crawl.add_argument("--deep", action="store_true",
+                       help="Split queries larger than the pagination cap by category, "
+                            "price and size (not checkpointed)")
+
+    watch = subparsers.add_parser(
+        "watch",
+        help="Poll queries continuously, more often where new listings keep appearing",
+        description="Poll queries until interrupted, printing listings that were "
+                    "not there on the previous poll. The request budget goes to the "
+                    "queries that turn up new listings most often. Query files use "
+                    "the same format as 'search'."
+    )
+    watch.add_argument("queries", nargs="*", help="Search terms")
+    watch.add_argument("-f", "--file", help="File with one query per line")
+    watch.add_argument("--minutes", type=float,
+                       help="Stop after this long (default: until interrupted)")
+    watch.add_argument("--rate", type=int,
+                       help="Requests per minute across all queries "
+                            "(default: settings)")
+    watch.add_argument("--store", metavar="PATH",
+                       help="Stream new listings into a SQLite listing store")
+    watch.add_argument("--rules", metavar="PATH",
+                       help="Alert rules, one 'rule id | key=value ...' per line; new "
+                            "listings matching a rule are sent together as one alert")
+    watch.add_argument("--alert-delay", type=float, metavar="SECONDS",
+                       help="Longest a match waits for others to batch with "
+                            "(default: ALERT_MAX_DELAY)")
+
+    reprocess = subparsers.add_parser(
+        "reprocess",
+        help="Rebuild a listing store from an archive of raw responses, "
+             "without network access"
+    )
+    reprocess.add_argument("--archive", metavar="DIR", default="data/archive",
+                           help="Response archive directory")
+    reprocess.add_argument("--store", metavar="PATH", default="data/sales.db",
+                           help="SQLite listing store to write")
+    reprocess.add_argument("-w", "--workers", type=int,
+                           help="Worker processes (default: CPU count)")
+
+    drops = subparsers.add_parser(
+        "drops", help="Show recent price drops from a lifecycle database"
+    )
+    drops.add_argument("--track", metavar="PATH", default="data/lifecycle.db",
+                       help="Lifecycle database")
+    drops.add_argument("--minutes", type=float, default=60, help="How far back to look")
+
+    sellers = subparsers.add_parser(
+        "sellers", help="Show seller volume, prices and discounts from a listing store"
+    )
+    sellers.add_argument("seller", nargs="?",
+                         help="Show one seller instead of a ranking")
+    sellers.add_argument("--store", metavar="PATH", default="data/sales.db",
+                         help="SQLite listing store")
+    sellers.add_argument("--sort", choices=["volume", "discount", "recent"],
+                         default="volume", help="Ranking order")
+    sellers.add_argument("--top", type=int, default=20, help="Sellers shown")
+    sellers.add_argument("--min-listings", type=int, default=1,
+                         help="Skip sellers with fewer listings")
+
+    export = subparsers.add_parser(
+        "export",
+        help="Write listings added or changed since the last export as a new chunk",
+        description="Delta-export a listing store. Each destination keeps its own "
+                    "watermark; new chunks are listed in "
+                    "<output-dir>/<destination>/manifest.json."
+    )
+    export.add_argument("--store", metavar="PATH", default="data/sales.db",
+                        help="SQLite listing store")
+    export.add_argument("--destination", default="default",
+                        help="Consumer the watermark is kept for")
+    export.add_argument("--output-dir", default="data/exports", help="Export directory")
+    return parser
+
+
+def _session_state(settings):
+    from ..core.session import SessionState
+    return SessionState(settings.session_state_path, settings.session_ttl)
+
+
+def _open_archive(directory: Optional[str]):
+    if not directory:
+        return None
+    from ..data.archive import ResponseArchive
+    return ResponseArchive(directory)
+
+
+async def run_batch_search(args: argparse.Namespace, settings) -> int:
+    """Run a non-interactive batch search; returns the process exit code"""
+    from rich.progress import (
+        BarColumn, MofNCompleteColumn, Progress, TextColumn, TimeElapsedColumn
+    )
+    from ..core.batch import load_queries
+    from ..core.models import WatchQuery
+    from ..core.pipeline import Pipeline
+    from ..core.ratelimit import RateLimiter
+    from ..core.scraper import GrailedScraper
+
+    base = SearchFilters(
+        min_price=args.min_price,
+        max_price=args.max_price,
+        designers=args.designers,
+        conditions=args.conditions,
+        sizes=args.sizes
+    )
+    if base == SearchFilters():
+        base = None
+
+    queries = [WatchQuery(q, base) for q in args.queries]
+    if args.file:
+        queries.extend(load_queries(args.file, base))
+    if not queries:
+        console.print("[red]No queries given[/red]")
+        return 2
+    if args.enrich and not args.store:
+        console.print("[red]--enrich needs --store to cache listing details[/red]")
+        return 2
+
+    store = None
+    if args.store:
+        from ..data.store import SalesStore
+        store = SalesStore(args.store)
+    tracker = None
+    if args.track:
+        from ..data.lifecycle import LifecycleTracker
+        tracker = LifecycleTracker(args.track)
+    changes = 0
+
+    archive = _open_archive(args.archive)
+    rate_limiter = RateLimiter(
+        args.rate or settings.rate_limit_requests, settings.rate_limit_window
+    )
+    scraper = GrailedScraper(rate_limiter=rate_limiter, base_url=settings.base_url,
+                             archive=archive, session_state=_session_state(settings))
+    collected: dict = {}
+    failed = 0
+
+    if args.live:
+        from .display import LiveDashboard
+        view = LiveDashboard(f"{len(queries)} queries", k=args.top, order=args.live,
+                             total=len(queries), console=get_console())
+    else:
+        view = Progress(
+            TextColumn("[progress.description]{task.description}"),
+            BarColumn(),
+            MofNCompleteColumn(),
+            TimeElapsedColumn(),
+            console=get_console()
+        )
+
+    with view:
+        task = None if args.live else view.add_task(
+            "Searching (0 listings)", total=len(queries)
+        )
+
+        def on_page(query: WatchQuery, page: int, sales: List[Sale]) -> None:
+            nonlocal changes
+            if tracker is not None:
+                changes += len(tracker.observe(sales, query.query))
+            for sale in sales:
+                collected[sale.id if sale.id is not None else sale.url] = sale
+            if args.live:
+                view.add(sales)
+
+        def on_query(query: WatchQuery, error: Optional[BaseException]) -> None:
+            nonlocal failed
+            if error is not None:
+                failed += 1
+            if args.live:
+                view.add([], completed=1)
+            else:
+                view.update(task, advance=1,
+                            description=f"Searching ({len(collected)} listings)")
+
+        pipeline = Pipeline(scraper, store, fetch_concurrency=args.concurrency,
+                            on_page=on_page, on_query=on_query)
+        try:
+            result = await pipeline.run(queries)
+            if args.enrich:
+                from ..data.enrichment import DetailEnricher
+                if not args.live:
+                    view.update(task,
+                                description=f"Enriching ({len(collected)} listings)")
+                enricher = DetailEnricher(scraper, store, args.concurrency)
+                enriched = await enricher.enrich(list(collected.values()))
+                collected.update(
+                    (sale.id if sale.id is not None else sale.url, sale)
+                    for sale in enriched
+                )
+        finally:
+            await scraper.close()
+            if store:
+                store.close()
+            if tracker is not None:
+                tracker.close()
+            if archive:
+                archive.close()
+
+    sales = list(collected.values())
+    if args.export:
+        from ..data.exporters import SalesExporter
+        exporter = SalesExporter(output_dir=args.output_dir)
+        if args.export == "excel":
+            path = exporter.export_excel(sales, args.name)
+        else:
+            path = exporter.export_csv(sales, args.name)
+        console.print(f"Exported {len(sales)} listings to {path}")
+    elif not store:
+        for query, found in result.results.items():
+            console.print(f"{query}: {len(found)} listings")
+
+    console.print(
+        f"[bold]{len(queries)} queries, {len(sales)} unique listings"
+        f"{f', {changes} changes logged' if tracker is not None else ''}"
+        f"{f', {failed} failed' if failed else ''}[/bold]"
+    )
+    return 1 if failed else 0
+
+
+async def run_crawl(args: argparse.Namespace, settings) -> int:
+    """Crawl every page of the given queries with checkpoints; returns the exit code"""
+    from ..core.batch import load_queries, run_batch
+    from ..core.crawl import CheckpointStore, CrawlSource
+    from ..core.models import WatchQuery
+    from ..core.pipeline import Pipeline
+    from ..core.ratelimit import RateLimiter
+    from ..core.scraper import GrailedScraper
+    from ..data.store import SalesStore
+
+    queries = [WatchQuery(q) for q in args.queries]
+    if args.file:
+        queries.extend(load_queries(args.file))
+    if not queries:
+        console.print("[red]No queries given[/red]")
+        return 2
+
+    store = SalesStore(args.store)
+    checkpoints = CheckpointStore(args.checkpoint_dir)
+    tracker = None
+    if args.track:
+        from ..data.lifecycle import LifecycleTracker
+        tracker = LifecycleTracker(args.track)
+    archive = _open_archive(args.archive)
+    rate_limiter = RateLimiter(
+        args.rate or settings.rate_limit_requests, settings.rate_limit_window
+    )
+    scraper = GrailedScraper(rate_limiter=rate_limiter, base_url=settings.base_url,
+                             archive=archive, session_state=_session_state(settings))
+    incomplete = []
+    changes = removed = 0
+
+    def track(query: str, sales: List[Sale], seen: set) -> None:
+        nonlocal changes
+        if tracker is not None:
+            changes += len(tracker.observe(sales, query))
+            seen.update(sale.id for sale in sales if sale.id is not None)
+
+    def sweep(query: str, seen: set) -> None:
+        # Only a walk over every page of the query shows which listings are gone
+        nonlocal removed
+        if tracker is not None:
+            removed += len(tracker.sweep(query, seen))
+
+    async def deep_crawl_query(
+            query: str, filters: Optional[SearchFilters]
+    ) -> List[Sale]:
+        seen: set = set()
+
+        def save_page(part, page: int, sales: List[Sale]) -> None:
+            store.upsert(sales, query)
+            track(query, sales, seen)
+
+        result = await planner.run(query, filters, on_page=save_page)
+        if result.failed or result.truncated:
+            incomplete.append(query)
+        elif not result.uncovered:
+            sweep(query, seen)
+        uncovered = (f", ~{result.uncovered} outside known categories/sizes"
+                     if result.uncovered else "")
+        console.print(
+            f"{query}: {len(result.sales)} listings, {result.requests} requests "
+            f"over {result.partitions} partitions"
+            f"{f', {len(result.failed)} failed' if result.failed else ''}"
+            f"{f', {len(result.truncated)} over the cap' if result.truncated else ''}"
+            f"{uncovered}",
+            markup=False, highlight=False
+        )
+        return []
+
+    async def crawl_queries() -> int:
+        source = CrawlSource(scraper, checkpoints, args.max_pages)
+        seen: dict = {query.query: set() for query in queries}
+
+        def on_page(query: WatchQuery, page: int, sales: List[Sale]) -> None:
+            track(query.query, sales, seen[query.query])
+            source.delivered(query, page, sales)
+
+        # The pipeline writes each page to the store before handing it to on_page
+        pipeline = Pipeline(scraper, store, fetch_concurrency=args.concurrency,
+                            pages=source.pages, on_page=on_page, keep_sales=False)
+        await pipeline.run(queries)
+        for query in dict.fromkeys(q.query for q in queries):
+            result = source.result(query)
+            state = result.checkpoint
+            if not state.completed:
+                incomplete.append(query)
+            elif result.exhausted and not result.resumed_from:
+                # Listings from pages before a resume were not seen in this run
+                sweep(query, seen[query])
+            resumed = (f" (resumed after page {result.resumed_from})"
+                       if result.resumed_from else "")
+            console.print(
+                f"{query}: {state.listings} listings over {state.last_page} pages, "
+                f"{result.pages_fetched} fetched"
+                f"{resumed}"
+                f"{'' if state.completed else ' - incomplete, rerun to resume'}",
+                markup=False, highlight=False
+            )
+        return len(incomplete)
+
+    if args.deep:
+        from ..core.planner import CrawlPlanner
+        planner = CrawlPlanner(scraper, concurrency=args.concurrency)
+    try:
+        # Deep crawls parallelise within a query, so run queries one at a time
+        if args.deep:
+            results = await run_batch(queries, deep_crawl_query, 1)
+            failed = sum(1 for result in results if result.error) + len(incomplete)
+        else:
+            failed = await crawl_queries()
+    finally:
+        await scraper.close()
+        store.close()
+        if tracker is not None:
+            tracker.close()
+        if archive:
+            archive.close()
+
+    if tracker is not None:
+        console.print(f"[bold]{changes} changes logged, {removed} listings gone[/bold]")
+    return 1 if failed else 0
+
+
+async def run_watch(args: argparse.Namespace, settings) -> int:
+    """Poll queries with the adaptive scheduler; returns the process exit code"""
+    from ..core.batch import load_queries
+    from ..core.config import ALERT_FLUSH_INTERVAL, ALERT_MAX_DELAY
+    from ..core.models import WatchQuery
+    from ..core.ratelimit import RateLimiter
+    from ..core.rules import AlertBatcher, AlertRule, RuleIndex, load_rules
+    from ..core.scheduler import REQUESTS_PER_SEARCH, AdaptiveScheduler
+    from ..core.scraper import GrailedScraper
+
+    queries = [WatchQuery(q) for q in args.queries]
+    if args.file:
+        queries.extend(load_queries(args.file))
+    if not queries:
+        console.print("[red]No queries given[/red]")
+        return 2
+
+    batcher = None
+    if args.rules:
+        def alert(rule: AlertRule, sales: List[Sale]) -> None:
+            console.print(f"[bold]Alert {rule.id}: {len(sales)} listings[/bold]")
+            for sale in sales:
+                console.print(f"  {sale.title}  ${sale.price:.2f}  {sale.url}",
+                              markup=False, highlight=False)
+
+        delay = ALERT_MAX_DELAY if args.alert_delay is None else args.alert_delay
+        batcher = AlertBatcher(RuleIndex(load_rules(args.rules)), alert,
+                               max_delay=delay)
+
+    store = None
+    if args.store:
+        from ..data.store import SalesStore
+        store = SalesStore(args.store)
+    rate = args.rate or settings.rate_limit_requests
+    scheduler = AdaptiveScheduler(queries, budget=max(1, rate // REQUESTS_PER_SEARCH),
+                                  window=settings.rate_limit_window)
+    scraper = GrailedScraper(rate_limiter=RateLimiter(rate, settings.rate_limit_window),
+                             base_url=settings.base_url,
+                             session_state=_session_state(settings))
+
+    def on_new(query: str, sales: List[Sale]) -> None:
+        if store is not None:
+            store.upsert(sales, query)
+        for sale in sales:
+            console.print(f"[{query}] {sale.title}  ${sale.price:.2f}  {sale.url}",
+                          markup=False, highlight=False)
+        if batcher is not None:
+            batcher.add(sales)
+
+    flusher = None
+    if batcher is not None:
+        # Matches come due between polls too, so waiting batches are also checked on
+        # a timer
+        flusher = asyncio.create_task(
+            batcher.flush_every(min(delay, ALERT_FLUSH_INTERVAL) or 1)
+        )
+    try:
+        await scheduler.run(scraper, on_new=on_new,
+                            duration=args.minutes * 60 if args.minutes else None)
+    finally:
+        if flusher is not None:
+            flusher.cancel()
+            batcher.flush(force=True)
+        await scraper.close()
+        if store is not None:
+            store.close()
+        report = scheduler.report
+        console.print(f"[bold]{report.new_listings} new listings from "
+                      f"{report.searches} searches ({report.requests} requests)[/bold]")
+    return 0
+
+
+def run_reprocess(args: argparse.Namespace) -> int:
+    """Rebuild a listing store from archived raw responses"""
+    from concurrent.futures import ProcessPoolExecutor
+    from ..data.archive import ResponseArchive, reprocess
+    from ..data.store import SalesStore
+
+    archive = ResponseArchive(args.archive)
+    store = SalesStore(args.store)
+    try:
+        with ProcessPoolExecutor(max_workers=args.workers) as executor:
+            result = reprocess(archive, store, executor)
+    finally:
+        store.close()
+        archive.close()
+
+    console.print(
+        f"[bold]Reprocessed {result.records} responses from {result.segments} "
+        f"segments into {store.path}: {result.listings} listings written in "
+        f"{result.elapsed:.1f}s[/bold]"
+    )
+    return 0
+
+
+def show_price_drops(args: argparse.Namespace) -> int:
+    """Print price drops logged in the last `args.minutes` minutes"""
+    import time
+    from ..data.lifecycle import LifecycleTracker
+
+    tracker = LifecycleTracker(args.track)
+    try:
+        drops = tracker.price_drops(time.time() - args.minutes * 60)
+    finally:
+        tracker.close()
+
+    for drop in drops:
+        console.print(
+            f"https://www.grailed.com/listings/{drop.listing_id}  "
+            f"${drop.old_price:.2f} -> ${drop.new_price:.2f} "
+            f"({drop.price_delta / drop.old_price:.0%})"
+            f"{f'  [{drop.query}]' if drop.query else ''}",
+            markup=False, highlight=False
+        )
+    console.print(
+        f"[bold]{len(drops)} price drops in the last {args.minutes:g} minutes[/bold]"
+    )
+    return 0
+
+
+def show_sellers(args: argparse.Namespace) -> int:
+    """Print one seller's stats or the top sellers of a store"""
+    from ..data.sellers import SellerIndex
+    from ..data.store import SalesStore
+
+    store = SalesStore(args.store)
+    try:
+        index = SellerIndex(store)
+        if args.seller:
+            ranked = [index.get(args.seller)]
+        else:
+            ranked = index.top(args.top, args.sort, args.min_listings)
+    finally:
+        store.close()
+
+    if args.seller and ranked[0] is None:
+        console.print(f"[red]No stored sales by {args.seller}[/red]")
+        return 1
+    for stats in ranked:
+        active = (stats.last_active.strftime('%Y-%m-%d')
+                  if stats.last_active else 'unknown')
+        console.print(
+            f"{stats.seller:<24} {stats.listings:>6} listings  "
+            f"median ${stats.median_price:>9.2f}  "
+            f"typical discount {stats.typical_discount:>3.0f}%  last active {active}",
+            markup=False, highlight=False
+        )
+    if not args.seller:
+        console.print(f"[bold]{len(ranked)} sellers by {args.sort}[/bold]")
+    return 0
+
+
+def run_delta_export(args: argparse.Namespace) -> int:
+    """Export what changed in a store since the destination's last export"""
+    from ..data.exporters import SalesExporter
+    from ..data.store import SalesStore
+
+    store = SalesStore(args.store)
+    exporter = SalesExporter(output_dir=args.output_dir)
+    try:
+        path = exporter.export_store_delta(store, args.destination)
+    except ValueError as e:
+        console.print(f"[red]{e}[/red]")
+        return 2
+    finally:
+        exporter.close()
+        store.close()
+
+    if path is None:
+        console.print(f"[bold]Nothing new for {args.destination}[/bold]")
+    else:
+        console.print(f"[bold]Wrote {path}[/bold]")
+    return 0
+
+
+def main(argv: Optional[List[str]] = None):
     """Entry point for the CLI"""
-    cli = CLI()
-    asyncio.run(cli.run())
+    args = build_parser().parse_args(argv)
+
+    # Settings pull in pydantic-settings; only load them once we know we are running
+    from ..core.config import settings
+    configure_logging(
+        level=settings.log_level,
+        json_lines=settings.log_json,
+        max_bytes=settings.log_max_bytes
+    )
+    metrics.enable(settings.metrics_enabled)
+    exit_code = 0
+    try:
+        if args.command == "search":
+            exit_code = asyncio.run(run_batch_search(args, settings))
+        elif args.command == "crawl":
+            exit_code = asyncio.run(run_crawl(args, settings))
+        elif args.command == "watch":
+            exit_code = asyncio.run(run_watch(args, settings))
+        elif args.command == "reprocess":
+            exit_code = run_reprocess(args)
+        elif args.command == "drops":
+            exit_code = show_price_drops(args)
+        elif args.command == "sellers":
+            exit_code = show_sellers(args)
+        elif args.command == "export":
+            exit_code = run_delta_export(args)
+        else:
+            asyncio.run(CLI().run())
+    finally:
+        print_metrics_summary()
+    if exit_code:
+        raise SystemExit(exit_code)
+
+
+def print_metrics_summary():
+    """Print collected request/parse/export metrics when instrumentation is on"""
+    if not metrics.enabled:
+        return
+    console.print("\n[bold]Metrics[/bold]")
+    for line in metrics.summary():
+        console.print(line, markup=False, highlight=False)
 
 
 if __name__ == "__main__":
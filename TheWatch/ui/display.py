@@ -1,12 +1,15 @@
 # TheWatch/ui/display.py
-from typing import List
-from rich.console import Console
+import threading
+from typing import Iterable, List, Optional
+from rich.console import Console, Group
+from rich.live import Live
 from rich.table import Table
 from rich.panel import Panel
 from rich.columns import Columns
 from rich.text import Text
 from rich.progress import Progress, SpinnerColumn, TextColumn
 
+from TheWatch.core.analytics import SalesAccumulator, TopK
 from TheWatch.core.models import Sale, SalesAnalytics
 from TheWatch.utils.logger import setup_logger
 
@@ -61,9 +64,21 @@ class SalesDisplay:
 
         # Print most recent sales
         self.console.print("\n[bold]Most Recent Sales:[/bold]\n")
-        for sale in sorted(sales, key=lambda x: x.sold_date, reverse=True)[:5]:
+        newest = TopK(5, 'newest')
+        newest.extend(sales)
+        for sale in newest.items():
             self.print_sale(sale)
 
+    def live(
+            self,
+            query: str,
+            k: int = 10,
+            order: str = 'newest',
+            total: Optional[int] = None,
+    ) -> 'LiveDashboard':
+        """Create a live dashboard for results streaming in for `query`"""
+        return LiveDashboard(query, k=k, order=order, total=total, console=self.console)
+
     def print_progress(self, description: str) -> Progress:
         """Create and return a progress indicator"""
         return Progress(
@@ -74,52 +89,123 @@ class SalesDisplay:
 
     def print_analytics(self, analytics: SalesAnalytics) -> None:
         """Display sales analytics in a formatted way"""
-        # Overview Table
-        overview = Table(title="Sales Overview", show_header=False)
-        overview.add_column("Metric", style="cyan")
-        overview.add_column("Value", justify="right")
-
-        overview.add_row("Total Sales", str(analytics.total_sales))
-        overview.add_row("Total Value", f"${analytics.total_value:,.2f}")
-        overview.add_row("Average Price", f"${analytics.average_price:,.2f}")
-        overview.add_row("Median Price", f"${analytics.median_price:,.2f}")
-        overview.add_row("Price Range", f"${analytics.min_price:,.2f} - ${analytics.max_price:,.2f}")
-
-        self.console.print(overview)
+        self.console.print(analytics_overview(analytics))
         self.console.print()
+        self.console.print(analytics_distributions(analytics))
+
+
+def analytics_overview(analytics: SalesAnalytics) -> Table:
+    """Overview table of totals and price statistics"""
+    overview = Table(title="Sales Overview", show_header=False)
+    overview.add_column("Metric", style="cyan")
+    overview.add_column("Value", justify="right")
+
+    overview.add_row("Total Sales", str(analytics.total_sales))
+    overview.add_row("Total Value", f"${analytics.total_value:,.2f}")
+    overview.add_row("Average Price", f"${analytics.average_price:,.2f}")
+    overview.add_row("Median Price", f"${analytics.median_price:,.2f}")
+    overview.add_row("Price Range",
+                     f"${analytics.min_price:,.2f} - ${analytics.max_price:,.2f}")
+    return overview
+
+
+def _distribution_table(title: str, label: str, counts: dict, total: int) -> Table:
+    table = Table(title=title, show_header=True)
+    table.add_column(label)
+    table.add_column("Count", justify="right")
+    table.add_column("%", justify="right")
+
+    for name, count in counts.items():
+        percentage = (count / total) * 100
+        table.add_row(
+            name,
+            str(count),
+            f"{percentage:.1f}%"
+        )
+    return table
+
+
+def analytics_distributions(analytics: SalesAnalytics) -> Columns:
+    """Price and condition breakdowns side by side"""
+    return Columns([
+        _distribution_table("Price Distribution", "Range", analytics.price_ranges,
+                            analytics.total_sales),
+        _distribution_table("Condition Breakdown", "Condition",
+                            analytics.condition_distribution, analytics.total_sales),
+    ])
+
+
+class LiveDashboard:
+    """Live terminal view of a watch session that stays cheap as results pile up.
+
+    Incoming sales update a SalesAccumulator and a TopK heap; each frame
+    renders from those, so drawing costs the same with ten listings or a few
+    hundred thousand. Frames are drawn by rich's refresh thread, not per add,
+    so the accumulators are guarded by a lock.
+    """
+
+    def __init__(
+            self,
+            query: str,
+            k: int = 10,
+            order: str = 'newest',
+            total: Optional[int] = None,
+            console: Optional[Console] = None,
+            refresh_per_second: float = 4
+    ):
+        self.query = query
+        self.total = total
+        self.completed = 0
+        self.accumulator = SalesAccumulator()
+        self.top = TopK(k, order)
+        self._lock = threading.Lock()
+        self.live = Live(
+            get_renderable=self.render,
+            console=console or Console(),
+            refresh_per_second=refresh_per_second
+        )
 
-        # Create distribution tables
-        tables = []
-
-        # Price Ranges
-        price_table = Table(title="Price Distribution", show_header=True)
-        price_table.add_column("Range")
-        price_table.add_column("Count", justify="right")
-        price_table.add_column("%", justify="right")
-
-        for range_name, count in analytics.price_ranges.items():
-            percentage = (count / analytics.total_sales) * 100
-            price_table.add_row(
-                range_name,
-                str(count),
-                f"{percentage:.1f}%"
+    def add(self, sales: Iterable[Sale], completed: int = 0) -> int:
+        """Fold a page of results in; returns how many were new to the session"""
+        added = 0
+        with self._lock:
+            for sale in sales:
+                if self.accumulator.add(sale):
+                    self.top.add(sale)
+                    added += 1
+            self.completed += completed
+        return added
+
+    def render(self) -> Group:
+        with self._lock:
+            top = self.top.items()
+            analytics = self.accumulator.snapshot()
+        progress = f" - {self.completed}/{self.total} done" if self.total else ""
+        count = analytics.total_sales if analytics else 0
+        header = Text(f"Watching '{self.query}'{progress}: {count} listings",
+                      style="bold")
+
+        table = Table(title=f"Top {self.top.k} ({self.top.order})", expand=True)
+        table.add_column("Title", ratio=3, no_wrap=True)
+        table.add_column("Designer", ratio=2, no_wrap=True)
+        table.add_column("Size")
+        table.add_column("Condition")
+        table.add_column("Price", justify="right", style="green")
+        table.add_column("Date", justify="right")
+        for sale in top:
+            table.add_row(
+                sale.title, sale.designer_display, sale.size, sale.condition_display,
+                f"${sale.price:,.2f}", sale.sold_date.strftime('%Y-%m-%d %H:%M')
             )
-        tables.append(price_table)
-
-        # Conditions
-        condition_table = Table(title="Condition Breakdown", show_header=True)
-        condition_table.add_column("Condition")
-        condition_table.add_column("Count", justify="right")
-        condition_table.add_column("%", justify="right")
-
-        for condition, count in analytics.condition_distribution.items():
-            percentage = (count / analytics.total_sales) * 100
-            condition_table.add_row(
-                condition,
-                str(count),
-                f"{percentage:.1f}%"
-            )
-        tables.append(condition_table)
 
-        # Display tables in columns
-        self.console.print(Columns(tables))
\ No newline at end of file
+        if not analytics:
+            return Group(header, table)
+        return Group(header, table, analytics_overview(analytics),
+                     analytics_distributions(analytics))
+
+    def __enter__(self) -> 'LiveDashboard':
+        self.live.start(refresh=True)
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.live.stop()
\ No newline at end of file
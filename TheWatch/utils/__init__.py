@@ -1,9 +1,17 @@
 # TheWatch/utils/__init__.py
-from .logger import setup_logger, get_scraper_logger, get_api_logger, get_monitor_logger
+from .logger import (
+    setup_logger, configure_logging, shutdown_logging,
+    get_scraper_logger, get_api_logger, get_monitor_logger
+)
 from .helpers import clean_text, parse_price, format_date, parse_condition, parse_size
+from .normalize import (
+    canonical_size, canonical_condition, canonical_designer, size_code, condition_code
+)
 
 __all__ = [
     'setup_logger',
+    'configure_logging',
+    'shutdown_logging',
     'get_scraper_logger',
     'get_api_logger',
     'get_monitor_logger',
@@ -11,5 +19,10 @@ __all__ = [
     'parse_price',
     'format_date',
     'parse_condition',
-    'parse_size'
+    'parse_size',
+    'canonical_size',
+    'canonical_condition',
+    'canonical_designer',
+    'size_code',
+    'condition_code'
 ]
\ No newline at end of file
@@ -3,6 +3,8 @@ import re
 from typing import Optional, Union
 from datetime import datetime
 
+from .normalize import condition_code, condition_slug, size_code, size_label
+
 def clean_text(text: str) -> str:
     """Clean text by removing extra whitespace and special characters"""
     if not text:
@@ -34,24 +36,12 @@ def format_date(date: Union[str, datetime]) -> str:
     return date.strftime('%Y-%m-%d %H:%M:%S')
 
 def parse_condition(condition: str) -> str:
-    """Parse and standardize condition string"""
-    condition = condition.lower()
-    if 'new' in condition:
-        return 'is_new'
-    elif 'gently' in condition:
-        return 'is_gently_used'
-    elif 'used' in condition:
-        return 'is_used'
-    elif 'worn' in condition:
-        return 'is_very_worn'
-    return condition
+    """Parse and standardize condition string to its Grailed slug"""
+    return condition_slug(condition_code(condition)) or condition.lower()
 
-def parse_size(size: str) -> str:
-    """Parse and standardize size string"""
-    size = str(size).upper().strip()
-    # Remove common prefixes
-    size = re.sub(r'^(US|EU|UK|JP)\s*', '', size)
-    return size
+def parse_size(size: str, category: Optional[str] = None) -> str:
+    """Parse and standardize size string to its canonical label (see utils.normalize)"""
+    return size_label(size_code(str(size), category))
 
 # Export functions
 __all__ = [
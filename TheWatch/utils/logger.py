@@ -1,56 +1,289 @@
 # TheWatch/utils/logger.py
+import atexit
+import json
 import logging
+import logging.handlers
+import queue
 import sys
+import threading
+import time
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import Dict, List, Optional, Tuple
+
+PACKAGE_LOGGER = 'TheWatch'
+
+# Defaults, overridden by configure_logging()
+_config = {
+    'level': logging.INFO,
+    'json_lines': False,
+    'log_dir': 'logs',
+    'max_bytes': 0,
+    'backup_count': 7,
+    'when': 'midnight',
+    'sample_burst': 5,
+    'sample_window': 60.0,
+}
+
+CONSOLE_FORMAT = '%(levelname)s - %(message)s'
+FILE_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+
+class JsonFormatter(logging.Formatter):
+    """Formats records as one JSON object per line"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'time': datetime.fromtimestamp(record.created).isoformat(
+                timespec='milliseconds'
+            ),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        if record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class SampleRepeatsFilter(logging.Filter):
+    """Lets through at most `burst` identical warnings/errors per `window` seconds.
+
+    Records are keyed on logger, level and the unformatted message template, so
+    a flood of `logger.error("Error processing listing: %s", e)` collapses into
+    a few lines plus a suppressed-count note once the window rolls over.
+    """
+
+    MAX_KEYS = 1024
+
+    def __init__(self, burst: int = 5, window: float = 60.0):
+        super().__init__()
+        self.burst = burst
+        self.window = window
+        self._windows: Dict[Tuple, List] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno < logging.WARNING or self.burst <= 0:
+            return True
+
+        key = (record.name, record.levelno, str(record.msg))
+        now = time.monotonic()
+        state = self._windows.get(key)
+        if state is None or now - state[0] >= self.window:
+            if len(self._windows) >= self.MAX_KEYS:
+                self._windows.clear()
+            suppressed = state[2] if state else 0
+            self._windows[key] = [now, 1, 0]
+            if suppressed:
+                record.msg = f"{record.msg} (suppressed {suppressed} similar messages)"
+            return True
+
+        state[1] += 1
+        if state[1] <= self.burst:
+            return True
+        state[2] += 1
+        return False
+
+
+class _LazyQueueHandler(logging.handlers.QueueHandler):
+    """Enqueues records unformatted; the listener thread does all formatting and I/O"""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        _ensure_listener()
+        self.queue.put_nowait(record)
+
+
+class _StdoutHandler(logging.StreamHandler):
+    """Looks up sys.stdout on every write, so a replaced stdout is honoured"""
+
+    @property
+    def stream(self):
+        return sys.stdout
+
+    @stream.setter
+    def stream(self, value):
+        pass
+
+
+class _RoutingHandler(logging.Handler):
+    """Listener-side fan-out to the console and per-logger log files"""
+
+    def __init__(self):
+        super().__init__()
+        self.console: Optional[logging.Handler] = None
+        self.files: Dict[str, logging.Handler] = {}
+
+    def handle(self, record: logging.LogRecord) -> bool:
+        if self.console and record.levelno >= self.console.level:
+            self.console.handle(record)
+        for prefix, handler in list(self.files.items()):
+            if record.levelno >= handler.level and (
+                    record.name == prefix or record.name.startswith(prefix + '.')):
+                handler.handle(record)
+        return True
+
+    def close(self) -> None:
+        for handler in [self.console, *self.files.values()]:
+            if handler:
+                handler.close()
+        super().close()
+
+
+_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+_router = _RoutingHandler()
+_queue_handler = _LazyQueueHandler(_queue)
+_sampler = SampleRepeatsFilter(_config['sample_burst'], _config['sample_window'])
+_queue_handler.addFilter(_sampler)
+_listener: Optional[logging.handlers.QueueListener] = None
+_listener_lock = threading.Lock()
+
+
+def _file_formatter() -> logging.Formatter:
+    return JsonFormatter() if _config['json_lines'] else logging.Formatter(FILE_FORMAT)
+
+
+def _ensure_listener() -> None:
+    global _listener
+    if _listener is not None:
+        return
+    with _listener_lock:
+        if _listener is not None:
+            return
+        if _router.console is None:
+            console_handler = _StdoutHandler()
+            console_handler.setLevel(logging.INFO)
+            console_handler.setFormatter(logging.Formatter(CONSOLE_FORMAT))
+            _router.console = console_handler
+        _listener = logging.handlers.QueueListener(_queue, _router)
+        _listener.start()
+
+
+def _has_queue_handler(logger: logging.Logger) -> bool:
+    current: Optional[logging.Logger] = logger
+    while current:
+        if _queue_handler in current.handlers:
+            return True
+        if not current.propagate:
+            return False
+        current = current.parent
+    return False
+
+
+def _attach(logger: logging.Logger) -> None:
+    if _has_queue_handler(logger):
+        return
+    logger.addHandler(_queue_handler)
+    # Root handlers may write synchronously; everything goes through the queue instead
+    logger.propagate = False
+    if logger.level == logging.NOTSET:
+        logger.setLevel(_config['level'])
+
+
+def _add_file_route(name: str, log_file: str) -> None:
+    if name in _router.files:
+        return
+    log_dir = Path(_config['log_dir'])
+    log_dir.mkdir(parents=True, exist_ok=True)
+    path = log_dir / f"{log_file}.{'jsonl' if _config['json_lines'] else 'log'}"
+
+    if _config['max_bytes']:
+        handler: logging.Handler = logging.handlers.RotatingFileHandler(
+            path, maxBytes=_config['max_bytes'], backupCount=_config['backup_count'],
+            encoding='utf-8', delay=True
+        )
+    else:
+        handler = logging.handlers.TimedRotatingFileHandler(
+            path, when=_config['when'], backupCount=_config['backup_count'],
+            encoding='utf-8', delay=True
+        )
+    handler.setLevel(logging.DEBUG)
+    handler.setFormatter(_file_formatter())
+    _router.files[name] = handler
+
+
+def configure_logging(
+        level: int = logging.INFO,
+        json_lines: bool = False,
+        log_dir: str = 'logs',
+        max_bytes: int = 0,
+        backup_count: int = 7,
+        when: str = 'midnight',
+        sample_burst: int = 5,
+        sample_window: float = 60.0
+) -> None:
+    """
+    Configure the shared logging backend
+
+    Args:
+        level: Minimum level for TheWatch loggers; lower records are dropped before
+            formatting
+        json_lines: Write log files as JSON lines instead of plain text
+        log_dir: Directory for log files
+        max_bytes: Rotate files at this size; 0 rotates on the `when` schedule instead
+        backup_count: Rotated files to keep
+        when: TimedRotatingFileHandler interval used when `max_bytes` is 0
+        sample_burst: Identical warnings/errors allowed per window (0 disables sampling)
+        sample_window: Sampling window in seconds
+    """
+    if isinstance(level, str):
+        level = logging.getLevelName(level.upper())
+    _config.update(
+        level=level, json_lines=json_lines, log_dir=log_dir, max_bytes=max_bytes,
+        backup_count=backup_count, when=when, sample_burst=sample_burst,
+        sample_window=sample_window
+    )
+    _sampler.burst = sample_burst
+    _sampler.window = sample_window
+
+    for handler in _router.files.values():
+        handler.setFormatter(_file_formatter())
+
+    _attach(logging.getLogger(PACKAGE_LOGGER))
+    for logger in list(logging.Logger.manager.loggerDict.values()):
+        if isinstance(logger, logging.Logger) and _queue_handler in logger.handlers:
+            logger.setLevel(level)
+
+
+def shutdown_logging() -> None:
+    """Flush queued records and stop the listener thread; the next record restarts it"""
+    global _listener
+    with _listener_lock:
+        if _listener is None:
+            return
+        _listener.stop()
+        _listener = None
+    for handler in _router.files.values():
+        handler.flush()
+    if _router.console:
+        _router.console.flush()
+
+
+atexit.register(shutdown_logging)
 
 
 def setup_logger(name: str, log_file: Optional[str] = None) -> logging.Logger:
     """
     Setup a logger with console and optional file output
 
+    Records are handed to a background listener through a queue, so calling
+    code never waits on formatting or I/O.
+
     Args:
         name: Name of the logger
-        log_file: Optional path to log file
+        log_file: Optional log file stem, written to `<log_dir>/<log_file>.log`
 
     Returns:
         logging.Logger: Configured logger instance
     """
-    # Create logger
+    _attach(logging.getLogger(PACKAGE_LOGGER))
     logger = logging.getLogger(name)
-    logger.setLevel(logging.DEBUG)
-
-    # Remove existing handlers to avoid duplicates
-    logger.handlers.clear()
-
-    # Create formatters
-    console_formatter = logging.Formatter(
-        '%(levelname)s - %(message)s'
-    )
-    file_formatter = logging.Formatter(
-        '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-    )
-
-    # Create console handler
-    console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setLevel(logging.INFO)
-    console_handler.setFormatter(console_formatter)
-    logger.addHandler(console_handler)
+    _attach(logger)
 
-    # Create file handler if log_file specified
     if log_file:
-        # Create logs directory if it doesn't exist
-        log_dir = Path('logs')
-        log_dir.mkdir(exist_ok=True)
-
-        # Create file handler
-        file_handler = logging.FileHandler(
-            log_dir / f"{log_file}_{datetime.now().strftime('%Y%m%d')}.log"
-        )
-        file_handler.setLevel(logging.DEBUG)
-        file_handler.setFormatter(file_formatter)
-        logger.addHandler(file_handler)
+        _add_file_route(name, log_file)
 
     return logger
 
@@ -72,4 +305,13 @@ def get_monitor_logger() -> logging.Logger:
 
 
 # Export functions
-__all__ = ['setup_logger', 'get_scraper_logger', 'get_api_logger', 'get_monitor_logger']
\ No newline at end of file
+__all__ = [
+    'setup_logger',
+    'configure_logging',
+    'shutdown_logging',
+    'JsonFormatter',
+    'SampleRepeatsFilter',
+    'get_scraper_logger',
+    'get_api_logger',
+    'get_monitor_logger'
+]
\ No newline at end of file
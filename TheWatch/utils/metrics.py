@@ -0,0 +1,214 @@
+# TheWatch/utils/metrics.py
+import bisect
+import contextlib
+import threading
+import time
+import urllib.parse
+from typing import Dict, List, Optional, Tuple
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+# Seconds; covers sub-millisecond parsing up to slow upstream requests
+DEFAULT_BUCKETS = (
+    0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+
+_NULL_TIMER = contextlib.nullcontext()
+
+
+def _label_key(labels: Dict[str, object]) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _format_labels(key: LabelKey, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(key) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{v}"' for k, v in pairs) + "}"
+
+
+def endpoint_label(url: str) -> str:
+    """Collapse a Grailed URL to a low-cardinality endpoint name"""
+    path = urllib.parse.urlparse(url).path.rstrip('/')
+    if not path:
+        return 'home'
+    if path.startswith('/api/') and path.endswith('/goods'):
+        return 'goods'
+    if path.startswith('/shop'):
+        return 'shop'
+    if path.startswith('/api/listings/') or path.startswith('/listings/'):
+        return 'listing_details'
+    return path.strip('/').split('/')[0]
+
+
+class _Histogram:
+    __slots__ = ('buckets', 'counts', 'sum', 'count')
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-th observation"""
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        running = 0
+        for bound, count in zip(self.buckets, self.counts):
+            running += count
+            if running >= target:
+                return bound
+        return float('inf')
+
+
+class _Timer:
+    __slots__ = ('metrics', 'name', 'labels', 'started')
+
+    def __init__(self, metrics: 'Metrics', name: str, labels: Dict[str, object]):
+        self.metrics = metrics
+        self.name = name
+        self.labels = labels
+
+    def __enter__(self) -> '_Timer':
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        elapsed = time.perf_counter() - self.started
+        self.metrics.observe(self.name, elapsed, **self.labels)
+
+
+class Metrics:
+    """In-process counters and histograms, rendered in Prometheus text format.
+
+    Every recording method returns immediately while `enabled` is False, so
+    instrumented hot paths cost one attribute check when metrics are off.
+    """
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[LabelKey, float]] = {}
+        self._histograms: Dict[str, Dict[LabelKey, _Histogram]] = {}
+
+    def enable(self, enabled: bool = True) -> None:
+        self.enabled = enabled
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def inc(self, name: str, value: float = 1, **labels) -> None:
+        if not self.enabled:
+            return
+        key = _label_key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    def observe(
+            self,
+            name: str,
+            value: float,
+            buckets: Tuple[float, ...] = DEFAULT_BUCKETS,
+            **labels
+    ) -> None:
+        if not self.enabled:
+            return
+        key = _label_key(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = _Histogram(buckets)
+            histogram.observe(value)
+
+    def timer(self, name: str, **labels):
+        """Context manager observing the elapsed seconds into histogram `name`"""
+        if not self.enabled:
+            return _NULL_TIMER
+        return _Timer(self, name, labels)
+
+    def cache(self, cache: str, hit: bool) -> None:
+        """Record a lookup against a named cache"""
+        if not self.enabled:
+            return
+        name = 'thewatch_cache_hits_total' if hit else 'thewatch_cache_misses_total'
+        self.inc(name, cache=cache)
+
+    def counter_value(self, name: str, **labels) -> float:
+        return self._counters.get(name, {}).get(_label_key(labels), 0)
+
+    def cache_ratios(self) -> Dict[str, float]:
+        hits = self._counters.get('thewatch_cache_hits_total', {})
+        misses = self._counters.get('thewatch_cache_misses_total', {})
+        ratios = {}
+        for key in set(hits) | set(misses):
+            total = hits.get(key, 0) + misses.get(key, 0)
+            ratio = hits.get(key, 0) / total if total else 0.0
+            ratios[dict(key).get('cache', '')] = ratio
+        return ratios
+
+    def render_prometheus(self) -> str:
+        """Render all series in the Prometheus text exposition format"""
+        lines: List[str] = []
+        with self._lock:
+            for name in sorted(self._counters):
+                lines.append(f"# TYPE {name} counter")
+                for key, value in sorted(self._counters[name].items()):
+                    lines.append(f"{name}{_format_labels(key)} {value:g}")
+
+            for name in sorted(self._histograms):
+                lines.append(f"# TYPE {name} histogram")
+                for key, histogram in sorted(self._histograms[name].items()):
+                    running = 0
+                    for bound, count in zip(histogram.buckets, histogram.counts):
+                        running += count
+                        labels = _format_labels(key, ('le', f'{bound:g}'))
+                        lines.append(f"{name}_bucket{labels} {running}")
+                    labels = _format_labels(key, ('le', '+Inf'))
+                    lines.append(f"{name}_bucket{labels} {histogram.count}")
+                    lines.append(f"{name}_sum{_format_labels(key)} {histogram.sum:g}")
+                    lines.append(f"{name}_count{_format_labels(key)} {histogram.count}")
+
+        ratios = self.cache_ratios()
+        if ratios:
+            lines.append("# TYPE thewatch_cache_hit_ratio gauge")
+            for cache, ratio in sorted(ratios.items()):
+                lines.append(f'thewatch_cache_hit_ratio{{cache="{cache}"}} {ratio:.4f}')
+        return "\n".join(lines) + "\n"
+
+    def summary(self) -> List[str]:
+        """Short human-readable digest for printing on CLI exit"""
+        lines = []
+        with self._lock:
+            for name, series in sorted(self._histograms.items()):
+                for key, histogram in sorted(series.items()):
+                    lines.append(
+                        f"{name}{_format_labels(key)}: n={histogram.count} "
+                        f"avg={histogram.sum / histogram.count * 1000:.1f}ms "
+                        f"p50<={histogram.quantile(0.5) * 1000:g}ms "
+                        f"p99<={histogram.quantile(0.99) * 1000:g}ms"
+                    )
+            for name, series in sorted(self._counters.items()):
+                if name.startswith('thewatch_cache_'):
+                    continue
+                for key, value in sorted(series.items()):
+                    lines.append(f"{name}{_format_labels(key)}: {value:g}")
+        for cache, ratio in sorted(self.cache_ratios().items()):
+            lines.append(f"cache {cache} hit ratio: {ratio:.1%}")
+        return lines
+
+
+# Process-wide registry used by the instrumented modules
+metrics = Metrics()
+
+__all__ = ['Metrics', 'metrics', 'endpoint_label', 'DEFAULT_BUCKETS']
\ No newline at end of file
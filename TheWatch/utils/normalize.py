@@ -0,0 +1,255 @@
+# TheWatch/utils/normalize.py
+"""Canonical size and condition codes.
+
+Lookup tables are built once at import. Every distinct canonical size or
+condition gets a small integer code, and raw strings are mapped to codes
+through memoized lookups, so filters, aggregations and the listing
+normalizer compare integers instead of redoing string work per listing.
+
+Size codes are interned per process; persist labels, not codes.
+"""
+import re
+import threading
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+UNKNOWN = 0
+
+# Conditions, best first: (Grailed slug, display label)
+CONDITIONS: Tuple[Tuple[str, str], ...] = (
+    ("is_new", "New"),
+    ("is_gently_used", "Gently Used"),
+    ("is_used", "Used"),
+    ("is_very_worn", "Very Worn"),
+)
+
+_CONDITION_ALIASES = {
+    "new": 1, "brand new": 1, "new with tags": 1, "nwt": 1, "deadstock": 1, "ds": 1,
+    "gently used": 2, "like new": 2, "excellent": 2,
+    "used": 3, "good": 3,
+    "very worn": 4, "worn": 4, "heavily worn": 4, "distressed": 4,
+}
+
+# Abbreviated designer names, as sellers and older exports write them
+_DESIGNER_ALIASES = {
+    "n": "New Balance", "nb": "New Balance", "cdg": "Comme des Garcons",
+    "ro": "Rick Owens", "mmm": "Maison Margiela", "mm6": "MM6 Maison Margiela",
+    "ysl": "Saint Laurent", "ccp": "Carol Christian Poell",
+}
+
+# Category groups sharing a size system
+SHOES, LETTER, WAIST = 'shoes', 'letter', 'waist'
+CATEGORY_GROUPS = {
+    "footwear": SHOES, "sneakers": SHOES, "shoes": SHOES, "boots": SHOES,
+    "tops": LETTER, "outerwear": LETTER, "tailoring": LETTER, "knitwear": LETTER,
+    "shirts": LETTER, "sweaters": LETTER, "jackets": LETTER,
+    "bottoms": WAIST, "pants": WAIST, "jeans": WAIST, "denim": WAIST, "shorts": WAIST,
+}
+# One category per size system, to read a size the way a listing in that system
+# would be read
+GROUP_CATEGORIES: Dict[Optional[str], Optional[str]] = {None: None}
+for _category, _group in CATEGORY_GROUPS.items():
+    GROUP_CATEGORIES.setdefault(_group, _category)
+
+LETTER_SIZES = ["XXS", "XS", "S", "M", "L", "XL", "XXL", "XXXL"]
+_LETTER_ALIASES = {
+    "XXSMALL": "XXS", "XSMALL": "XS", "X-SMALL": "XS", "SMALL": "S", "SM": "S",
+    "MEDIUM": "M", "MED": "M", "LARGE": "L", "LG": "L",
+    "XLARGE": "XL", "X-LARGE": "XL",
+    "2XL": "XXL", "XX-LARGE": "XXL", "XXLARGE": "XXL",
+    "3XL": "XXXL", "XXX-LARGE": "XXXL",
+}
+# Italian/European tailoring sizes
+_EU_LETTER = {
+    42: "XXS", 44: "XS", 46: "S", 48: "M", 50: "L", 52: "XL", 54: "XXL", 56: "XXXL"
+}
+# European trouser sizes to waist inches
+_EU_WAIST = {42: 26, 44: 28, 46: 30, 48: 32, 50: 34, 52: 36, 54: 38, 56: 40}
+
+# Men's shoe sizes; US is canonical. EU sizes follow the common brand charts.
+_EU_TO_US = {
+    38.5: 6, 39: 6.5, 40: 7, 40.5: 7.5, 41: 8, 42: 8.5, 42.5: 9, 43: 9.5, 44: 10,
+    44.5: 10.5, 45: 11, 45.5: 11.5, 46: 12, 47: 12.5, 47.5: 13, 48: 13.5, 48.5: 14,
+}
+_UK_TO_US_OFFSET = 1.0
+_JP_CM_TO_US_OFFSET = 18.0
+
+_SIZE_RE = re.compile(r'^(US|EU|IT|FR|UK|JP|W)?\s*(\d+(?:\.\d+)?)\s*(W|CM)?$')
+_WAIST_RE = re.compile(r'^W?\s*(\d{2})\s*W?\s*(?:[X/]\s*\d{2}|L\s*\d{2})$')
+_ONE_SIZE = {'ONE SIZE', 'OS', 'O/S'}
+
+_codes: Dict[str, int] = {}
+_labels: List[str] = ['Unknown']
+_intern_lock = threading.Lock()
+
+
+def _intern(label: str) -> int:
+    code = _codes.get(label)
+    if code is None:
+        with _intern_lock:
+            code = _codes.get(label)
+            if code is None:
+                code = _codes[label] = len(_labels)
+                _labels.append(label)
+    return code
+
+
+def _number(value: float) -> str:
+    return f"{value:g}"
+
+
+def _us_shoe(value: float) -> str:
+    return f"US {_number(value)}"
+
+
+# Register the canonical taxonomy up front so common codes are stable and small
+for _label in LETTER_SIZES:
+    _intern(_label)
+for _waist in range(24, 47):
+    _intern(f"W{_waist}")
+for _half in range(8, 32):
+    _intern(_us_shoe(_half / 2))
+
+
+def category_group(category: Optional[str]) -> Optional[str]:
+    if not category:
+        return None
+    return CATEGORY_GROUPS.get(category.strip().lower())
+
+
+def _shoe_label(region: str, value: float) -> str:
+    if region in ('EU', 'IT', 'FR'):
+        us = _EU_TO_US.get(value)
+        return _us_shoe(us) if us is not None else f"EU {_number(value)}"
+    if region == 'UK':
+        return _us_shoe(value + _UK_TO_US_OFFSET)
+    if region == 'JP':
+        return _us_shoe(value - _JP_CM_TO_US_OFFSET)
+    return _us_shoe(value)
+
+
+def _guess_group(region: str, value: float) -> Optional[str]:
+    if region in ('US', 'UK', 'JP') or (region == 'EU' and 35 <= value <= 50):
+        return SHOES
+    return None
+
+
+def canonical_size(size: str, category: Optional[str] = None) -> str:
+    """Canonical label for a raw size, converting regional sizes within the category's
+    size system
+    """
+    text = ' '.join(str(size).upper().split())
+    if text in _ONE_SIZE:
+        return 'ONE SIZE'
+    if not text or text in ('UNKNOWN', 'N/A'):
+        return 'Unknown'
+    group = category_group(category)
+
+    letter = _LETTER_ALIASES.get(text.replace(' ', ''), text)
+    if letter in LETTER_SIZES and group in (None, LETTER):
+        return letter
+
+    match = _SIZE_RE.match(text)
+    if match:
+        region, number = match.group(1) or '', match.group(2)
+        suffix = match.group(3) or ''
+        value = float(number)
+        if region == 'W' or suffix == 'W':
+            return f"W{_number(value)}"
+        if suffix == 'CM':
+            region = 'JP'
+        group = group or _guess_group(region, value)
+        if group == SHOES:
+            return _shoe_label(region, value)
+        if group == LETTER and region in ('', 'EU', 'IT', 'FR') and value in _EU_LETTER:
+            return _EU_LETTER[value]
+        if group == WAIST:
+            if region in ('EU', 'IT', 'FR') and value in _EU_WAIST:
+                return f"W{_EU_WAIST[value]}"
+            if region == '':
+                return f"W{_number(value)}"
+        return f"{region} {_number(value)}".strip()
+
+    if group == WAIST:
+        waist = _WAIST_RE.match(text)
+        if waist:
+            return f"W{waist.group(1)}"
+    return text
+
+
+def size_labels(size: str) -> List[str]:
+    """Every canonical label a size given without a category can stand for, one per
+    size system.
+
+    A bare "48" is an M in tailoring and W48 in trousers; "10" is US 10 in shoes.
+    """
+    return sorted({
+        canonical_size(size, category) for category in GROUP_CATEGORIES.values()
+    })
+
+
+@lru_cache(maxsize=65536)
+def size_code(size: str, category: Optional[str] = None) -> int:
+    """Interned code of a raw size's canonical label"""
+    label = canonical_size(size, category)
+    return UNKNOWN if label == 'Unknown' else _intern(label)
+
+
+def size_label(code: int) -> str:
+    return _labels[code] if 0 <= code < len(_labels) else 'Unknown'
+
+
+@lru_cache(maxsize=1024)
+def condition_code(condition: str) -> int:
+    """Code (1 = best) for a condition slug, label or free text; 0 when unknown"""
+    text = str(condition or '').strip().lower()
+    for code, (slug, label) in enumerate(CONDITIONS, 1):
+        if text in (slug, label.lower()):
+            return code
+    text = re.sub(r'[_-]+', ' ', text)
+    if text.startswith('is '):
+        text = text[3:]
+    if text in _CONDITION_ALIASES:
+        return _CONDITION_ALIASES[text]
+    # Free text: same precedence as the old substring rules
+    for needle, code in (('new', 1), ('gently', 2), ('used', 3), ('worn', 4)):
+        if needle in text:
+            return code
+    return UNKNOWN
+
+
+def condition_slug(code: int) -> Optional[str]:
+    return CONDITIONS[code - 1][0] if 1 <= code <= len(CONDITIONS) else None
+
+
+def condition_label(code: int) -> Optional[str]:
+    return CONDITIONS[code - 1][1] if 1 <= code <= len(CONDITIONS) else None
+
+
+def canonical_condition(condition: str) -> str:
+    """Grailed slug for a raw condition, or the input unchanged when not recognised"""
+    return condition_slug(condition_code(condition)) or condition
+
+
+def canonical_designer(designer: Optional[str]) -> str:
+    """Full designer name for a known abbreviation; other names come back unchanged"""
+    name = (designer or '').strip()
+    return _DESIGNER_ALIASES.get(name.lower(), name)
+
+
+def cache_info() -> Dict[str, object]:
+    """Memoization statistics for the lookup functions"""
+    return {
+        'size': size_code.cache_info(),
+        'condition': condition_code.cache_info(),
+        'interned': len(_labels),
+    }
+
+
+__all__ = [
+    'UNKNOWN', 'CONDITIONS', 'CATEGORY_GROUPS', 'GROUP_CATEGORIES', 'LETTER_SIZES',
+    'category_group', 'canonical_size', 'size_labels', 'size_code', 'size_label',
+    'condition_code', 'condition_slug', 'condition_label', 'canonical_condition',
+    'canonical_designer',
+    'cache_info'
+]
\ No newline at end of file
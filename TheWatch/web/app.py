@@ -1,34 +1,40 @@
 # thewatch/web/app.py
+import asyncio
 import sys
+from contextlib import asynccontextmanager
 from pathlib import Path
 sys.path.append(str(Path(__file__).parent.parent.parent))
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from thewatch.web.routes import router
+from fastapi.responses import PlainTextResponse
+from fastapi.staticfiles import StaticFiles
+from TheWatch.core.config import settings
+from TheWatch.utils.logger import configure_logging
+from TheWatch.utils.metrics import metrics
+from TheWatch.web.routes import router, warm_indexes
 
-# Rest of the code...
 
-app = FastAPI(title="TheWatch API")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Process-wide logging and metrics are set up when the server starts, not when
+    # the module is imported
+    configure_logging(
+        level=settings.log_level,
+        json_lines=settings.log_json,
+        max_bytes=settings.log_max_bytes
+    )
+    previous = metrics.enabled
+    metrics.enable(settings.metrics_enabled)
+    # Read the store into the indexes in the background, off the event loop
+    asyncio.get_running_loop().run_in_executor(None, warm_indexes)
+    try:
+        yield
+    finally:
+        metrics.enable(previous)
 
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
 
-# Mount React static files
-static_dir = Path(__file__).parent.parent / "ui" / "static"
-if static_dir.exists():
-    app.mount("/static", StaticFiles(directory=str(static_dir)), name="static")
-
-app.include_router(router)
-
-if __name__ == "__main__":
-    import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+app = FastAPI(title="TheWatch API", lifespan=lifespan)
 
 # CORS configuration
 app.add_middleware(
@@ -47,6 +53,16 @@ if static_dir.exists():
 # Include API routes
 app.include_router(router)
 
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def prometheus_metrics():
+    """Prometheus text-format scrape endpoint"""
+    return PlainTextResponse(
+        metrics.render_prometheus(),
+        media_type="text/plain; version=0.0.4"
+    )
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
@@ -1,8 +1,19 @@
-from fastapi import APIRouter, HTTPException, status
+import aiohttp
+from fastapi import APIRouter, Header, HTTPException, Query, Response, status
+from fastapi.encoders import jsonable_encoder
+from datetime import datetime
+from pathlib import Path
 from typing import Optional
+import json
 import logging
-from thewatch.core.api import GrailedAPI
-from thewatch.core.models import SearchFilters, Sale
+from TheWatch.core.api import GrailedAPI
+from TheWatch.core.config import settings
+from TheWatch.core.models import SearchFilters, Sale
+from TheWatch.core.session import SessionState
+from TheWatch.data.aggregates import AnalyticsIndex
+from TheWatch.data.cache import ResultCache
+from TheWatch.data.sellers import SORT_KEYS, SellerIndex
+from TheWatch.data.store import SalesStore, decode_cursor, encode_cursor, sale_to_dict
 from pydantic import BaseModel
 from typing import List
 
@@ -17,6 +28,156 @@ class SalesResponse(BaseModel):
     message: Optional[str] = None
 
 
+class SalesPage(BaseModel):
+    success: bool
+    sales: List[dict]
+    next_cursor: Optional[str] = None
+
+
+class SellersResponse(BaseModel):
+    success: bool
+    sellers: List[dict]
+
+
+_result_cache: Optional[ResultCache] = None
+_store: Optional[SalesStore] = None
+_analytics: Optional[AnalyticsIndex] = None
+_sellers: Optional[SellerIndex] = None
+_session_state: Optional[SessionState] = None
+
+
+def get_result_cache() -> ResultCache:
+    """This worker's handle on the result cache file shared by all workers"""
+    global _result_cache
+    if _result_cache is None:
+        _result_cache = ResultCache(
+            settings.result_cache_path,
+            ttl=settings.result_cache_ttl,
+            max_entries=settings.result_cache_max_entries
+        )
+    return _result_cache
+
+
+def get_session_state() -> SessionState:
+    """Upstream session cookies shared by every request and worker, so searches skip
+    the warm-up
+    """
+    global _session_state
+    if _session_state is None:
+        _session_state = SessionState(settings.session_state_path, settings.session_ttl)
+    return _session_state
+
+
+def get_store() -> SalesStore:
+    """This worker's connection to the local listing store"""
+    global _store
+    if _store is None:
+        _store = SalesStore(settings.store_path)
+    return _store
+
+
+def get_analytics() -> AnalyticsIndex:
+    """This worker's precomputed analytics over the local store"""
+    global _analytics
+    if _analytics is None:
+        _analytics = AnalyticsIndex(get_store())
+    return _analytics
+
+
+def get_sellers() -> SellerIndex:
+    """This worker's seller statistics over the local store"""
+    global _sellers
+    if _sellers is None:
+        _sellers = SellerIndex(get_store())
+    return _sellers
+
+
+def warm_indexes() -> None:
+    """Fold an existing store into this worker's indexes before a request has to"""
+    if not Path(settings.store_path).exists():
+        return
+    try:
+        get_analytics().refresh(force=True)
+        get_sellers().refresh(force=True)
+    except Exception as e:
+        logger.error("Could not load the store indexes: %s", e)
+
+
+# The index handlers are plain functions, so FastAPI runs them in its threadpool:
+# a refresh reading many new rows blocks that thread, not the event loop
+@router.get("/analytics")
+def analytics(
+        designer: Optional[str] = None,
+        query: Optional[str] = None,
+        if_none_match: Optional[str] = Header(None)
+):
+    """Aggregates of stored sales for a query, a designer, or everything, with ETag
+    revalidation
+    """
+    rendered = get_analytics().render(designer=designer, query=query)
+    if rendered is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND,
+                            detail="No stored sales match")
+    body, etag = rendered
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if if_none_match and etag in (tag.strip() for tag in if_none_match.split(",")):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+@router.get("/sellers", response_model=SellersResponse)
+def top_sellers(
+        sort: str = Query("volume", pattern=f"^({'|'.join(SORT_KEYS)})$"),
+        limit: int = Query(20, ge=1, le=200),
+        min_listings: int = Query(1, ge=1)
+):
+    """Sellers with the most stored listings, the deepest typical discount or the
+    latest activity
+    """
+    sellers = get_sellers().top(limit, by=sort, min_listings=min_listings)
+    return SellersResponse(success=True, sellers=jsonable_encoder(sellers))
+
+
+@router.get("/sellers/{seller}")
+def seller_stats(seller: str):
+    """Volume, median price, typical discount and last activity of one seller"""
+    stats = get_sellers().get(seller)
+    if stats is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND,
+                            detail="No stored sales by this seller")
+    return jsonable_encoder(stats)
+
+
+@router.get("/sales", response_model=SalesPage)
+async def browse_sales(
+        designer: Optional[str] = None,
+        size: Optional[str] = None,
+        condition: Optional[str] = None,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        cursor: Optional[str] = None,
+        limit: int = Query(50, ge=1, le=200)
+):
+    """Stored sales, newest first, one keyset page at a time; never calls Grailed"""
+    try:
+        after = decode_cursor(cursor) if cursor else None
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    sales, next_key = get_store().browse(
+        designer=designer, size=size, condition=condition,
+        min_price=min_price, max_price=max_price,
+        since=since, until=until, after=after, limit=limit
+    )
+    return SalesPage(
+        success=True,
+        sales=[sale_to_dict(sale) for sale in sales],
+        next_cursor=encode_cursor(next_key) if next_key else None
+    )
+
+
 @router.get("/search", response_model=SalesResponse)
 async def search(
         query: str,
@@ -24,28 +185,40 @@ async def search(
         max_price: Optional[float] = None,
         condition: Optional[str] = None
 ):
-    api = GrailedAPI()
-    try:
-        filters = SearchFilters(
-            min_price=min_price,
-            max_price=max_price,
-            conditions=[condition] if condition else None
-        )
+    filters = SearchFilters(
+        min_price=min_price,
+        max_price=max_price,
+        conditions=[condition] if condition else None
+    )
+    key = json.dumps([
+        'search', ' '.join(query.lower().split()), min_price, max_price, condition
+    ])
+
+    async def fetch() -> List[dict]:
+        # Raises on upstream failure, so an error is never cached as an empty result
+        api = GrailedAPI(settings.base_url, session_state=get_session_state())
+        try:
+            sales = await api.search_sales(query, filters, strict=True)
+            return jsonable_encoder([sale.__dict__ for sale in sales])
+        finally:
+            await api.close()
 
-        sales = await api.search_sales(query, filters)
+    try:
+        sales = await get_result_cache().get_or_refresh(key, fetch)
         if not sales:
             return SalesResponse(success=True, sales=[], message="No results found")
 
-        return SalesResponse(
-            success=True,
-            sales=[sale.__dict__ for sale in sales]
-        )
+        return SalesResponse(success=True, sales=sales)
 
+    except aiohttp.ClientError as e:
+        logger.error("Upstream search error: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_502_BAD_GATEWAY,
+            detail=f"Grailed search failed: {str(e)}"
+        )
     except Exception as e:
-        logger.error(f"Search error: {str(e)}")
+        logger.error("Search error: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error processing search: {str(e)}"
-        )
-    finally:
-        await api.close()
\ No newline at end of file
+        )
\ No newline at end of file